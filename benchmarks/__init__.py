@@ -0,0 +1,19 @@
+""" Headless benchmarks for pygame_ai
+
+Builds reproducible scenarios with :const:`~gameobject.null_surface`
+:py:class:`~gameobject.GameObject` s, no display is needed, and times one
+loop of every steering behavior for growing numbers of agents and obstacles.
+
+Run every benchmark and save the results::
+
+    python -m benchmarks --output baseline.json
+
+Run them again after a change and flag regressions against the baseline::
+
+    python -m benchmarks --output new.json --compare baseline.json
+"""
+import os
+
+# Make sure pygame never tries to open a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
@@ -0,0 +1,41 @@
+""" Command line entry point, run ``python -m benchmarks --help`` """
+import argparse
+import sys
+
+from . import runner
+from .scenarios import scenarios
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = 'python -m benchmarks', description = 'Time pygame_ai steering behaviors headlessly.')
+    parser.add_argument('--sizes', type = int, nargs = '+', default = [10, 100, 1000, 10000], help = 'numbers of agents')
+    parser.add_argument('--obstacles', type = int, nargs = '+', default = [10, 100, 1000], help = 'numbers of obstacles for scenarios that use them')
+    parser.add_argument('--repeat', type = int, default = 5, help = 'timed loops per run')
+    parser.add_argument('--seed', type = int, default = 0, help = 'seed used to build the scenarios')
+    parser.add_argument('--filter', default = '', help = 'only run scenarios whose name contains this text')
+    parser.add_argument('--output', help = 'write results to this JSON file')
+    parser.add_argument('--compare', help = 'baseline JSON file to flag regressions against')
+    parser.add_argument('--tolerance', type = float, default = 0.2, help = 'allowed slowdown against the baseline, as a fraction')
+    args = parser.parse_args(argv)
+
+    selected = [scenario for scenario in scenarios if args.filter in scenario.name]
+    results = runner.run(selected, args.sizes, args.obstacles, args.repeat, args.seed, log = print)
+
+    if args.output:
+        runner.save(args.output, results)
+
+    if args.compare:
+        regressions = runner.compare(results, runner.load(args.compare), args.tolerance)
+        for result, old in regressions:
+            if 'error' in result:
+                print('REGRESSION {name} agents={agents} obstacles={obstacles}: {error}'.format(**result))
+            else:
+                print('REGRESSION {} agents={} obstacles={}: {:.3f} ms -> {:.3f} ms'.format(
+                    result['name'], result['agents'], result['obstacles'], old['loop_ms_min'], result['loop_ms_min']))
+        if regressions:
+            return 1
+        print('No regressions against {}'.format(args.compare))
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
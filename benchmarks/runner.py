@@ -0,0 +1,108 @@
+""" Timing, result storage and baseline comparison """
+import json
+import platform
+import sys
+import time
+
+import numpy
+import pygame
+
+from pygame_ai.utils import random_streams
+
+def time_loop(loop, repeat = 5, warmup = 1):
+    """ Runs loop warmup + repeat times and returns the duration of each timed run in seconds """
+    for _ in range(warmup):
+        loop()
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loop()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+def run(scenarios, sizes, obstacle_counts, repeat = 5, seed = 0, log = None):
+    """ Runs every scenario at every size
+
+    Scenarios that don't use obstacles are only run once per size.
+
+    Returns
+    -------
+    list(dict)
+        One result per run, with the scenario name, number of agents and
+        obstacles, and the minimum and mean loop time in milliseconds.
+        Scenarios that fail record the error instead of timings.
+    """
+    results = []
+    for scenario in scenarios:
+        for n in sizes:
+            if scenario.max_agents is not None and n > scenario.max_agents:
+                continue
+            for n_obstacles in (obstacle_counts if scenario.uses_obstacles else [0]):
+                result = {'name': scenario.name, 'agents': n, 'obstacles': n_obstacles}
+                try:
+                    # Wander behaviors draw from the shared streams
+                    random_streams.default_streams.reset(seed)
+                    loop = scenario.setup(n, n_obstacles, seed)
+                    durations = time_loop(loop, repeat)
+                except Exception as error:
+                    result['error'] = '{}: {}'.format(type(error).__name__, error)
+                else:
+                    result['loop_ms_min'] = min(durations) * 1000
+                    result['loop_ms_mean'] = sum(durations) / len(durations) * 1000
+                    result['us_per_agent'] = min(durations) * 1e6 / max(n, 1)
+                results.append(result)
+                if log is not None:
+                    log(format_result(result))
+    return results
+
+def format_result(result):
+    """ Returns a one line summary of a result """
+    label = '{name:<40} agents={agents:<6} obstacles={obstacles:<5}'.format(**result)
+    if 'error' in result:
+        return label + ' ERROR ' + result['error']
+    return label + ' {loop_ms_min:10.3f} ms/loop {us_per_agent:9.3f} us/agent'.format(**result)
+
+def metadata():
+    """ Returns a description of the environment the benchmarks ran on """
+    return {
+        'python': sys.version.split()[0],
+        'pygame': pygame.version.ver,
+        'numpy': numpy.__version__,
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+def save(path, results, meta = None):
+    """ Writes results to a JSON file """
+    with open(path, 'w') as f:
+        json.dump({'meta': meta or metadata(), 'results': results}, f, indent = 2)
+
+def load(path):
+    """ Reads results from a JSON file written by :py:func:`save` """
+    with open(path, 'r') as f:
+        return json.load(f)['results']
+
+def compare(results, baseline, tolerance = 0.2):
+    """ Returns the results that got slower than the baseline
+
+    A result regresses when its minimum loop time is more than tolerance
+    (as a fraction) above the baseline's, runs that failed are also
+    reported. Runs that are missing from the baseline are ignored.
+
+    Returns
+    -------
+    list(tuple(dict, dict))
+        (result, baseline result) pairs
+    """
+    key = lambda result: (result['name'], result['agents'], result['obstacles'])
+    baseline = {key(result): result for result in baseline}
+
+    regressions = []
+    for result in results:
+        old = baseline.get(key(result))
+        if old is None or 'error' in old:
+            continue
+        if 'error' in result or result['loop_ms_min'] > old['loop_ms_min'] * (1 + tolerance):
+            regressions.append((result, old))
+    return regressions
@@ -0,0 +1,484 @@
+""" Benchmark scenarios
+
+Every scenario is a function ``setup(agents, obstacles, seed)`` that builds
+a world and returns a function that runs one loop of it.
+"""
+import itertools
+import math
+import random
+
+import numpy
+import pygame
+
+from pygame_ai.gameobject import GameObject
+from pygame_ai.group import AIGroup
+from pygame_ai.navigation import OccupancyGrid, Navigator
+from pygame_ai.steering import kinematic, static, blended, priority, path
+from pygame_ai.steering import kinematic_batch, static_batch, scheduler, convoy
+from pygame_ai.steering.cache import SteeringCache
+from pygame_ai.steering.plan import compile_plan
+from pygame_ai.utils.spatial import SpatialHashGrid, ObstacleGrid
+from pygame_ai.world import AgentWorld
+
+WORLD_SIZE = 4000
+""" Side of the square area agents and obstacles are spread over """
+
+class Scenario(object):
+    """ A named benchmark
+
+    Parameters
+    ----------
+    name: str
+    setup: function(agents, obstacles, seed) -> function()
+        Builds the scenario and returns one loop of it
+    uses_obstacles: bool, optional
+        Whether the scenario is affected by the number of obstacles
+    max_agents: int, optional
+        Largest number of agents the scenario is run with, used to skip
+        quadratic scenarios at sizes where they would take minutes
+    """
+
+    def __init__(self, name, setup, uses_obstacles = False, max_agents = None):
+        self.name = name
+        self.setup = setup
+        self.uses_obstacles = uses_obstacles
+        self.max_agents = max_agents
+
+    def __repr__(self):
+        return self.name
+
+def make_agents(n, rng):
+    """ Returns n agents with random positions and velocities """
+    agents = []
+    for _ in range(n):
+        agent = GameObject()
+        agent.rect.size = (16, 16)
+        agent.rect.center = (rng.uniform(0, WORLD_SIZE), rng.uniform(0, WORLD_SIZE))
+        agent.velocity = pygame.Vector2(rng.uniform(-20, 20), rng.uniform(-20, 20))
+        agent.orientation = rng.uniform(-180, 180)
+        agents.append(agent)
+    return agents
+
+def make_obstacles(n, rng):
+    """ Returns n wall-like obstacles at random positions """
+    obstacles = []
+    for _ in range(n):
+        obstacle = GameObject()
+        obstacle.rect.size = (rng.randint(32, 128), rng.randint(32, 128))
+        obstacle.rect.center = (rng.uniform(0, WORLD_SIZE), rng.uniform(0, WORLD_SIZE))
+        obstacles.append(obstacle)
+    return obstacles
+
+def make_world(n, rng):
+    """ Returns an :py:class:`~world.AgentWorld` with n agents with random positions and velocities """
+    world = AgentWorld(n)
+    for _ in range(n):
+        agent = world.add(pos = (rng.uniform(0, WORLD_SIZE), rng.uniform(0, WORLD_SIZE)))
+        agent.velocity = (rng.uniform(-20, 20), rng.uniform(-20, 20))
+        agent.orientation = rng.uniform(-180, 180)
+    return world
+
+def make_route(n, rng):
+    """ Returns n random waypoints of a route around the middle of the world """
+    center = WORLD_SIZE / 2
+    points = []
+    for i in range(n):
+        angle = 2*math.pi * i / n
+        radius = rng.uniform(0.2, 0.45) * WORLD_SIZE
+        points.append((center + radius*math.cos(angle), center + radius*math.sin(angle)))
+    return points
+
+def make_target(rng):
+    """ Returns a moving target in the middle of the world """
+    target = GameObject(pos = (WORLD_SIZE//2, WORLD_SIZE//2))
+    target.rect.size = (16, 16)
+    target.rect.center = (WORLD_SIZE//2, WORLD_SIZE//2)
+    target.velocity = pygame.Vector2(5, 3)
+    return target
+
+def steering_loop(agents, behaviors, tick = 1/60):
+    """ Returns a loop that evaluates and applies every behavior """
+    pairs = list(zip(agents, behaviors))
+    def loop():
+        for agent, behavior in pairs:
+            behavior.get_steering().update(agent, tick)
+    return loop
+
+def static_loop(agents, behaviors):
+    """ Returns a loop that evaluates every static behavior """
+    pairs = list(zip(agents, behaviors))
+    def loop():
+        for agent, behavior in pairs:
+            agent.velocity = pygame.Vector2(behavior.get_steering().velocity)
+    return loop
+
+def targeted(factory, module = kinematic):
+    """ Scenario setup for behaviors built as factory(character, target) """
+    def setup(n, n_obstacles, seed):
+        rng = random.Random(seed)
+        agents = make_agents(n, rng)
+        target = make_target(rng)
+        behaviors = [factory(agent, target) for agent in agents]
+        if module is static:
+            return static_loop(agents, behaviors)
+        return steering_loop(agents, behaviors)
+    return setup
+
+def alone(factory, module = kinematic):
+    """ Scenario setup for behaviors built as factory(character) """
+    def setup(n, n_obstacles, seed):
+        rng = random.Random(seed)
+        random.seed(seed)
+        agents = make_agents(n, rng)
+        behaviors = [factory(agent) for agent in agents]
+        if module is static:
+            return static_loop(agents, behaviors)
+        return steering_loop(agents, behaviors)
+    return setup
+
+def swarm(factory, grid = False):
+    """ Scenario setup for behaviors built as factory(character, swarm) """
+    def setup(n, n_obstacles, seed):
+        rng = random.Random(seed)
+        agents = make_agents(n, rng)
+        targets = SpatialHashGrid(64, agents) if grid else agents
+        behaviors = [factory(agent, targets) for agent in agents]
+        loop = steering_loop(agents, behaviors)
+        if not grid:
+            return loop
+        def grid_loop():
+            targets.rebuild()
+            loop()
+        return grid_loop
+    return setup
+
+def with_obstacles(factory, grid = False):
+    """ Scenario setup for behaviors built as factory(character, obstacles) """
+    def setup(n, n_obstacles, seed):
+        rng = random.Random(seed)
+        random.seed(seed)
+        agents = make_agents(n, rng)
+        obstacles = make_obstacles(n_obstacles, rng)
+        if grid:
+            obstacles = ObstacleGrid(128, obstacles)
+        behaviors = [factory(agent, obstacles) for agent in agents]
+        return steering_loop(agents, behaviors)
+    return setup
+
+def follow_path(n, n_obstacles, seed):
+    rng = random.Random(seed)
+    agents = make_agents(n, rng)
+    behaviors = [kinematic.FollowPath(agent, path.PathCircumference(agent.position, 100)) for agent in agents]
+    return steering_loop(agents, behaviors)
+
+def flocking(n, n_obstacles, seed):
+    rng = random.Random(seed)
+    agents = make_agents(n, rng)
+    target = make_target(rng)
+    grid = SpatialHashGrid(64, agents)
+    behaviors = [blended.Flocking(agent, grid, target) for agent in agents]
+    loop = steering_loop(agents, behaviors)
+    def flocking_loop():
+        grid.rebuild()
+        loop()
+    return flocking_loop
+
+def blended_arrive(n, n_obstacles, seed):
+    rng = random.Random(seed)
+    agents = make_agents(n, rng)
+    target = make_target(rng)
+    obstacles = ObstacleGrid(128, make_obstacles(n_obstacles, rng))
+    behaviors = [blended.Arrive(agent, target, obstacles) for agent in agents]
+    return steering_loop(agents, behaviors)
+
+def blended_wander(n, n_obstacles, seed):
+    rng = random.Random(seed)
+    random.seed(seed)
+    agents = make_agents(n, rng)
+    obstacles = ObstacleGrid(128, make_obstacles(n_obstacles, rng))
+    behaviors = [blended.Wander(agent, obstacles) for agent in agents]
+    return steering_loop(agents, behaviors)
+
+def priority_pursue(n, n_obstacles, seed):
+    rng = random.Random(seed)
+    agents = make_agents(n, rng)
+    target = make_target(rng)
+    obstacles = ObstacleGrid(128, make_obstacles(n_obstacles, rng))
+    behaviors = [
+        priority.PrioritySteering([
+            kinematic.ObstacleAvoidance(agent, obstacles),
+            kinematic.Pursue(agent, target),
+        ])
+        for agent in agents
+    ]
+    return steering_loop(agents, behaviors)
+
+def oscilate_horizontally(n, n_obstacles, seed):
+    rng = random.Random(seed)
+    agents = make_agents(n, rng)
+    target = make_target(rng)
+    grid = SpatialHashGrid(64, agents)
+    behaviors = [priority.OscilateHorizontally(agent, target, grid) for agent in agents]
+    loop = steering_loop(agents, behaviors)
+    def oscilate_loop():
+        grid.rebuild()
+        loop()
+    return oscilate_loop
+
+def path_iterator(factory):
+    """ Scenario setup that advances one path iterator per agent """
+    def setup(n, n_obstacles, seed):
+        rng = random.Random(seed)
+        paths = [factory((rng.uniform(0, WORLD_SIZE), rng.uniform(0, WORLD_SIZE))) for _ in range(n)]
+        def loop():
+            for p in paths:
+                try:
+                    next(p)
+                except StopIteration:
+                    p.reset()
+        return loop
+    return setup
+
+def sine_path(position):
+    return path.Path(lambda self, x: (position[0] + x, position[1] + 50*math.sin(math.radians(x))), domain_end = 360, increment = 5)
+
+def cyclic_sine_path(position):
+    return path.CyclicPath(lambda self, x: (position[0] + x, position[1] + 50*math.sin(math.radians(x))), domain_end = 360, increment = 5)
+
+def mirrored_sine_path(position):
+    return path.MirroredPath(lambda self, x: (position[0] + x, position[1] + 50*math.sin(math.radians(x))), domain_end = 360, increment = 5)
+
+def batch_rays(grid = False):
+    """ Scenario setup for ObstacleAvoidance with rays cast by :py:func:`~.kinematic.cast_obstacle_rays` """
+    def setup(n, n_obstacles, seed):
+        rng = random.Random(seed)
+        agents = make_agents(n, rng)
+        obstacles = make_obstacles(n_obstacles, rng)
+        if grid:
+            obstacles = ObstacleGrid(128, obstacles)
+        behaviors = [kinematic.ObstacleAvoidance(agent, obstacles) for agent in agents]
+        loop = steering_loop(agents, behaviors)
+        def rays_loop():
+            kinematic.cast_obstacle_rays(behaviors)
+            loop()
+        return rays_loop
+    return setup
+
+def throttled_avoidance(n, n_obstacles, seed):
+    phases = itertools.count()
+    factory = lambda agent, obstacles: scheduler.Throttled(kinematic.ObstacleAvoidance(agent, obstacles), 6, phase = next(phases) % 6)
+    return with_obstacles(factory, grid = True)(n, n_obstacles, seed)
+
+def cached_surround(n, n_obstacles, seed):
+    rng = random.Random(seed)
+    agents = make_agents(n, rng)
+    target = make_target(rng)
+    cache = SteeringCache()
+    behaviors = [blended.Surround(agent, target, 100, cache = cache) for agent in agents]
+    loop = steering_loop(agents, behaviors)
+    def cached_loop():
+        cache.advance()
+        loop()
+    return cached_loop
+
+def compiled_arrive(n, n_obstacles, seed):
+    rng = random.Random(seed)
+    agents = make_agents(n, rng)
+    target = make_target(rng)
+    obstacles = ObstacleGrid(128, make_obstacles(n_obstacles, rng))
+    behaviors = [compile_plan(blended.Arrive(agent, target, obstacles)) for agent in agents]
+    return steering_loop(agents, behaviors)
+
+def ai_scheduler(n, n_obstacles, seed):
+    rng = random.Random(seed)
+    agents = make_agents(n, rng)
+    target = make_target(rng)
+    ai = scheduler.AIScheduler([target])
+    for agent in agents:
+        ai.add(agent, kinematic.Arrive(agent, target))
+    return lambda: ai.update(1/60)
+
+def ai_group(in_world):
+    """ Scenario setup for an :py:class:`~group.AIGroup` of agents that Seek a target """
+    def setup(n, n_obstacles, seed):
+        rng = random.Random(seed)
+        agents = make_world(n, rng).views if in_world else make_agents(n, rng)
+        target = make_target(rng)
+        group = AIGroup()
+        for agent in agents:
+            group.add_agent(agent, kinematic.Seek(agent, target))
+        return lambda: group.update(1/60)
+    return setup
+
+def batched(function, angular = False):
+    """ Scenario setup for a kinematic_batch function(world, characters, targets)
+
+    Every agent but the last one steers towards the last one.
+    """
+    def setup(n, n_obstacles, seed):
+        rng = random.Random(seed)
+        world = make_world(n + 1, rng)
+        characters = numpy.arange(n)
+        targets = numpy.full(n, n)
+        def loop():
+            if angular:
+                world.integrate(0, function(world, characters, targets), 1/60, characters)
+            else:
+                world.integrate(function(world, characters, targets), 0, 1/60, characters)
+            world.move()
+        return loop
+    return setup
+
+def static_batched(function):
+    """ Scenario setup for a static_batch function(world, characters, targets) """
+    def setup(n, n_obstacles, seed):
+        rng = random.Random(seed)
+        world = make_world(n + 1, rng)
+        characters = numpy.arange(n)
+        targets = numpy.full(n, n)
+        def loop():
+            static_batch.update(world, function(world, characters, targets), 0, characters)
+            world.move()
+        return loop
+    return setup
+
+def static_batch_wander(n, n_obstacles, seed):
+    rng = random.Random(seed)
+    world = make_world(n, rng)
+    wander = static_batch.Wander(world)
+    def loop():
+        velocity, rotation = wander.get_steering()
+        static_batch.update(world, velocity, rotation)
+        world.move()
+    return loop
+
+def follow_route(factory):
+    """ Scenario setup for agents that predictively follow a shared route built as factory(waypoints) """
+    def setup(n, n_obstacles, seed):
+        rng = random.Random(seed)
+        agents = make_agents(n, rng)
+        route = factory(make_route(60, rng))
+        behaviors = [kinematic.FollowPath(agent, route, path_offset = 30) for agent in agents]
+        return steering_loop(agents, behaviors)
+    return setup
+
+def bezier_route(points):
+    return path.BezierPath(points + points[:1], cyclic = True)
+
+def route_convoy(n, n_obstacles, seed):
+    rng = random.Random(seed)
+    world = make_world(n, rng)
+    route = path.CatmullRomPath(make_route(60, rng), cyclic = True)
+    characters = numpy.arange(n)
+    patrol = convoy.Convoy(world, route, characters, lane_offset = (characters % 3 - 1) * 20)
+    def loop():
+        world.integrate(patrol.get_steering(), 0, 1/60, characters)
+        world.move()
+    return loop
+
+def navigation(cached):
+    """ Scenario setup where every agent asks a :py:class:`~navigation.Navigator` for a route
+
+    Without a cache every route runs A*, with it the agents share 32
+    routes, as units sent to the same few places would.
+    """
+    def setup(n, n_obstacles, seed):
+        rng = random.Random(seed)
+        grid = OccupancyGrid((0, 0, WORLD_SIZE, WORLD_SIZE), 32, make_obstacles(n_obstacles, rng), margin = 8)
+        navigator = Navigator(grid, cache_size = 256 if cached else 0)
+        point = lambda: (rng.uniform(0, WORLD_SIZE), rng.uniform(0, WORLD_SIZE))
+        if cached:
+            routes = [(point(), point()) for _ in range(32)]
+            queries = [routes[i % len(routes)] for i in range(n)]
+        else:
+            queries = [(point(), point()) for _ in range(n)]
+        def loop():
+            for start, goal in queries:
+                navigator.find_path(start, goal)
+        return loop
+    return setup
+
+def world_integrate(n, n_obstacles, seed):
+    rng = random.Random(seed)
+    world = AgentWorld(n)
+    for _ in range(n):
+        world.add(pos = (rng.uniform(0, WORLD_SIZE), rng.uniform(0, WORLD_SIZE)))
+    linear = numpy.array([(rng.uniform(-20, 20), rng.uniform(-20, 20)) for _ in range(n)])
+    angular = numpy.array([rng.uniform(-50, 50) for _ in range(n)])
+    def loop():
+        world.integrate(linear, angular, 1/60)
+        world.move()
+    return loop
+
+PAIRWISE_LIMIT = 1000
+""" Largest number of agents quadratic scenarios are run with """
+
+scenarios = [
+    # Kinematic
+    Scenario('kinematic.Seek', targeted(kinematic.Seek)),
+    Scenario('kinematic.Flee', targeted(kinematic.Flee)),
+    Scenario('kinematic.Arrive', targeted(kinematic.Arrive)),
+    Scenario('kinematic.Align', targeted(kinematic.Align)),
+    Scenario('kinematic.VelocityMatch', targeted(kinematic.VelocityMatch)),
+    Scenario('kinematic.Pursue', targeted(kinematic.Pursue)),
+    Scenario('kinematic.Evade', targeted(kinematic.Evade)),
+    Scenario('kinematic.Face', targeted(kinematic.Face)),
+    Scenario('kinematic.LookWhereYoureGoing', alone(kinematic.LookWhereYoureGoing)),
+    Scenario('kinematic.Wander', alone(kinematic.Wander)),
+    Scenario('kinematic.Stationary', alone(kinematic.Stationary)),
+    Scenario('kinematic.NullSteering', alone(lambda agent: kinematic.NullSteering())),
+    Scenario('kinematic.FollowPath', follow_path),
+    Scenario('kinematic.Separation', swarm(kinematic.Separation), max_agents = PAIRWISE_LIMIT),
+    Scenario('kinematic.Separation[grid]', swarm(kinematic.Separation, grid = True)),
+    Scenario('kinematic.CollisionAvoidance', swarm(kinematic.CollisionAvoidance), max_agents = PAIRWISE_LIMIT),
+    Scenario('kinematic.CollisionAvoidance[grid]', swarm(kinematic.CollisionAvoidance, grid = True)),
+    Scenario('kinematic.ObstacleAvoidance', with_obstacles(kinematic.ObstacleAvoidance), uses_obstacles = True, max_agents = PAIRWISE_LIMIT),
+    Scenario('kinematic.ObstacleAvoidance[grid]', with_obstacles(kinematic.ObstacleAvoidance, grid = True), uses_obstacles = True),
+    Scenario('kinematic.cast_obstacle_rays', batch_rays(), uses_obstacles = True, max_agents = PAIRWISE_LIMIT),
+    Scenario('kinematic.cast_obstacle_rays[grid]', batch_rays(grid = True), uses_obstacles = True),
+    # Batched
+    Scenario('kinematic_batch.seek', batched(kinematic_batch.seek)),
+    Scenario('kinematic_batch.arrive', batched(lambda world, characters, targets: kinematic_batch.arrive(world, characters, targets, 10, 100))),
+    Scenario('kinematic_batch.pursue', batched(kinematic_batch.pursue)),
+    Scenario('kinematic_batch.face', batched(kinematic_batch.face, angular = True)),
+    Scenario('kinematic_batch.look_where_youre_going', batched(lambda world, characters, targets: kinematic_batch.look_where_youre_going(world, characters), angular = True)),
+    Scenario('static_batch.seek', static_batched(static_batch.seek)),
+    Scenario('static_batch.arrive', static_batched(lambda world, characters, targets: static_batch.arrive(world, characters, targets, 10))),
+    Scenario('static_batch.Wander', static_batch_wander),
+    # Static
+    Scenario('static.Seek', targeted(static.Seek, static)),
+    Scenario('static.Flee', targeted(static.Flee, static)),
+    Scenario('static.Arrive', targeted(static.Arrive, static)),
+    Scenario('static.Wander', alone(static.Wander, static)),
+    # Blended
+    Scenario('blended.Flocking', flocking),
+    Scenario('blended.Arrive', blended_arrive, uses_obstacles = True),
+    Scenario('blended.Wander', blended_wander, uses_obstacles = True),
+    Scenario('blended.Surround', targeted(lambda agent, target: blended.Surround(agent, target, 100))),
+    Scenario('blended.Surround[cache]', cached_surround),
+    Scenario('blended.Arrive[plan]', compiled_arrive, uses_obstacles = True),
+    # Priority
+    Scenario('priority.PrioritySteering', priority_pursue, uses_obstacles = True),
+    Scenario('priority.OscilateHorizontally', oscilate_horizontally),
+    # Scheduling
+    Scenario('scheduler.AIScheduler', ai_scheduler),
+    Scenario('scheduler.Throttled', throttled_avoidance, uses_obstacles = True),
+    # Paths
+    Scenario('path.Path', path_iterator(sine_path)),
+    Scenario('path.CyclicPath', path_iterator(cyclic_sine_path)),
+    Scenario('path.MirroredPath', path_iterator(mirrored_sine_path)),
+    Scenario('path.PathCircumference', path_iterator(lambda position: path.PathCircumference(position, 100))),
+    Scenario('path.PathParabola', path_iterator(lambda position: path.PathParabola(position))),
+    Scenario('path.PolylinePath', follow_route(lambda points: path.PolylinePath(points, cyclic = True))),
+    Scenario('path.CatmullRomPath', follow_route(lambda points: path.CatmullRomPath(points, cyclic = True))),
+    Scenario('path.BezierPath', follow_route(bezier_route)),
+    Scenario('convoy.Convoy', route_convoy),
+    # Navigation
+    Scenario('navigation.Navigator', navigation(cached = False), uses_obstacles = True, max_agents = 100),
+    Scenario('navigation.Navigator[cached]', navigation(cached = True), uses_obstacles = True),
+    # World
+    Scenario('world.AgentWorld', world_integrate),
+    Scenario('group.AIGroup', ai_group(in_world = True)),
+    Scenario('group.AIGroup[GameObject]', ai_group(in_world = False)),
+]
+""" list(:py:class:`Scenario`) : Every benchmark scenario """
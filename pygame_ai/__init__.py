@@ -1,3 +1,8 @@
 from . import gameobject
 from . import steering
 from . import utils
+from . import world
+from . import group
+from . import navigation
+from . import profiling
+from . import tracing
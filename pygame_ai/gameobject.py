@@ -6,6 +6,8 @@
 """
 import pygame
 from pygame_ai.utils import list_utils
+from pygame_ai.utils import image_cache
+from pygame_ai.utils import math_utils
 
 null_surface = pygame.Surface((0, 0))
 """ (:pgsurf:`Surface`) : Empty Surface with size 0 """
@@ -32,6 +34,10 @@ class GameObject(pygame.sprite.Sprite):
         Maximum angular speed
     max_angular_accel: int, optional
         Maximum angular acceleration
+    copy_image: bool, optional
+        If True, self.image is a copy of img_surf. If False, img_surf is
+        shared, which is much cheaper when spawning many objects with the
+        same image, but it must not be drawn on. Defaults to True
     
     
     This class exposes the following public properties and methods
@@ -60,13 +66,13 @@ class GameObject(pygame.sprite.Sprite):
     max_angular_accel: int
         Maximum angular acceleration
     """
-    def __init__(self, img_surf = null_surface, pos = (0, 0), max_speed = 30, max_accel = 20, max_rotation = 60, max_angular_accel = 50):
+    def __init__(self, img_surf = null_surface, pos = (0, 0), max_speed = 30, max_accel = 20, max_rotation = 60, max_angular_accel = 50, copy_image = True):
         """
         Constructor
         """
         super(GameObject, self).__init__()
         self.original_image = img_surf
-        self.image = self.original_image.copy()
+        self.image = self.original_image.copy() if copy_image else self.original_image
         self.rect = self.image.get_rect()
         self.rect.center = pos
         self.velocity = pygame.Vector2(0, 0)
@@ -98,9 +104,7 @@ class GameObject(pygame.sprite.Sprite):
         self.velocity += steering.linear * tick
         self.rotation += steering.angular * tick
         
-        if self.velocity.length() > self.max_speed:
-            self.velocity.normalize_ip()
-            self.velocity *= self.max_speed
+        math_utils.clip_velocity(self)
             
     def steer_x(self, steering, tick):
         """ Updates GameObject's velocity along the x axis
@@ -116,10 +120,10 @@ class GameObject(pygame.sprite.Sprite):
         steering_x.linear[1] = 0
         steering_x.angular = 0
         
-        self.velocity += steering_x.linear * tick
-        
-        if self.velocity[0] > self.max_speed:
-            self.velocity[0] = self.max_speed
+        velocity = self.velocity + steering_x.linear * tick
+        if velocity[0] > self.max_speed:
+            velocity[0] = self.max_speed
+        self.velocity = velocity
         #self.steer(steering_x, tick)
         
     def steer_y(self, steering, tick):
@@ -136,10 +140,10 @@ class GameObject(pygame.sprite.Sprite):
         steering_y.linear[0] = 0
         steering_y.angular = 0
         
-        self.velocity += steering_y.linear * tick
-        
-        if self.velocity[1] > self.max_speed:
-            self.velocity[1] = self.max_speed
+        velocity = self.velocity + steering_y.linear * tick
+        if velocity[1] > self.max_speed:
+            velocity[1] = self.max_speed
+        self.velocity = velocity
         
         #self.steer(steering_y, tick)
         
@@ -157,6 +161,26 @@ class GameObject(pygame.sprite.Sprite):
         steering_angular.linear[0], steering_angular.linear[1] = 0, 0
         self.steer(steering_angular)
         
+    def rotate_image(self, cache = None):
+        """ Sets self.image to self.original_image rotated to the current orientation
+        
+        Rotated images are looked up in a shared
+        :py:class:`~utils.image_cache.SurfaceCache`, so objects with the
+        same original image only rotate it once per angle step. The rect
+        is resized to fit the rotated image, keeping its center.
+        
+        Parameters
+        ----------
+        cache: :py:class:`~utils.image_cache.SurfaceCache`, optional
+            Cache to use, defaults to :py:data:`~utils.image_cache.default_cache`
+        """
+        if cache is None:
+            cache = image_cache.default_cache
+        self.image = cache.rotated(self.original_image, self.orientation)
+        center = self.rect.center
+        self.rect.size = self.image.get_size()
+        self.rect.center = center
+        
     def get_lines(self):
         """ Reruns what it returns, can you guess what it is? """
         left = [self.rect.topleft, self.rect.bottomleft]
@@ -174,7 +198,7 @@ class DummyGameObject(GameObject):
     
     Used for quick instantiation when creating :py:class:`GameObject` s
     that will only be used as palceholders and are not meant to appear
-    on screen.
+    on screen. :py:class:`TargetPoint` is a lighter alternative.
     
     Parameters
     ----------
@@ -186,3 +210,174 @@ class DummyGameObject(GameObject):
         """ Constructor
         """
         super(DummyGameObject, self).__init__(pos = position, max_speed = 0, max_accel = 0, max_rotation = 0, max_angular_accel = 0)
+
+
+class TargetPoint(object):
+    """ Movable point with the kinematic attributes of a :py:class:`GameObject`
+    
+    Lightweight replacement for :py:class:`DummyGameObject`: it is not a
+    :pgsprite:`Sprite` and has no image, just the attributes steering
+    behaviors read from a target, stored in ``__slots__``. It can be used
+    as the target of any behavior, the built-in behaviors use it for their
+    internal targets.
+    
+    Parameters
+    ----------
+    
+    position: list_like(float, float), optional
+        Current position
+    orientation: float, optional
+        Current orientation in degrees
+    
+    Attributes
+    ----------
+    
+    position: :pgmath:`Vector2`
+        Current position, assigning it copies the values into the
+        existing vector
+    velocity: :pgmath:`Vector2`
+        Current velocity
+    orientation: float
+        Current orientation in degrees
+    rotation: float
+        Current angular velocity
+    rect: :pgrect:`Rect`
+        Rect of size 0 at the point's position
+    """
+    
+    __slots__ = ('_position', 'velocity', 'orientation', 'rotation')
+    
+    # Targets don't move on their own
+    max_speed = 0
+    max_accel = 0
+    max_rotation = 0
+    max_angular_accel = 0
+    
+    def __init__(self, position = (0, 0), orientation = 0):
+        self._position = pygame.Vector2(position[0], position[1])
+        self.velocity = pygame.Vector2(0, 0)
+        self.orientation = orientation
+        self.rotation = 0
+    
+    def __repr__(self):
+        return 'TargetPoint({}, {})'.format(self._position[0], self._position[1])
+    
+    @property
+    def position(self):
+        return self._position
+    
+    @position.setter
+    def position(self, pos):
+        # Copy, so the point never aliases another object's vector
+        position = self._position
+        position[0] = pos[0]
+        position[1] = pos[1]
+    
+    @property
+    def rect(self):
+        return pygame.Rect(int(self._position[0]), int(self._position[1]), 0, 0)
+
+
+class CompactGameObject(pygame.sprite.Sprite):
+    """ Lightweight :py:class:`GameObject` with a float position
+    
+    Derives from :pgsprite:`Sprite`.
+    
+    Takes the same parameters as :py:class:`GameObject` and can be used
+    anywhere a :py:class:`GameObject` is expected, but it is cheaper to
+    use from steering behaviors:
+    
+        * Its own attributes are stored in ``__slots__``
+        * :py:attr:`position` is stored as floats instead of being rounded
+          to the pixels of :py:attr:`rect`, so slow agents don't drift or
+          get stuck when using small ticks
+        * :py:attr:`position` returns the same :pgmath:`Vector2` on every
+          read instead of creating a new one, and :py:meth:`move` updates
+          it in place
+        * :py:attr:`rect` is only synced to the position when it is read,
+          usually once per frame when the object is drawn
+    
+    Notes
+    -----
+    :py:attr:`position` is the object's own vector and always holds its
+    current position: assigning a position and :py:meth:`move` copy the
+    new values into it, like :py:class:`TargetPoint` does. Treat it as
+    read-only, changing it in place moves the object, and copy it, with
+    ``pygame.Vector2(obj.position)``, to keep an old position.
+    
+    Moving :py:attr:`rect` in place, like ``obj.rect.move_ip(velocity)``,
+    does not move the object, use :py:meth:`move` or assign
+    :py:attr:`position` instead.
+    
+    Attributes
+    ----------
+    
+    image: :pgsurf:`Surface`
+        Surface to be blited to screen
+    rect: :pgrect:`Rect`
+        Derived from image, centered at the object's position
+    position: :pgmath:`Vector2`
+        Current position
+    velocity: :pgmath:`Vector2`
+        Current velocity
+    """
+    
+    __slots__ = ('original_image', 'image', 'velocity', 'max_speed', 'max_accel',
+                 'orientation', 'rotation', 'max_rotation', 'max_angular_accel',
+                 '_position', '_rect')
+    
+    def __init__(self, img_surf = null_surface, pos = (0, 0), max_speed = 30, max_accel = 20, max_rotation = 60, max_angular_accel = 50):
+        super(CompactGameObject, self).__init__()
+        self.original_image = img_surf
+        self.image = img_surf
+        self._rect = img_surf.get_rect()
+        self._position = pygame.Vector2(pos[0], pos[1])
+        self.velocity = pygame.Vector2(0, 0)
+        self.max_speed = max_speed
+        self.max_accel = max_accel
+        self.orientation = 0
+        self.rotation = 0
+        self.max_rotation = max_rotation
+        self.max_angular_accel = max_angular_accel
+    
+    def __repr__(self):
+        return 'CompactGameObject({}, {})'.format(self._position[0], self._position[1])
+    
+    @property
+    def position(self):
+        return self._position
+    
+    @position.setter
+    def position(self, pos):
+        # Copy, so the object never aliases another object's vector
+        position = self._position
+        position[0] = pos[0]
+        position[1] = pos[1]
+    
+    @property
+    def rect(self):
+        """ :pgrect:`Rect` centered at the object's position, synced when read """
+        position = self._position
+        self._rect.center = (int(position[0]), int(position[1]))
+        return self._rect
+    
+    @rect.setter
+    def rect(self, rect):
+        self._rect = pygame.Rect(rect)
+        self.position = self._rect.center
+    
+    def move(self):
+        """ Moves the object along its velocity and rotation
+        
+        This is the float equivalent of ``rect.move_ip(velocity)``,
+        orientation is also advanced by the rotation.
+        """
+        self._position += self.velocity
+        self.orientation += self.rotation
+    
+    # Movement and geometry work exactly as they do for GameObjects
+    steer = GameObject.steer
+    steer_x = GameObject.steer_x
+    steer_y = GameObject.steer_y
+    steer_angular = GameObject.steer_angular
+    get_lines = GameObject.get_lines
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+""" Sprite Group of AI Agents
+
+This module implements :py:class:`AIGroup`, a :pgsprite:`RenderUpdates`
+that owns (sprite, behavior) pairs and runs the whole AI step of every
+agent in a single :py:meth:`AIGroup.update` call: steering evaluation,
+integration of velocity and rotation, and movement.
+
+When every agent in the group is an :py:class:`~world.AgentView` of the
+same :py:class:`~world.AgentWorld`, integration and movement are done
+with the world's vectorized methods, and behaviors are evaluated with
+:py:func:`~steering.plan.run`, which batches the ones that have a
+vectorized equivalent. Otherwise every agent is updated one by one, as a
+hand written game loop would do.
+
+A group that holds every agent of its world ends the world's tick when
+it moves them. If several groups share a world, call
+:py:meth:`~world.AgentWorld.advance` once after updating all of them.
+
+Example
+-------
+
+.. code-block:: python
+
+    npcs = AIGroup()
+    for x in range(100):
+        npc = world.add(img, pos = (x*20, 100))
+        npcs.add_agent(npc, kinematic.Seek(npc, player))
+
+    # Inside the game loop
+    npcs.update(tick)
+    screen.blit(background, (0, 0))
+    pygame.display.update(npcs.draw(screen))
+"""
+
+import numpy
+import pygame
+
+from pygame_ai.world import AgentView
+from pygame_ai.steering import kinematic
+from pygame_ai.steering import plan
+
+class _Batch(object):
+    """ Update state of the agents of an :py:class:`AIGroup`, rebuilt when agents are added or removed """
+
+    __slots__ = ('sprites', 'behaviors', 'world', 'indices', 'contiguous', 'steerings', 'linear', 'angular')
+
+    def __init__(self, behaviors):
+        self.sprites = list(behaviors)
+        self.behaviors = [behaviors[sprite] for sprite in self.sprites]
+        self.world = None
+        self.indices = None
+        self.contiguous = False
+        self.steerings = None
+
+        sprites = self.sprites
+        world = sprites[0].world if sprites and isinstance(sprites[0], AgentView) else None
+        if world is not None and all(isinstance(sprite, AgentView) and sprite.world is world for sprite in sprites):
+            self.world = world
+            indices = numpy.array([sprite.index for sprite in sprites], dtype = int)
+            # Slices are faster than fancy indexing, and stay valid if the world grows
+            self.contiguous = bool((indices == numpy.arange(len(indices))).all())
+            self.indices = slice(0, len(indices)) if self.contiguous else indices
+            self.linear = numpy.empty((len(sprites), 2))
+            self.angular = numpy.empty(len(sprites))
+        else:
+            self.steerings = [kinematic.SteeringOutput() for _ in sprites]
+
+
+class AIGroup(pygame.sprite.RenderUpdates):
+    """ :pgsprite:`RenderUpdates` that steers and moves its agents
+
+    Sprites added with :py:meth:`add_agent` are steered by their behavior
+    on every :py:meth:`update`, sprites added with ``add`` are only drawn.
+
+    Parameters
+    ----------
+    sprites: :pgsprite:`Sprite`, optional
+        Sprites to add, without behavior
+
+    Attributes
+    ----------
+    behaviors: dict(:pgsprite:`Sprite`, :py:class:`~.KinematicSteeringBehavior`)
+        Behavior of every agent
+    """
+
+    def __init__(self, *sprites):
+        self.behaviors = {}
+        self._batch = None
+        super(AIGroup, self).__init__(*sprites)
+
+    def add_agent(self, sprite, behavior):
+        """ Adds a sprite that will be steered by behavior
+
+        Parameters
+        ----------
+        sprite: :py:class:`~gameobject.GameObject`
+            Any object that can be steered, like a
+            :py:class:`~gameobject.GameObject`, a
+            :py:class:`~gameobject.CompactGameObject` or an
+            :py:class:`~world.AgentView`
+        behavior: :py:class:`~.KinematicSteeringBehavior`
+            Behavior that steers the sprite
+        """
+        self.behaviors[sprite] = behavior
+        self._batch = None
+        self.add(sprite)
+
+    def remove_internal(self, sprite):
+        super(AIGroup, self).remove_internal(sprite)
+        if self.behaviors.pop(sprite, None) is not None:
+            self._batch = None
+
+    def update(self, tick):
+        """ Steers and moves every agent
+
+        All the behaviors are evaluated before any agent is moved, so
+        every agent sees the state of the others at the start of the tick.
+
+        Parameters
+        ----------
+        tick: float
+            Time transcurred since last loop
+
+        Returns
+        -------
+        list(:pgrect:`Rect`)
+            Areas that changed, covering the old and new rect of every
+            agent that moved
+        """
+        if self._batch is None:
+            self._batch = _Batch(self.behaviors)
+        batch = self._batch
+        sprites = batch.sprites
+        old_rects = [sprite.rect.copy() for sprite in sprites]
+
+        if batch.world is not None:
+            plan.run(batch.behaviors, batch.linear, batch.angular)
+            world = batch.world
+            world.integrate(batch.linear, batch.angular, tick, batch.indices)
+            if batch.contiguous and len(sprites) == world.count:
+                # Every agent of the world, this ends its tick
+                world.move()
+            else:
+                world.move(batch.indices)
+        else:
+            steerings = batch.steerings
+            for behavior, steering in zip(batch.behaviors, steerings):
+                steering.copy_from(behavior.get_steering())
+            for sprite, steering in zip(sprites, steerings):
+                steering.update(sprite, tick)
+                if hasattr(sprite, 'move'):
+                    sprite.move()
+                else:
+                    sprite.rect.move_ip(sprite.velocity)
+                    sprite.orientation += sprite.rotation
+
+        dirty = []
+        for sprite, old_rect in zip(sprites, old_rects):
+            rect = sprite.rect
+            if rect != old_rect:
+                dirty.append(old_rect.union(rect))
+        return dirty
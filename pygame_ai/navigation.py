@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+""" Grid Navigation
+
+Steering behaviors only look at what is around the character, so a
+character that **Arrives** at a point behind a concave obstacle gets stuck
+in it. This module finds routes around obstacles before steering starts:
+
+    * :py:class:`OccupancyGrid` splits the world into square cells and
+      marks the ones covered by obstacles
+    * :py:class:`Navigator` finds the shortest route between two points
+      with A* over the free cells, and returns it as a
+      :py:class:`~.path.PolylinePath` ready for
+      :py:class:`~.kinematic.FollowPath`
+
+Routes are cached by start cell, goal cell and grid version, so ordering
+many units from the same place to the same destination only searches
+once, and changing the grid makes every cached route stale.
+
+Example
+-------
+
+.. code-block:: python
+
+    grid = OccupancyGrid(screen.get_rect(), cell_size = 32, obstacles = walls, margin = 10)
+    navigator = Navigator(grid)
+
+    route = navigator.find_path(npc.position, destination)
+    if route is not None:
+        npc.steering = kinematic.FollowPath(npc, route, path_offset = 20)
+"""
+
+import collections
+import heapq
+import math
+
+import pygame
+
+from pygame_ai.steering.path import PolylinePath
+
+_diagonal_cost = math.sqrt(2)
+
+class OccupancyGrid(object):
+    """ Grid of square cells marking where obstacles are
+
+    A cell is blocked if any obstacle rect, grown by margin on every side,
+    overlaps it. Cells are numbered row by row, cell (column, row) being
+    ``row*columns + column``.
+
+    Parameters
+    ----------
+    bounds: :pgrect:`Rect` or list_like(float, float, float, float)
+        Area covered by the grid, points outside of it belong to the
+        closest border cell
+    cell_size: int, optional
+        Side of the cells
+    obstacles: list(:py:class:`~gameobject.GameObject` or :pgrect:`Rect`), optional
+        Obstacles to mark on the grid
+    margin: float, optional
+        Distance from the obstacles that is also blocked, usually the
+        radius of the agents that will navigate the grid
+
+    Attributes
+    ----------
+    columns: int
+        Number of columns of cells
+    rows: int
+        Number of rows of cells
+    blocked: list(bool)
+        Whether every cell is blocked, indexed by cell number
+    version: int
+        Incremented every time the blocked cells change
+    """
+
+    def __init__(self, bounds, cell_size = 32, obstacles = (), margin = 0):
+        self.bounds = pygame.Rect(bounds)
+        self.cell_size = cell_size
+        self.margin = margin
+        self.columns = max(int(math.ceil(self.bounds.width / cell_size)), 1)
+        self.rows = max(int(math.ceil(self.bounds.height / cell_size)), 1)
+        self.blocked = [False] * (self.columns * self.rows)
+        self.version = 0
+        if obstacles:
+            self.rebuild(obstacles)
+
+    def __len__(self):
+        return len(self.blocked)
+
+    def __repr__(self):
+        return 'OccupancyGrid({}x{} cells, {} blocked, version {})'.format(self.columns, self.rows, sum(self.blocked), self.version)
+
+    def rebuild(self, obstacles):
+        """ Clears the grid and marks the given obstacles
+
+        Parameters
+        ----------
+        obstacles: list(:py:class:`~gameobject.GameObject` or :pgrect:`Rect`)
+        """
+        self.blocked = [False] * (self.columns * self.rows)
+        for obstacle in obstacles:
+            self._mark(obstacle, True)
+        self.version += 1
+
+    def add_obstacle(self, obstacle):
+        """ Blocks the cells covered by obstacle
+
+        Parameters
+        ----------
+        obstacle: :py:class:`~gameobject.GameObject` or :pgrect:`Rect`
+        """
+        self._mark(obstacle, True)
+        self.version += 1
+
+    def set_blocked(self, area, blocked = True):
+        """ Blocks, or frees, every cell overlapped by area, without margin
+
+        Use it for doors, bridges and anything else that opens and closes.
+
+        Parameters
+        ----------
+        area: :pgrect:`Rect` or list_like(float, float, float, float)
+        blocked: bool, optional
+        """
+        margin, self.margin = self.margin, 0
+        try:
+            self._mark(pygame.Rect(area), blocked)
+        finally:
+            self.margin = margin
+        self.version += 1
+
+    def _mark(self, obstacle, blocked):
+        """ Sets the cells covered by obstacle to blocked """
+        rect = getattr(obstacle, 'rect', obstacle)
+        rect = pygame.Rect(rect)
+        size = self.cell_size
+        margin = self.margin
+        left = (rect.left - margin - self.bounds.left) / size
+        top = (rect.top - margin - self.bounds.top) / size
+        right = (rect.right + margin - self.bounds.left) / size
+        bottom = (rect.bottom + margin - self.bounds.top) / size
+
+        # Cells touched only by the edge of the rect are left free
+        columns = range(max(int(math.floor(left)), 0), min(int(math.ceil(right)), self.columns))
+        rows = range(max(int(math.floor(top)), 0), min(int(math.ceil(bottom)), self.rows))
+        for row in rows:
+            start = row*self.columns
+            for column in columns:
+                self.blocked[start + column] = blocked
+
+    def cell_of(self, point):
+        """ Returns the number of the cell point falls in
+
+        Parameters
+        ----------
+        point: list_like(float, float)
+
+        Returns
+        -------
+        int
+        """
+        column = int((point[0] - self.bounds.left) // self.cell_size)
+        row = int((point[1] - self.bounds.top) // self.cell_size)
+        column = min(max(column, 0), self.columns - 1)
+        row = min(max(row, 0), self.rows - 1)
+        return row*self.columns + column
+
+    def center_of(self, cell):
+        """ Returns the center of a cell
+
+        Parameters
+        ----------
+        cell: int
+
+        Returns
+        -------
+        tuple(float, float)
+        """
+        row, column = divmod(cell, self.columns)
+        return (self.bounds.left + (column + 0.5)*self.cell_size,
+                self.bounds.top + (row + 0.5)*self.cell_size)
+
+    def is_blocked(self, point):
+        """ Returns whether the cell point falls in is blocked """
+        return self.blocked[self.cell_of(point)]
+
+    def nearest_free(self, cell):
+        """ Returns the free cell closest to cell, cell itself if it is free
+
+        Agents standing next to an obstacle are usually inside its margin,
+        this gives them a cell to start their route from.
+
+        Parameters
+        ----------
+        cell: int
+
+        Returns
+        -------
+        int or None
+            None if every cell is blocked
+        """
+        blocked = self.blocked
+        if not blocked[cell]:
+            return cell
+        columns = self.columns
+        row, column = divmod(cell, columns)
+        best = None
+        best_distance_sq = float('inf')
+        for ring in range(1, max(self.columns, self.rows)):
+            # Cells of further rings are at least ring cells away
+            if ring*ring > best_distance_sq:
+                break
+            for dy in range(-ring, ring + 1):
+                y = row + dy
+                if not 0 <= y < self.rows:
+                    continue
+                step = 1 if abs(dy) == ring else 2*ring
+                for dx in range(-ring, ring + 1, step):
+                    x = column + dx
+                    if 0 <= x < columns and not blocked[y*columns + x]:
+                        distance_sq = dx*dx + dy*dy
+                        if distance_sq < best_distance_sq:
+                            best = y*columns + x
+                            best_distance_sq = distance_sq
+        return best
+
+
+class Navigator(object):
+    """ A* path finder over an :py:class:`OccupancyGrid`, with a route cache
+
+    Agents move between a cell and its 8 neighbours, but never cut the
+    corner of a blocked cell. The search keeps its open list in a binary
+    heap and its per-cell data in arrays allocated once, cells are told
+    apart from the ones left by previous searches by a generation stamp,
+    so nothing has to be cleared between searches.
+
+    Routes found are kept in a least recently used cache keyed by
+    (start cell, goal cell, grid version).
+
+    Parameters
+    ----------
+    grid: :py:class:`OccupancyGrid`
+        Grid to search
+    cache_size: int, optional
+        Maximum number of routes to keep, 0 disables the cache
+
+    Attributes
+    ----------
+    hits: int
+        Number of searches answered by the cache
+    misses: int
+        Number of searches that ran A*
+    """
+
+    def __init__(self, grid, cache_size = 256):
+        self.grid = grid
+        self.cache_size = cache_size
+        self.cache = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._allocate()
+
+    def __repr__(self):
+        return 'Navigator({} cached routes, {} hits, {} misses)'.format(len(self.cache), self.hits, self.misses)
+
+    def _allocate(self):
+        """ Allocates the per-cell arrays for the current size of the grid """
+        size = len(self.grid.blocked)
+        self._size = size
+        self._cost = [0.0] * size
+        self._parent = [0] * size
+        self._seen = [0] * size
+        self._closed = [0] * size
+        self._generation = 0
+
+    def clear(self):
+        """ Removes every cached route and resets the statistics """
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def find_cells(self, start, goal):
+        """ Returns the cells of the shortest route between two cells
+
+        Parameters
+        ----------
+        start: int
+            Cell the route starts at
+        goal: int
+            Cell the route ends at
+
+        Blocked start or goal cells are replaced by the closest free cell,
+        see :py:meth:`OccupancyGrid.nearest_free`, the route then starts
+        or ends at that cell.
+
+        Returns
+        -------
+        tuple(int) or None
+            Cells where the route changes direction, from start to goal,
+            or None if goal can't be reached
+        """
+        key = (start, goal, self.grid.version)
+        cells = self.cache.get(key)
+        if cells is not None or key in self.cache:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return cells
+
+        self.misses += 1
+        free_start = self.grid.nearest_free(start)
+        free_goal = self.grid.nearest_free(goal)
+        cells = None
+        if free_start is not None and free_goal is not None:
+            cells = self._search(free_start, free_goal)
+        if self.cache_size > 0:
+            self.cache[key] = cells
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last = False)
+        return cells
+
+    def find_path(self, start, goal):
+        """ Returns the shortest route between two points
+
+        Parameters
+        ----------
+        start: list_like(float, float)
+            Point the route starts at, usually the position of the agent
+        goal: list_like(float, float)
+            Point the route ends at
+
+        Returns
+        -------
+        :py:class:`~.path.PolylinePath` or None
+            Route from start to goal through the centers of the cells
+            where it changes direction, or None if goal can't be reached.
+            A start inside a blocked cell first goes to the closest free
+            cell, and a goal inside a blocked cell is replaced by the
+            center of the closest free cell. Every call returns a new
+            path, so it can be given to a :py:class:`~.kinematic.FollowPath`
+            that iterates over it
+        """
+        grid = self.grid
+        start_cell = grid.cell_of(start)
+        goal_cell = grid.cell_of(goal)
+        cells = self.find_cells(start_cell, goal_cell)
+        if cells is None:
+            return None
+        points = [(start[0], start[1])]
+        if cells[0] != start_cell:
+            points.append(grid.center_of(cells[0]))
+        points.extend(grid.center_of(cell) for cell in cells[1:-1])
+        if cells[-1] != goal_cell:
+            points.append(grid.center_of(cells[-1]))
+        else:
+            points.append((goal[0], goal[1]))
+        return PolylinePath(points)
+
+    def _search(self, start, goal):
+        """ Runs A* from start to goal, returns the cells of the route or None """
+        grid = self.grid
+        blocked = grid.blocked
+        if blocked[start] or blocked[goal]:
+            return None
+        if start == goal:
+            return (start, goal)
+
+        if len(blocked) != self._size:
+            self._allocate()
+        self._generation += 1
+        generation = self._generation
+        cost = self._cost
+        parent = self._parent
+        seen = self._seen
+        closed = self._closed
+
+        columns = grid.columns
+        rows = grid.rows
+        goal_row, goal_column = divmod(goal, columns)
+
+        def heuristic(cell):
+            # Octile distance, exact on a grid without obstacles
+            row, column = divmod(cell, columns)
+            dx = abs(column - goal_column)
+            dy = abs(row - goal_row)
+            return (dx + dy) + (_diagonal_cost - 2)*min(dx, dy)
+
+        cost[start] = 0.0
+        parent[start] = start
+        seen[start] = generation
+        # Ties are broken by insertion order, so cells are never compared
+        counter = 0
+        heap = [(heuristic(start), counter, start)]
+
+        while heap:
+            _, _, cell = heapq.heappop(heap)
+            if closed[cell] == generation:
+                continue
+            if cell == goal:
+                return self._route(start, goal)
+            closed[cell] = generation
+
+            row, column = divmod(cell, columns)
+            cell_cost = cost[cell]
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)):
+                neighbour_column = column + dx
+                neighbour_row = row + dy
+                if not (0 <= neighbour_column < columns and 0 <= neighbour_row < rows):
+                    continue
+                neighbour = neighbour_row*columns + neighbour_column
+                if blocked[neighbour] or closed[neighbour] == generation:
+                    continue
+                if dx and dy:
+                    # Don't cut corners
+                    if blocked[row*columns + neighbour_column] or blocked[neighbour_row*columns + column]:
+                        continue
+                    new_cost = cell_cost + _diagonal_cost
+                else:
+                    new_cost = cell_cost + 1
+                if seen[neighbour] != generation or new_cost < cost[neighbour]:
+                    seen[neighbour] = generation
+                    cost[neighbour] = new_cost
+                    parent[neighbour] = cell
+                    counter += 1
+                    heapq.heappush(heap, (new_cost + heuristic(neighbour), counter, neighbour))
+        return None
+
+    def _route(self, start, goal):
+        """ Walks the parents back from goal, keeping only the cells where the route turns """
+        columns = self.grid.columns
+        parent = self._parent
+        cells = [goal]
+        direction = None
+        cell = goal
+        while cell != start:
+            previous = parent[cell]
+            row, column = divmod(cell, columns)
+            previous_row, previous_column = divmod(previous, columns)
+            new_direction = (previous_column - column, previous_row - row)
+            if new_direction == direction:
+                cells[-1] = previous
+            else:
+                cells.append(previous)
+            direction = new_direction
+            cell = previous
+        cells.reverse()
+        return tuple(cells)
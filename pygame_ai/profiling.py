@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+""" Steering Behavior Profiling
+
+This module implements an opt-in profiling layer for steering behaviors.
+Once :py:func:`enable` d, every call to ``get_steering`` of every
+:py:class:`~.KinematicSteeringBehavior` and :py:class:`~.StaticSteeringBehavior`
+is counted and timed, per behavior class and per character. Behavior
+classes are identified by their full name, like ``pygame_ai.steering.kinematic.Seek``,
+and a call is recorded under the class of the behavior, even if it
+inherits ``get_steering``. Some behaviors
+also record domain counters:
+
+    * ``obstacle_avoidance.ray_segment_tests``: ray-edge intersection tests in :py:class:`~.kinematic.ObstacleAvoidance`
+    * ``separation.distance_checks``: targets checked by :py:class:`~.kinematic.Separation`
+    * ``collision_avoidance.distance_checks``: targets checked by :py:class:`~.kinematic.CollisionAvoidance`
+    * ``follow_path.advances``: points advanced by :py:class:`~.kinematic.FollowPath`
+
+Statistics are grouped in frames, call :py:func:`new_frame` once per loop.
+While profiling is disabled behaviors are not wrapped at all and counters
+cost a single flag check.
+
+Times are inclusive: the time of a composite behavior, like
+:py:class:`~.blended.BlendedSteering`, includes the time of its children.
+An override that calls the ``get_steering`` of its base class is
+recorded once.
+
+Example
+-------
+
+.. code-block:: python
+
+    profiling.enable()
+
+    # Inside the game loop
+    profiling.new_frame()
+    ...
+
+    # After a slow frame
+    print(profiling.profiler.slowest(5))
+    profiling.profiler.to_csv('ai_profile.csv')
+"""
+
+import collections
+import csv
+import json
+import time
+
+from pygame_ai.utils import instrumentation
+
+enabled = False
+""" bool : Whether profiling is enabled, behaviors check it before recording counters """
+
+profiler = None
+""" :py:class:`Profiler` : Profiler that collects statistics while profiling is enabled """
+
+_names = {}
+""" dict(type, str) : Full name of every behavior class seen """
+
+_active = set()
+""" set(int) : id of every behavior whose call is being timed """
+
+class FrameStats(object):
+    """ Statistics collected during one frame
+
+    Attributes
+    ----------
+    index: int
+        Number of the frame
+    calls: dict(tuple(str, str), list(int, float))
+        Number of calls and total seconds per (behavior class, character)
+    counters: dict(str, int)
+        Domain counters
+    """
+
+    __slots__ = ('index', 'calls', 'counters')
+
+    def __init__(self, index):
+        self.index = index
+        self.calls = {}
+        self.counters = collections.Counter()
+
+    def __repr__(self):
+        return 'FrameStats({}, {} calls)'.format(self.index, sum(count for count, _ in self.calls.values()))
+
+    def by_behavior(self):
+        """ Returns calls and seconds per behavior class, adding up all characters
+
+        Returns
+        -------
+        dict(str, tuple(int, float))
+        """
+        totals = {}
+        for (behavior, _), (count, seconds) in self.calls.items():
+            total_count, total_seconds = totals.get(behavior, (0, 0.0))
+            totals[behavior] = (total_count + count, total_seconds + seconds)
+        return totals
+
+    def by_character(self):
+        """ Returns calls and seconds per character, adding up all behaviors
+
+        Returns
+        -------
+        dict(str, tuple(int, float))
+        """
+        totals = {}
+        for (_, character), (count, seconds) in self.calls.items():
+            total_count, total_seconds = totals.get(character, (0, 0.0))
+            totals[character] = (total_count + count, total_seconds + seconds)
+        return totals
+
+    def as_dict(self):
+        return {
+            'frame': self.index,
+            'calls': [
+                {'behavior': behavior, 'character': character, 'calls': count, 'seconds': seconds}
+                for (behavior, character), (count, seconds) in self.calls.items()
+            ],
+            'counters': dict(self.counters),
+        }
+
+
+class Profiler(object):
+    """ Collects per-frame statistics
+
+    Parameters
+    ----------
+    history: int, optional
+        Number of finished frames to keep
+
+    Attributes
+    ----------
+    current: :py:class:`FrameStats`
+        Frame being recorded
+    frames: collections.deque(:py:class:`FrameStats`)
+        Last finished frames, oldest first
+    """
+
+    def __init__(self, history = 600):
+        self.frames = collections.deque(maxlen = history)
+        self.current = FrameStats(0)
+
+    def __repr__(self):
+        return 'Profiler({} frames)'.format(len(self.frames))
+
+    def record(self, behavior, character, seconds):
+        """ Records a call of a behavior """
+        key = (behavior, character)
+        entry = self.current.calls.get(key)
+        if entry is None:
+            self.current.calls[key] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def count(self, name, amount = 1):
+        """ Adds amount to a domain counter """
+        self.current.counters[name] += amount
+
+    def new_frame(self):
+        """ Finishes the current frame and starts a new one """
+        self.frames.append(self.current)
+        self.current = FrameStats(self.current.index + 1)
+
+    def frame(self, index = -1):
+        """ Returns a finished frame, by default the last one
+
+        Parameters
+        ----------
+        index: int, optional
+            Position in :py:attr:`frames`, negative values count from the end
+
+        Returns
+        -------
+        :py:class:`FrameStats`
+        """
+        return self.frames[index]
+
+    def slowest(self, n = 10, index = -1):
+        """ Returns the n behavior classes that took the most time in a frame
+
+        Returns
+        -------
+        list(tuple(str, int, float))
+            (behavior class, calls, seconds), slowest first
+        """
+        totals = self.frame(index).by_behavior()
+        ranking = sorted(totals.items(), key = lambda item: item[1][1], reverse = True)
+        return [(behavior, count, seconds) for behavior, (count, seconds) in ranking[:n]]
+
+    def to_json(self, path = None):
+        """ Exports every finished frame as JSON
+
+        Parameters
+        ----------
+        path: str, optional
+            File to write, if not given the JSON string is returned
+        """
+        data = json.dumps([frame.as_dict() for frame in self.frames], indent = 2)
+        if path is None:
+            return data
+        with open(path, 'w') as f:
+            f.write(data)
+
+    def to_csv(self, path):
+        """ Exports every finished frame as CSV
+
+        Every row is either a behavior call summary or a counter, with the
+        columns frame, kind, name, character, calls, value.
+        """
+        with open(path, 'w', newline = '') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'kind', 'name', 'character', 'calls', 'value'])
+            for frame in self.frames:
+                for (behavior, character), (count, seconds) in frame.calls.items():
+                    writer.writerow([frame.index, 'behavior', behavior, character, count, seconds])
+                for name, value in frame.counters.items():
+                    writer.writerow([frame.index, 'counter', name, '', '', value])
+
+
+def character_name(character):
+    """ Returns the name used to identify a character in the statistics """
+    if character is None:
+        return ''
+    return '{}#{:x}'.format(type(character).__name__, id(character))
+
+def behavior_name(cls):
+    """ Returns the name used to identify a behavior class in the statistics """
+    name = _names.get(cls)
+    if name is None:
+        name = _names[cls] = '{}.{}'.format(cls.__module__, cls.__qualname__)
+    return name
+
+def _timed(method):
+    """ Returns method wrapped so that every call is recorded in the profiler """
+    clock = time.perf_counter
+    active = _active
+    def get_steering(self, *args, **kwargs):
+        # Calls to the base classes' get_steering are part of this one
+        key = id(self)
+        if key in active:
+            return method(self, *args, **kwargs)
+        active.add(key)
+        start = clock()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            seconds = clock() - start
+            active.discard(key)
+            if profiler is not None:
+                character = getattr(self, 'character', None)
+                if character is None and args:
+                    character = args[0]
+                profiler.record(behavior_name(type(self)), character_name(character), seconds)
+    get_steering.__doc__ = method.__doc__
+    get_steering.__wrapped__ = method
+    return get_steering
+
+def behavior_classes():
+    """ Returns every steering behavior class currently defined """
+    from pygame_ai.steering import kinematic, static
+    found = []
+    pending = [kinematic.KinematicSteeringBehavior, static.StaticSteeringBehavior]
+    while pending:
+        cls = pending.pop()
+        if cls not in found:
+            found.append(cls)
+            pending.extend(cls.__subclasses__())
+    return found
+
+def enable(history = 600):
+    """ Starts profiling
+
+    Wraps the ``get_steering`` of every behavior class defined at the
+    moment of the call, classes defined later are not profiled.
+
+    Parameters
+    ----------
+    history: int, optional
+        Number of finished frames to keep
+
+    Returns
+    -------
+    :py:class:`Profiler`
+    """
+    global enabled, profiler
+    if not enabled:
+        for cls in behavior_classes():
+            if 'get_steering' in cls.__dict__:
+                instrumentation.wrap(cls, 'get_steering', 'profiling', _timed)
+    profiler = Profiler(history)
+    enabled = True
+    return profiler
+
+def disable():
+    """ Stops profiling and unwraps every behavior, the collected statistics are kept in :py:data:`profiler` """
+    global enabled
+    instrumentation.unwrap('profiling')
+    enabled = False
+
+def count(name, amount = 1):
+    """ Adds amount to a domain counter of the current frame, if profiling is enabled """
+    if enabled:
+        profiler.count(name, amount)
+
+def new_frame():
+    """ Finishes the current frame, if profiling is enabled """
+    if enabled:
+        profiler.new_frame()
@@ -3,4 +3,10 @@ from . import path
 from . import priority
 from . import static
 from . import kinematic
+from . import cache
+from . import plan
+from . import scheduler
 
+from . import kinematic_batch
+from . import static_batch
+from . import convoy
@@ -39,7 +39,20 @@ This module also includes a couple of pre-implemented :py:class:`BlendedSteering
 
 from . import kinematic
 from . import path
-from pygame_ai.gameobject import DummyGameObject
+from .scheduler import throttle
+
+def look_where_youre_going(character, cache = None):
+    """ Returns a :py:class:`~.kinematic.LookWhereYoureGoing` for character
+    
+    If a :py:class:`~.cache.SteeringCache` is given, the behavior is shared
+    with every other preset that asks for it with the same cache, and it
+    is evaluated only once per tick.
+    """
+    if cache is None:
+        return kinematic.LookWhereYoureGoing(character)
+    return cache.shared(
+        (kinematic.LookWhereYoureGoing, character),
+        lambda: kinematic.LookWhereYoureGoing(character))
 
 class BehaviorAndWeight(object):
     """ Container for Behavior and Weight values
@@ -48,10 +61,22 @@ class BehaviorAndWeight(object):
     ----------
     behavior: :py:class:`~.KinematicSteeringBehavior`
     weight: int
+    interval: int, optional
+        Number of evaluations of the :py:class:`BlendedSteering` between
+        evaluations of this behavior, the last output is reused in between.
+        Defaults to 1, every evaluation
+    invalidate: function :py:class:`~.scheduler.Throttled` -> bool, optional
+        Forces an evaluation before the interval is over when it returns
+        True, see :py:func:`~.scheduler.velocity_changed`
+    phase: int, optional
+        Offset of the evaluations of this behavior, see
+        :py:func:`~.scheduler.throttle`
     """
     
-    def __init__(self, behavior, weight):
-        self.behavior = behavior
+    __slots__ = ('behavior', 'weight')
+    
+    def __init__(self, behavior, weight, interval = 1, invalidate = None, phase = None):
+        self.behavior = throttle(behavior, interval, invalidate, phase)
         self.weight = weight
 
 class BlendedSteering(kinematic.KinematicSteeringBehavior):
@@ -75,6 +100,7 @@ class BlendedSteering(kinematic.KinematicSteeringBehavior):
     def __init__(self, character, behaviors):
         self.character = character
         self.behaviors = behaviors
+        self.steering = kinematic.SteeringOutput()
         
     def __repr__(self):
         return 'BlendedSteering '+super(BlendedSteering, self).__repr__()
@@ -102,30 +128,24 @@ class BlendedSteering(kinematic.KinematicSteeringBehavior):
     def get_steering(self):
         """ Returns the combined steering request of this :py:class:`~BlendedSteering`
         
+        The same :py:class:`~.kinematic.SteeringOutput` is reused on every
+        call, copy it if you need to keep it across calls.
+        
         Returns
         -------
         :py:class:`SteeringOutput`
             Requested steering
         """
         # Output steering for accumulating
-        steering = kinematic.SteeringOutput()
+        steering = self.steering
+        steering.reset()
         
         # Accumulate all accelerations
         for behavior in self.behaviors:
-            steering += behavior.behavior.get_steering() * behavior.weight
+            steering.iadd_scaled(behavior.behavior.get_steering(), behavior.weight)
             
         # Crop the results and return
-        steering_lin_accel = steering.linear.length()
-        if steering_lin_accel > self.character.max_accel:
-            steering.linear /= steering_lin_accel
-            steering.linear *= self.character.max_accel
-        
-        steering_angular_accel = steering.angular
-        if steering_angular_accel > self.character.max_angular_accel:
-            steering.angular /= steering_angular_accel
-            steering.angular *= self.character.max_angular_accel
-            
-        return steering
+        return steering.clamp_ip(self.character.max_accel, self.character.max_angular_accel)
         
 class Flocking(BlendedSteering):
     """ :py:class:`~.BlendedSteering` that makes the character move in a flock-like way
@@ -137,16 +157,19 @@ class Flocking(BlendedSteering):
     Parameters
     ----------
     character: :py:class:`~.GameObject`
-    swarm: iterable(:pgsprite:`Sprite`)
-        Rest of the entities that conform the Flock
+    swarm: iterable(:pgsprite:`Sprite`) or :py:class:`~utils.spatial.SpatialHashGrid`
+        Rest of the entities that conform the Flock, for large flocks use
+        a :py:class:`~utils.spatial.SpatialHashGrid` rebuilt once per loop
     target: :py:class:`~.GameObject`
+    cache: :py:class:`~.cache.SteeringCache`, optional
+        Cache used to share sub-behaviors with other presets
     """
     
-    def __init__(self, character, swarm, target):
+    def __init__(self, character, swarm, target, cache = None):
         behaviors = [
             BehaviorAndWeight(kinematic.Separation(character, swarm), 3),
             BehaviorAndWeight(kinematic.Arrive(character, target), 1),
-            BehaviorAndWeight(kinematic.LookWhereYoureGoing(character), 1),
+            BehaviorAndWeight(look_where_youre_going(character, cache), 1),
         ]
         super(Flocking, self).__init__(character, behaviors)
         
@@ -161,9 +184,11 @@ class Wander(BlendedSteering):
     character: :py:class:`~.GameObject`
     obstacles: iterable(:pgsprite:`Sprite`)
         Solid obstacles
+    cache: :py:class:`~.cache.SteeringCache`, optional
+        Cache used to share sub-behaviors with other presets
     """
     
-    def __init__(self, character, obstacles):
+    def __init__(self, character, obstacles, cache = None):
         behaviors = [
             # Wander
             BehaviorAndWeight(
@@ -175,7 +200,7 @@ class Wander(BlendedSteering):
                 weight = 4),
             # LookWhereYoureGoing
             BehaviorAndWeight(
-                kinematic.LookWhereYoureGoing(character),
+                look_where_youre_going(character, cache),
                 weight = 2),
         ]
         super(Wander, self).__init__(character, behaviors)
@@ -192,9 +217,11 @@ class Arrive(BlendedSteering):
     target: :py:class:`~.GameObject`
     obstacles: iterable(:pgsprite:`Sprite`)
         Solid obstacles
+    cache: :py:class:`~.cache.SteeringCache`, optional
+        Cache used to share sub-behaviors with other presets
     """
     
-    def __init__(self, character, target, obstacles, target_radius = None, slow_radius = None):
+    def __init__(self, character, target, obstacles, target_radius = None, slow_radius = None, cache = None):
         behaviors = [
             # Arrive
             BehaviorAndWeight(
@@ -206,7 +233,7 @@ class Arrive(BlendedSteering):
                 weight = 2),
             # LookWhereYoureGoing
             BehaviorAndWeight(
-                kinematic.LookWhereYoureGoing(character),
+                look_where_youre_going(character, cache),
                 weight = 1),
         ]
         super(Arrive, self).__init__(character, behaviors)
@@ -223,15 +250,18 @@ class Surround(BlendedSteering):
     target: :py:class:`~.GameObject`
     radius: int
         The radius of the circle the character will surround the target with
+    cache: :py:class:`~.cache.SteeringCache`, optional
+        Cache used to share sub-behaviors with other presets
     """
-    def __init__(self, character, target, radius):
+    def __init__(self, character, target, radius, cache = None):
         circumpath = path.PathCircumference(lambda: target.position, radius)
+        face = kinematic.Face(character, target, cache = cache)
         behaviors = [
             BehaviorAndWeight(
                 kinematic.FollowPath(character, circumpath),
                 weight = 2),
             BehaviorAndWeight(
-                kinematic.Face(character, target),
+                face,
                 weight = 1),
         ]
         super(Surround, self).__init__(character, behaviors)
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+""" Per-tick Steering Cache
+
+This module implements :py:class:`SteeringCache`, a frame-scoped cache of
+steering outputs. A behavior evaluated through the cache is only computed
+once per tick, any further evaluation during the same tick returns the
+cached output. Cached outputs are invalidated automatically when the tick
+counter advances.
+
+The tick counter is read from a *clock*, any object with a ``tick_id``
+attribute, such as :py:class:`~world.AgentWorld`; if no clock is given the
+cache keeps its own counter that is advanced with :py:meth:`SteeringCache.advance`.
+
+Example
+-------
+
+Sharing the :py:class:`~.kinematic.LookWhereYoureGoing` of a character
+among several composite behaviors, it will only be computed once per tick:
+
+.. code-block:: python
+
+    cache = SteeringCache()
+    arrive = blended.Arrive(character, target, obstacles, cache = cache)
+    wander = blended.Wander(character, obstacles, cache = cache)
+
+    # Inside the game loop
+    cache.advance()
+    steering = arrive.get_steering() if chasing else wander.get_steering()
+
+Wrapping any behavior so that it is evaluated once per tick:
+
+.. code-block:: python
+
+    avoidance = cache.wrap(kinematic.ObstacleAvoidance(character, obstacles))
+
+The cache only holds weak references to behaviors: once nothing else
+uses a behavior, its cached output, its wrapper and, for shared
+behaviors, their key are dropped along with it.
+"""
+
+import weakref
+
+from . import kinematic
+
+class SteeringCache(object):
+    """ Frame-scoped cache of steering outputs keyed by behavior and tick
+
+    Parameters
+    ----------
+    clock: object with a ``tick_id`` attribute, optional
+        Source of the tick counter, e.g. an :py:class:`~world.AgentWorld`.
+        If not given the cache keeps its own counter
+
+    Attributes
+    ----------
+    hits: int
+        Number of evaluations served from the cache
+    misses: int
+        Number of evaluations that had to be computed
+    """
+
+    def __init__(self, clock = None):
+        self.clock = clock
+        self.tick_id = 0
+        # behavior -> [tick, output]
+        self.entries = weakref.WeakKeyDictionary()
+        # id(behavior) -> Cached, the Cached keeps the behavior and its id alive
+        self.wrappers = weakref.WeakValueDictionary()
+        # key -> Cached
+        self.shared_behaviors = weakref.WeakValueDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return 'SteeringCache({} entries, {} hits, {} misses)'.format(len(self.entries), self.hits, self.misses)
+
+    def current_tick(self):
+        """ Returns the current tick id """
+        if self.clock is not None:
+            return self.clock.tick_id
+        return self.tick_id
+
+    def advance(self):
+        """ Advances the cache's own tick counter, invalidating every cached output
+
+        Not needed when the cache has a clock.
+        """
+        self.tick_id += 1
+
+    def clear(self):
+        """ Forgets every cached output, wrapper and shared behavior """
+        self.entries.clear()
+        self.wrappers.clear()
+        self.shared_behaviors.clear()
+
+    def get_steering(self, behavior):
+        """ Returns the behavior's steering, computing it at most once per tick
+
+        The returned :py:class:`~.kinematic.SteeringOutput` is owned by
+        the cache and reused on later ticks, copy it if you need to keep it.
+
+        Parameters
+        ----------
+        behavior: :py:class:`~.KinematicSteeringBehavior`
+
+        Returns
+        -------
+        :py:class:`~.kinematic.SteeringOutput`
+        """
+        tick = self.current_tick()
+        entry = self.entries.get(behavior)
+        if entry is None:
+            entry = [None, kinematic.SteeringOutput()]
+            self.entries[behavior] = entry
+        elif entry[0] == tick:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        entry[0] = tick
+        return entry[1].copy_from(behavior.get_steering())
+
+    def wrap(self, behavior):
+        """ Returns a :py:class:`Cached` behavior that evaluates behavior through this cache
+
+        Wrapping the same behavior twice returns the same :py:class:`Cached`.
+        """
+        wrapper = self.wrappers.get(id(behavior))
+        if wrapper is None:
+            wrapper = Cached(behavior, self)
+            self.wrappers[id(behavior)] = wrapper
+        return wrapper
+
+    def shared(self, key, factory):
+        """ Returns a cached behavior shared by everyone asking for the same key
+
+        The first time a key is requested factory is called to create the
+        behavior, which is then wrapped with :py:meth:`wrap`; later
+        requests get that same wrapped behavior, so it is evaluated only
+        once per tick no matter how many composites use it. The key is
+        forgotten once no composite uses the behavior anymore.
+
+        Parameters
+        ----------
+        key: hashable
+            Identifies the logical behavior, e.g. ``(kinematic.LookWhereYoureGoing, character)``
+        factory: function -> :py:class:`~.KinematicSteeringBehavior`
+            Creates the behavior if it doesn't exist yet
+
+        Returns
+        -------
+        :py:class:`Cached`
+        """
+        behavior = self.shared_behaviors.get(key)
+        if behavior is None:
+            behavior = self.wrap(factory())
+            self.shared_behaviors[key] = behavior
+        return behavior
+
+
+class Cached(kinematic.KinematicSteeringBehavior):
+    """ :py:class:`~.KinematicSteeringBehavior` evaluated through a :py:class:`SteeringCache`
+
+    Use :py:meth:`SteeringCache.wrap` instead of creating these directly.
+
+    Parameters
+    ----------
+    behavior: :py:class:`~.KinematicSteeringBehavior`
+        Behavior to cache
+    cache: :py:class:`SteeringCache`
+        Cache that holds the outputs
+    """
+
+    def __init__(self, behavior, cache):
+        self.behavior = behavior
+        self.cache = cache
+
+    def __repr__(self):
+        return 'Cached ' + repr(self.behavior)
+
+    def draw_indicators(self, screen, offset = (lambda pos: pos)):
+        self.behavior.draw_indicators(screen, offset)
+
+    def get_steering(self):
+        return self.cache.get_steering(self.behavior)
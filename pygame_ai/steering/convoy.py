@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+""" Convoys of Agents Following a Shared Path
+
+This module implements :py:class:`Convoy`, the batched counterpart of
+:py:class:`~.kinematic.FollowPath` in its predictive mode, for agents
+that live in an :py:class:`~world.AgentWorld`.
+
+A :py:class:`~.path.Path` is an iterator, so every
+:py:class:`~.kinematic.FollowPath` needs a path of its own. A convoy
+instead only asks its :py:class:`~.path.PolylinePath` for points at given
+distances along it, which changes nothing in the path: the progress of
+every member along the path and its lane are kept in arrays of the
+convoy, and the same path can be shared by any number of convoys. Memory
+and time grow with the number of distinct paths, not with the number of
+agents following them.
+
+Example
+-------
+
+Two hundred guards patrolling the same route, in three lanes:
+
+.. code-block:: python
+
+    route = path.CatmullRomPath(waypoints, cyclic = True)
+    guards = numpy.arange(200)
+    patrol = convoy.Convoy(world, route, guards, lane_offset = (guards % 3 - 1) * 20)
+
+    # Inside the game loop
+    linear = patrol.get_steering()
+    world.integrate(linear, 0, tick, guards)
+    world.move(guards)
+"""
+
+import numpy
+
+from .kinematic_batch import seek_points
+
+class Convoy(object):
+    """ Many characters following the same :py:class:`~.path.PolylinePath`
+
+    Every call to :py:meth:`get_steering` moves the progress of every
+    member to the projection onto the path of its position predict_time
+    seconds ahead, as :py:class:`~.kinematic.FollowPath` does, and returns
+    the accelerations that make them seek the point path_offset further
+    along the path, moved sideways by their lane_offset.
+
+    The projection is local: progress moves along the direction of the
+    path at the member's current progress, and never goes back, so
+    members don't jump between parts of the path that pass close to each
+    other.
+
+    Parameters
+    ----------
+    world: :py:class:`~world.AgentWorld`
+        World the characters live in
+    path: :py:class:`~.path.PolylinePath`
+        Path the convoy follows, it is only read
+    characters: array_like(int, shape = (N,)), optional
+        Indices of the members, defaults to every agent currently in the world
+    progress: array_like(float, shape = (N,)), optional
+        Distance along the path of every member, defaults to the closest
+        point of the path to each member
+    lane_offset: float or array_like(float, shape = (N,)), optional
+        Sideways distance from the path of every member, positive offsets
+        are to the right of the direction of travel as seen on the screen
+    path_offset: float, optional
+        Distance along the path between the projected position of a
+        member and the point it seeks
+    predict_time: float, optional
+        Time, in seconds, ahead of which the position of the members is projected
+
+    Attributes
+    ----------
+    progress: numpy.ndarray(float, shape = (N,))
+        Distance along the path of every member
+    lane_offset: numpy.ndarray(float, shape = (N,))
+        Sideways distance from the path of every member
+    targets: numpy.ndarray(float, shape = (N, 2))
+        Points sought by every member in the last :py:meth:`get_steering`
+    """
+
+    def __init__(self, world, path, characters = None, progress = None, lane_offset = 0, path_offset = 30, predict_time = 0.2):
+        if characters is None:
+            characters = numpy.arange(world.count)
+        self.world = world
+        self.path = path
+        self.characters = numpy.asarray(characters, dtype = int)
+        self.path_offset = path_offset
+        self.predict_time = predict_time
+
+        count = len(self.characters)
+        if progress is None:
+            progress = [path.nearest(point)[0] for point in world.position[self.characters]]
+        self.progress = numpy.array(numpy.broadcast_to(progress, count), dtype = float)
+        self.lane_offset = numpy.array(numpy.broadcast_to(lane_offset, count), dtype = float)
+        self.targets = numpy.zeros((count, 2))
+
+    def __len__(self):
+        return len(self.characters)
+
+    def __repr__(self):
+        return 'Convoy({} members) on {}'.format(len(self.characters), self.path)
+
+    @property
+    def finished(self):
+        """ numpy.ndarray(bool, shape = (N,)) : Members that reached the end of an open path """
+        if self.path.cyclic:
+            return numpy.zeros(len(self.characters), dtype = bool)
+        return self.progress >= self.path.length
+
+    def lane_points(self, s):
+        """ Returns the points at distances s along the path, in the lane of every member
+
+        Parameters
+        ----------
+        s: array_like(float, shape = (N,))
+            Distance along the path for every member
+
+        Returns
+        -------
+        numpy.ndarray(float, shape = (N, 2))
+        """
+        path = self.path
+        points = path.points_at_distance(s)
+        tangents = path.tangents_at_distance(s)
+        # Right hand normal, the y axis points down
+        points[:, 0] -= tangents[:, 1]*self.lane_offset
+        points[:, 1] += tangents[:, 0]*self.lane_offset
+        return points
+
+    def get_steering(self):
+        """ Advances the progress of every member and returns their linear accelerations
+
+        Returns
+        -------
+        numpy.ndarray(float, shape = (N, 2))
+            Linear acceleration of every member, members that reached
+            the end of an open path get none
+        """
+        world = self.world
+        characters = self.characters
+        path = self.path
+
+        # Project the future position of every member onto the path
+        future_position = world.position[characters] + world.velocity[characters]*self.predict_time
+        offset = future_position - path.points_at_distance(self.progress)
+        tangents = path.tangents_at_distance(self.progress)
+        advance = offset[:, 0]*tangents[:, 0] + offset[:, 1]*tangents[:, 1]
+        self.progress += numpy.maximum(advance, 0)
+        if path.cyclic:
+            self.progress %= path.length
+        else:
+            numpy.minimum(self.progress, path.length, out = self.progress)
+
+        self.targets = self.lane_points(self.progress + self.path_offset)
+        linear = seek_points(world, characters, self.targets)
+        linear[self.finished] = 0
+        return linear
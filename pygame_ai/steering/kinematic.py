@@ -13,13 +13,17 @@ Notes
 import math
 import random
 
+import numpy
 import pygame
 import pygame.gfxdraw
 
 from pygame_ai import colors
+from pygame_ai import profiling
 from pygame_ai.utils import math_utils
 from pygame_ai.utils.list_utils import remove_if_exists
-from pygame_ai.gameobject import DummyGameObject
+from pygame_ai.utils.spatial import SpatialHashGrid, ObstacleGrid
+from pygame_ai.utils.random_streams import default_streams
+from pygame_ai.gameobject import TargetPoint
 
 class SteeringOutput(object):
     """ Container for Steering data
@@ -28,7 +32,9 @@ class SteeringOutput(object):
     :py:class:`KinematicSteeringBehavior` algorithms.
     
     These objects can be added, multiplied, and compared to eachother. Each
-    of these operations will be executed element-wise
+    of these operations will be executed element-wise and returns a new
+    :py:class:`SteeringOutput`; use :py:meth:`iadd_scaled` and
+    :py:meth:`clamp_ip` to work in place without allocating new objects.
         
     Parameters
     ----------
@@ -45,6 +51,8 @@ class SteeringOutput(object):
         Angular acceleration
     """
     
+    __slots__ = ('linear', 'angular')
+    
     def __init__(self, linear = None, angular = None):
         if linear is None:
             linear = pygame.Vector2(0, 0)
@@ -71,9 +79,7 @@ class SteeringOutput(object):
         gameobject.velocity += self.linear * tick
         gameobject.rotation += self.angular * tick
         
-        if gameobject.velocity.length() > gameobject.max_speed:
-            gameobject.velocity.normalize_ip()
-            gameobject.velocity *= gameobject.max_speed
+        math_utils.clip_velocity(gameobject)
             
     def copy(self):
         selfcopy = SteeringOutput()
@@ -85,6 +91,70 @@ class SteeringOutput(object):
     def reset(self):
         self.linear[0], self.linear[1] = 0, 0
         self.angular = 0
+        
+    def copy_from(self, other):
+        """ Copies other's accelerations into this :py:class:`SteeringOutput` in place
+        
+        Parameters
+        ----------
+        other : :py:class:`SteeringOutput`
+            Steering to copy
+            
+        Returns
+        -------
+        :py:class:`SteeringOutput`
+            This same object
+        """
+        self.linear[0], self.linear[1] = other.linear[0], other.linear[1]
+        self.angular = other.angular
+        return self
+        
+    def iadd_scaled(self, other, scale):
+        """ Adds other * scale to this :py:class:`SteeringOutput` in place
+        
+        Parameters
+        ----------
+        other : :py:class:`SteeringOutput`
+            Steering to add
+        scale : float
+            Factor applied to other before adding it
+            
+        Returns
+        -------
+        :py:class:`SteeringOutput`
+            This same object
+        """
+        linear = self.linear
+        other_linear = other.linear
+        linear[0] += other_linear[0] * scale
+        linear[1] += other_linear[1] * scale
+        self.angular += other.angular * scale
+        return self
+        
+    def clamp_ip(self, max_linear, max_angular):
+        """ Clips linear and angular accelerations in place
+        
+        Parameters
+        ----------
+        max_linear : float
+            Maximum length of the linear acceleration
+        max_angular : float
+            Maximum absolute value of the angular acceleration
+            
+        Returns
+        -------
+        :py:class:`SteeringOutput`
+            This same object
+        """
+        length = self.linear.length()
+        if length > max_linear:
+            self.linear *= max_linear / length
+            
+        if self.angular > max_angular:
+            self.angular = max_angular
+        elif self.angular < -max_angular:
+            self.angular = -max_angular
+        return self
             
     def __repr__(self):
         return 'linear: {} angular: {}'.format(self.linear, self.angular)
@@ -140,6 +210,30 @@ def negative_steering(linear, angular):
     
     return neg_steering
 
+def nearby_targets(targets, position, radius):
+    """ Returns the targets that might be within radius of position
+    
+        If targets is a :py:class:`~utils.spatial.SpatialHashGrid` only
+        the targets in the nearby cells are returned, otherwise targets
+        is returned as it is.
+        
+        Parameters
+        ----------
+        targets : list(:py:class:`~gameobject.GameObject`) or :py:class:`~utils.spatial.SpatialHashGrid`
+            Targets to filter
+        position : :pgmath:`Vector2`
+            Center of the area of interest
+        radius : int
+            Radius of the area of interest
+            
+        Returns
+        -------
+        iterable(:py:class:`~gameobject.GameObject`)
+    """
+    if isinstance(targets, SpatialHashGrid):
+        return targets.query(position, radius)
+    return targets
+
 
 class KinematicSteeringBehavior(object):
     """ Template KinematicSteeringBehavior class
@@ -296,7 +390,7 @@ class Arrive(KinematicSteeringBehavior):
         
         # If we are within target radius, make speed 0
         elif distance <= self.target_radius:
-            self.steering = null_steering.copy()
+            self.steering.reset()
             return self.steering
             
         # Determine 'slow' speed based on distance
@@ -440,7 +534,7 @@ class Pursue(KinematicSteeringBehavior):
         self.character = character
         self.target = target
         self.max_prediction_time = max_prediction_time
-        self.seek = Seek(self.character, DummyGameObject())
+        self.seek = Seek(self.character, TargetPoint())
         
     def draw_indicators(self, screen, offset = lambda pos: pos):
         self.seek.draw_indicators(screen, offset)
@@ -486,7 +580,7 @@ class Evade(KinematicSteeringBehavior):
         self.character = character
         self.target = target
         self.max_prediction_time = max_prediction_time
-        self.flee = Flee(self.character, DummyGameObject())
+        self.flee = Flee(self.character, TargetPoint())
         
     def draw_indicators(self, screen, offset = lambda pos: pos):
         self.flee.draw_indicators(screen, offset)
@@ -515,9 +609,9 @@ class Evade(KinematicSteeringBehavior):
 class Face(KinematicSteeringBehavior):
     """ :py:class:`KinematicSteeringBehavior` that makes the character **Face** the target
      
-    This behavior creates a :py:class:`~gameobject.DummyGameObject` that 
+    This behavior creates a :py:class:`~gameobject.TargetPoint` that 
     is looking in the direction of the target and then :py:class:`Align` s
-    with that dummy's orientation
+    with that point's orientation
     
     Parameters
     ----------
@@ -531,11 +625,21 @@ class Face(KinematicSteeringBehavior):
         Distance, in degrees, from the target orientation at which the character will start to slow rotation
     time_to_target: float, optional
         Estimated time, in seconds, to **Face** the target
+    cache: :py:class:`~.cache.SteeringCache`, optional
+        If given, the inner :py:class:`Align` is shared through it with
+        every other **Face** of the same character and target, and
+        evaluated once per tick
     """
-    def __init__(self, character, target, target_radius = 1, slow_radius = 10, time_to_target = 0.1):
+    def __init__(self, character, target, target_radius = 1, slow_radius = 10, time_to_target = 0.1, cache = None):
         self.character = character
         self.target = target
-        self.align = Align(self.character, DummyGameObject(), target_radius, slow_radius, time_to_target)
+        factory = lambda: Align(character, TargetPoint(), target_radius, slow_radius, time_to_target)
+        if cache is None:
+            self.align = factory()
+            self._align = self.align
+        else:
+            self.align = cache.shared((Face, character, target, target_radius, slow_radius, time_to_target), factory)
+            self._align = self.align.behavior
         
     def draw_indicators(self, screen, offset = (lambda pos: pos)):
         self.align.draw_indicators(screen, offset)
@@ -547,10 +651,10 @@ class Face(KinematicSteeringBehavior):
         
         # If distance is 0, set dummy target to original target position
         if direction.length() == 0:
-            self.align.target.orientation = self.target.orientation
+            self._align.target.orientation = self.target.orientation
         # Otherwise calculate orientation based in target direction
         else:
-            self.align.target.orientation = math_utils.get_angle_from_vector(direction)
+            self._align.target.orientation = math_utils.get_angle_from_vector(direction)
         
         return self.align.get_steering()
         
@@ -558,7 +662,7 @@ class LookWhereYoureGoing(KinematicSteeringBehavior):
     """ :py:class:`KinematicSteeringBehavior` that makes the character **Look Where He's Going**
      
     This behavior makes the character face in the direction it's moving
-    by creating  a :py:class:`~gameobject.DummyGameObject` that 
+    by creating  a :py:class:`~gameobject.TargetPoint` that 
     is looking in the direction of the character's velocity and then
     it :py:class:`Align` s with that.
     
@@ -579,12 +683,14 @@ class LookWhereYoureGoing(KinematicSteeringBehavior):
     
     def __init__(self, character, target_radius = 1, slow_radius = 20, time_to_target = 0.1):
         self.character = character
-        self.align = Align(self.character, DummyGameObject(), target_radius, slow_radius, time_to_target)
+        self.align = Align(self.character, TargetPoint(), target_radius, slow_radius, time_to_target)
+        self.steering = SteeringOutput()
         
     def get_steering(self):
         # If no velocity, return null steering
         if self.character.velocity.length() == 0:
-            return null_steering.copy()
+            self.steering.reset()
+            return self.steering
             
         # Calculate target orientation based on character velocity
         self.align.target.orientation = math_utils.get_angle_from_vector(self.character.velocity)
@@ -618,8 +724,11 @@ class Wander(KinematicSteeringBehavior):
         Distance, in degrees, from the target orientation at which the character will start to slow rotation
     align_time: float, optional
         Estimated time, in seconds, to **LookWhereYoureGoing**
+    streams: :py:class:`~utils.random_streams.RandomStreams`, optional
+        Streams from which this behavior gets its own random stream,
+        defaults to :py:data:`~utils.random_streams.default_streams`
     """
-    def __init__(self, character, wander_offset = 50, wander_radius = 15, wander_rate = 20):
+    def __init__(self, character, wander_offset = 50, wander_radius = 15, wander_rate = 20, streams = None):
                  #align_target_radius = 1, align_slow_radius = 10, align_time = 0.2,
                  #draw = True):
                      
@@ -628,7 +737,8 @@ class Wander(KinematicSteeringBehavior):
         self.wander_radius = wander_radius
         self.wander_rate = wander_rate
         self.wander_orientation = self.character.orientation
-        self.seek = Seek(self.character, DummyGameObject())
+        self.random = (streams if streams is not None else default_streams).stream()
+        self.seek = Seek(self.character, TargetPoint())
         
     def draw_indicators(self, screen, offset = lambda pos: pos):
         x, y = offset(self.seek.target.position)
@@ -639,7 +749,7 @@ class Wander(KinematicSteeringBehavior):
     def get_steering(self):
         # Calculate target to delegate to seek
         # Update wander orientation
-        self.wander_orientation += math_utils.random_binomial() * self.wander_rate
+        self.wander_orientation += self.random.binomial() * self.wander_rate
         # Calculate combined target_orientation
         target_orientation = self.wander_orientation + self.character.orientation
         
@@ -661,19 +771,39 @@ class FollowPath(KinematicSteeringBehavior):
     :py:class:`~.path.Path`. It will do so until the character
     has traversed all points in it.
     
+    If a path_offset is given, the path must be parameterized by arc
+    length, like :py:class:`~.path.PolylinePath`, and the character will
+    follow it predictively: its position predict_time seconds ahead is
+    projected onto the path, and it seeks the point path_offset further
+    along it. This cuts corners smoothly instead of visiting every point.
+    
     Parameters
     ----------
     character: :py:class:`~gameobject.GameObject`
         Character with this behavior
     path: :py:class:`steering.path.Path`
         Path that will be Followed
+    path_offset: float, optional
+        Distance along the path between the projected position of the
+        character and the point it seeks, a negative offset follows the
+        path backwards
+    predict_time: float, optional
+        Time, in seconds, ahead of which the position of the character is projected
     """
     
-    def __init__(self, character, path):
+    def __init__(self, character, path, path_offset = None, predict_time = 0.2):
+        if path_offset is not None and not hasattr(path, 'nearest'):
+            raise ValueError('predictive FollowPath needs a path parameterized by arc length, like PolylinePath')
         self.character = character
         self.path = path
-        self.seek = Seek(self.character, DummyGameObject())
-        self.seek.target.position = next(self.path)
+        self.path_offset = path_offset
+        self.predict_time = predict_time
+        self.seek = Seek(self.character, TargetPoint())
+        if path_offset is None:
+            self.seek.target.position = next(self.path)
+        else:
+            self.seek.target.position = self.path.point_at_distance(0)
+        self.steering = SteeringOutput()
         
     def draw_indicators(self, screen, offset = lambda pos: pos):
         self.seek.draw_indicators(screen, offset)
@@ -688,17 +818,38 @@ class FollowPath(KinematicSteeringBehavior):
         return 'FollowPath ' + str(self.path)
         
     def get_steering(self):
+        if self.path_offset is not None:
+            return self._get_predictive_steering()
+            
         # Calculate to delegate to seek
         self.seek.target.position = self.path.current()
         distance = (self.character.position - self.seek.target.position).length()
         if distance < 50:   # THIS MIGHT NEED SOME REVISIOn
             try:
                 self.seek.target.position = next(self.path)
+                if profiling.enabled:
+                    profiling.count('follow_path.advances')
             except StopIteration:
-                return null_steering.copy()
+                self.steering.reset()
+                return self.steering
         
         # Delegate to Seek
         return self.seek.get_steering()
+        
+    def _get_predictive_steering(self):
+        # Project the future position onto the path
+        future_position = self.character.position + self.character.velocity*self.predict_time
+        s = self.path.nearest(future_position)[0]
+        
+        # Stop at the end of open paths
+        path = self.path
+        if not path.cyclic and s == (path.length if self.path_offset >= 0 else 0):
+            self.steering.reset()
+            return self.steering
+        
+        # Delegate to Seek
+        self.seek.target.position = path.point_at_distance(s + self.path_offset)
+        return self.seek.get_steering()
 
 
 class Separation(KinematicSteeringBehavior):
@@ -708,8 +859,10 @@ class Separation(KinematicSteeringBehavior):
     ----------
     character: :py:class:`~gameobject.GameObject`
         Character with this behavior
-    targets: list(:py:class:`~gameobject.GameObject`)
-        Targets to stay separated from
+    targets: list(:py:class:`~gameobject.GameObject`) or :py:class:`~utils.spatial.SpatialHashGrid`
+        Targets to stay separated from, the character itself is ignored
+        if it is among them. With a :py:class:`~utils.spatial.SpatialHashGrid`
+        only the targets in the cells around the character are checked
     treshold : int, optional
         Distance from any of the targets at which the character will start separate from them
     """
@@ -733,12 +886,19 @@ class Separation(KinematicSteeringBehavior):
         pygame.gfxdraw.aacircle(screen, int(x), int(y), self.treshold, (255, 0, 0))
         
     def get_steering(self):
+        self.steering.reset()
+        position = self.character.position
         
-        for target in self.targets:
-            self.steering = SteeringOutput()
+        targets = nearby_targets(self.targets, position, self.treshold)
+        if profiling.enabled:
+            profiling.count('separation.distance_checks', len(targets))
+        
+        for target in targets:
+            if target is self.character:
+                continue
             
             # Check if target is close
-            direction = self.character.position - target.position
+            direction = position - target.position
             distance = direction.length()
             
             # Make sure there's a direction
@@ -769,8 +929,10 @@ class CollisionAvoidance(KinematicSteeringBehavior):
     ----------
     character: :py:class:`~gameobject.GameObject`
         Character with this behavior
-    targets: list(:py:class:`~gameobject.GameObject`)
-        Targets to avoid collision with
+    targets: list(:py:class:`~gameobject.GameObject`) or :py:class:`~utils.spatial.SpatialHashGrid`
+        Targets to avoid collision with, the character itself is ignored
+        if it is among them. With a :py:class:`~utils.spatial.SpatialHashGrid`
+        only the targets in the cells around the character are checked
     radius : int, optional
         Distance at which the future positions of the character and any
         target are are considered as *colliding*
@@ -803,9 +965,22 @@ class CollisionAvoidance(KinematicSteeringBehavior):
         char_future_pos = self.character.position + self.character.velocity
         closest_target = None
         
+        # Targets can move up to their velocity before they are compared,
+        # widen the grid query by the fastest one
+        if isinstance(self.targets, SpatialHashGrid):
+            query_radius = self.radius + self.targets.max_speed
+        else:
+            query_radius = self.radius
+        
+        targets = nearby_targets(self.targets, char_future_pos, query_radius)
+        if profiling.enabled:
+            profiling.count('collision_avoidance.distance_checks', len(targets))
+        
         # See if any target comes close enough
         min_distance = float('inf')
-        for target in self.targets:
+        for target in targets:
+            if target is self.character:
+                continue
             target_future_pos = target.position + target.velocity
             relative_pos = char_future_pos - target_future_pos
             distance = relative_pos.length()
@@ -820,7 +995,7 @@ class CollisionAvoidance(KinematicSteeringBehavior):
         
         # If no target is close enough, return no sterring
         if closest_target is None:
-            self.steering = null_steering.copy()
+            self.steering.reset()
             return self.steering
         
         # Otherwise, calculate avoidance path
@@ -849,8 +1024,9 @@ class ObstacleAvoidance(KinematicSteeringBehavior):
     ----------
     character: :py:class:`~gameobject.GameObject`
         Character with this behavior
-    obstacles: list(:py:class:`~gameobject.GameObject`)
-        Obstacles to avoid collision with
+    obstacles: list(:py:class:`~gameobject.GameObject`) or :py:class:`~utils.spatial.ObstacleGrid`
+        Obstacles to avoid collision with. With an :py:class:`~utils.spatial.ObstacleGrid`
+        the ray is only tested against the edges in the cells it crosses
     avoid_distance: int, optional
         Distance from the collision point at which the target that 
         the algorithm uses to avoid collision will be generated
@@ -870,11 +1046,15 @@ class ObstacleAvoidance(KinematicSteeringBehavior):
         self.obstacles = obstacles
         self.avoid_distance = avoid_distance
         self.lookahead = lookahead
-        self.seek = Seek(self.character, DummyGameObject())
+        self.seek = Seek(self.character, TargetPoint())
         
         # For indicator drawing
         self.closest_intersection = None
         
+        # (clock, tick, intersection, line) stored by cast_obstacle_rays
+        self.precast = None
+        self.steering = SteeringOutput()
+        
     def draw_indicators(self, screen, offset = lambda pos: pos):
         # Velocity
         self.seek.draw_indicators(screen, offset)
@@ -896,33 +1076,68 @@ class ObstacleAvoidance(KinematicSteeringBehavior):
             x, y = offset(self.seek.target.position)
             pygame.gfxdraw.filled_circle(screen, int(x), int(y), 2, colors.BLUE)
         
-    def get_steering(self):
-        # Cast ray vector
+    def get_ray(self):
+        """ Returns the lookahead ray as a [start, end] line """
         ray_vector = pygame.Vector2(self.character.velocity)
         if math_utils.is_not_null(ray_vector):
             ray_vector.normalize_ip()
         ray_vector *= self.lookahead
-        closest_intersection = None
+        position = self.character.position
+        return [position, position + ray_vector]
+        
+    def cast_ray(self):
+        """ Returns the closest intersection of the lookahead ray with the obstacles
+        
+        Returns
+        -------
+        tuple(:pgmath:`Vector2`, line)
+            Intersection point and the obstacle edge it lies on,
+            (None, None) if the ray doesn't hit any obstacle
+        """
+        ray_line = self.get_ray()
+        position = ray_line[0]
+        
+        # Get the edges the ray could hit
+        if isinstance(self.obstacles, ObstacleGrid):
+            lines = self.obstacles.ray_edges(ray_line[0], ray_line[1])
+        else:
+            lines = [line for obstacle in self.obstacles for line in obstacle.get_lines()]
+        if profiling.enabled:
+            profiling.count('obstacle_avoidance.ray_segment_tests', len(lines))
         
         # Look for the closest collision
         closest_distance = float('inf')
         closest_intersection = None
         closest_intersection_line = None
-        for obstacle in self.obstacles:
-            for line in obstacle.get_lines():
-                ray_line = [self.character.position, self.character.position + ray_vector]
-                intersection = math_utils.lines_intersect(ray_line, line)
-                if intersection is not None:
-                    distance = (intersection - self.character.position).length()
-                    if distance < closest_distance:
-                        closest_distance = distance
-                        closest_intersection = intersection
-                        closest_intersection_line = line
+        for line in lines:
+            intersection = math_utils.lines_intersect(ray_line, line)
+            if intersection is not None:
+                distance = (intersection - position).length()
+                if distance < closest_distance:
+                    closest_distance = distance
+                    closest_intersection = intersection
+                    closest_intersection_line = line
+                    
+        return closest_intersection, closest_intersection_line
+        
+    def get_steering(self):
+        # Use the ray cast by cast_obstacle_rays if there is one for this tick
+        precast = self.precast
+        if precast is not None:
+            clock, tick, closest_intersection, closest_intersection_line = precast
+            if clock is None:
+                # Not keyed to a tick, only valid once
+                self.precast = None
+            elif clock.tick_id != tick:
+                self.precast = precast = None
+        if precast is None:
+            closest_intersection, closest_intersection_line = self.cast_ray()
         
         self.closest_intersection = closest_intersection
         # If there was no collision return null steering
         if closest_intersection is None:
-            return null_steering.copy()
+            self.steering.reset()
+            return self.steering
         
         # Otherwise, calculate target to delegate to Seek
         # Get RHS and LHS perpendicular points and see which is closer 
@@ -940,12 +1155,71 @@ class ObstacleAvoidance(KinematicSteeringBehavior):
         self.seek.target.position = closest
         return self.seek.get_steering()
                 
+def cast_obstacle_rays(behaviors, clock = None):
+    """ Casts the lookahead rays of many :py:class:`ObstacleAvoidance` at once
+    
+        Call this once per loop, before evaluating the behaviors. The rays
+        of all the behaviors that share the same obstacles are tested in a
+        single call to :py:func:`~utils.math_utils.rays_intersect`, and each
+        behavior uses its result on its next
+        :py:meth:`~KinematicSteeringBehavior.get_steering`.
+        
+        If the obstacles are an :py:class:`~utils.spatial.ObstacleGrid`
+        every ray is only tested against the edges in the cells it crosses.
+        
+        Intersection points are not rounded to integers like the ones
+        computed by :py:meth:`ObstacleAvoidance.cast_ray`.
+        
+        Parameters
+        ----------
+        behaviors : iterable(:py:class:`ObstacleAvoidance`)
+        clock: object with a ``tick_id`` attribute, optional
+            For example an :py:class:`~world.AgentWorld` or a
+            :py:class:`~.cache.SteeringCache`. If given, the results are
+            used by every :py:meth:`~KinematicSteeringBehavior.get_steering`
+            of the current tick and discarded once ``tick_id`` changes,
+            so a result is never used after the characters or obstacles
+            have moved. Otherwise each result is used only once.
+    """
+    tick = None if clock is None else clock.tick_id
+    
+    # Group behaviors by obstacle set
+    groups = {}
+    for behavior in behaviors:
+        groups.setdefault(id(behavior.obstacles), []).append(behavior)
+        
+    for group in groups.values():
+        obstacles = group[0].obstacles
+        rays = numpy.array([behavior.get_ray() for behavior in group], dtype = float)
+        if isinstance(obstacles, ObstacleGrid):
+            segments = obstacles.segments
+            found = [obstacles.ray_edge_indices(ray[0], ray[1]) for ray in rays]
+            ray_indices = numpy.repeat(numpy.arange(len(rays)), [len(edges) for edges in found])
+            segment_indices = numpy.concatenate(found).astype(int)
+            points, indices, _ = math_utils.rays_intersect(rays, segments, candidates = (ray_indices, segment_indices))
+            tests = len(segment_indices)
+        else:
+            segments = numpy.array([line for obstacle in obstacles for line in obstacle.get_lines()], dtype = float).reshape(-1, 2, 2)
+            points, indices, _ = math_utils.rays_intersect(rays, segments)
+            tests = len(rays) * len(segments)
+        if profiling.enabled:
+            profiling.count('obstacle_avoidance.ray_segment_tests', tests)
+        
+        for behavior, point, index in zip(group, points, indices):
+            if index < 0:
+                behavior.precast = (clock, tick, None, None)
+            else:
+                behavior.precast = (clock, tick, pygame.Vector2(point[0], point[1]), segments[index])
 
 class NullSteering(KinematicSteeringBehavior):
     """ :py:class:`KinematicSteeringBehavior` that makes the character **Stay Still** """
     
+    def __init__(self):
+        self.steering = SteeringOutput()
+    
     def get_steering(self):
-        return null_steering.copy()
+        self.steering.reset()
+        return self.steering
         
 class Stationary(KinematicSteeringBehavior):
     
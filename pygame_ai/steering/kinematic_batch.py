@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+""" Batched Kinematic Steering Behaviors
+
+This module implements vectorized counterparts of some of the behaviors in
+:py:mod:`~steering.kinematic`, for agents that live in an
+:py:class:`~world.AgentWorld`. Every function computes the steering of
+many characters in one NumPy pass and gives the same results as calling
+``get_steering`` on the equivalent scalar behavior of every character.
+The only exception are the angles computed from vectors in :py:func:`face`
+and :py:func:`look_where_youre_going`, NumPy's ``arctan2`` may differ from
+``math.atan2`` in the last bit.
+
+Characters are given as indices into the world. Targets can either be
+indices of other agents of the same world, one per character, or fixed
+points given as an array of shape (N, 2), or a float array of shape (2,),
+which behave like targets that don't move. A single point with integer
+coordinates, like a ``rect.center``, must be given as ``[point]`` or with
+float coordinates, otherwise it is taken as the indices of two agents.
+
+Linear behaviors return (N, 2) arrays of linear accelerations, angular
+behaviors return (N,) arrays of angular accelerations.
+
+Example
+-------
+
+Sending a selection of units to the position of an enemy unit:
+
+.. code-block:: python
+
+    linear = kinematic_batch.arrive(world, selected, enemy.index, target_radius = 10)
+    angular = kinematic_batch.look_where_youre_going(world, selected)
+    world.integrate(linear, angular, tick, selected)
+"""
+
+import numpy
+
+def _characters(world, characters):
+    """ Returns characters as something that can index the world's arrays """
+    if characters is None:
+        return slice(0, world.count)
+    return characters
+
+def _is_points(targets):
+    """ Returns whether targets, as an array, are points instead of agent indices """
+    # Points are told apart by their shape, rect centers are integers too
+    return (targets.ndim == 2 and targets.shape[-1] == 2) or targets.dtype.kind not in 'iu'
+
+def _targets(world, targets, count):
+    """ Returns (positions, velocities) of the targets, as (N, 2) arrays """
+    targets = numpy.asarray(targets)
+    if not _is_points(targets):
+        positions = world.position[targets]
+        velocities = world.velocity[targets]
+    else:
+        positions = targets.astype(float)
+        velocities = numpy.zeros(2)
+    return numpy.broadcast_to(positions, (count, 2)), numpy.broadcast_to(velocities, (count, 2))
+
+def _length(vectors):
+    """ Returns the length of every row of an (N, 2) array """
+    return numpy.sqrt(vectors[:, 0]*vectors[:, 0] + vectors[:, 1]*vectors[:, 1])
+
+def _scale_to(vectors, lengths, new_lengths):
+    """ Normalizes the non-null rows of vectors and scales them to new_lengths, in place """
+    moving = lengths != 0
+    vectors[moving] /= lengths[moving][:, None]
+    vectors[moving] *= numpy.broadcast_to(new_lengths, lengths.shape)[moving][:, None]
+    return vectors
+
+def _clip(vectors, max_lengths):
+    """ Scales the rows of vectors longer than max_lengths down to max_lengths, in place """
+    lengths = _length(vectors)
+    max_lengths = numpy.broadcast_to(max_lengths, lengths.shape)
+    too_long = lengths > max_lengths
+    vectors[too_long] /= lengths[too_long][:, None]
+    vectors[too_long] *= max_lengths[too_long][:, None]
+    return vectors
+
+def seek_points(world, characters, points, sign = 1):
+    """ Returns the accelerations that make every character seek, or flee, a point
+
+    Core of :py:func:`seek`, :py:func:`flee`, :py:func:`pursue` and
+    :py:func:`evade`, for callers that already computed the points, like
+    :py:class:`~.convoy.Convoy`.
+
+    Parameters
+    ----------
+    world: :py:class:`~world.AgentWorld`
+        World the characters live in
+    characters: numpy.ndarray(int, shape = (N,)) or slice
+        Indices of the characters
+    points: numpy.ndarray(float, shape = (N, 2))
+        Point sought by every character
+    sign: int, optional
+        1 to seek the points, -1 to flee from them
+
+    Returns
+    -------
+    numpy.ndarray(float, shape = (N, 2))
+        Linear acceleration of every character
+    """
+    direction = sign*(points - world.position[characters])
+    return _scale_to(direction, _length(direction), world.max_accel[characters])
+
+def _predicted_points(world, characters, targets, max_prediction_time):
+    """ Shared prediction of pursue and evade """
+    characters = _characters(world, characters)
+    position = world.position[characters]
+    target_position, target_velocity = _targets(world, targets, len(position))
+
+    direction = target_position - position
+    distance = _length(direction)
+    speed = _length(world.velocity[characters])
+
+    # If speed is too small to give a reasonable prediction, use the maximum
+    prediction_time = numpy.full(len(position), float(max_prediction_time))
+    fast = speed > distance/max_prediction_time
+    prediction_time[fast] = distance[fast]/speed[fast]
+
+    return characters, target_position + target_velocity*prediction_time[:, None]
+
+def seek(world, characters, targets):
+    """ Batched :py:class:`~.kinematic.Seek`
+
+    Parameters
+    ----------
+    world: :py:class:`~world.AgentWorld`
+        World the characters live in
+    characters: array_like(int, shape = (N,)) or None
+        Indices of the characters, None for every agent of the world
+    targets: array_like(int, shape = (N,)) or array_like(float, shape = (N, 2))
+        Indices of the agents to seek, or points to seek
+
+    Returns
+    -------
+    numpy.ndarray(float, shape = (N, 2))
+        Linear acceleration of every character
+    """
+    characters = _characters(world, characters)
+    points, _ = _targets(world, targets, len(world.position[characters]))
+    return seek_points(world, characters, points, 1)
+
+def flee(world, characters, targets):
+    """ Batched :py:class:`~.kinematic.Flee`
+
+    Takes the same parameters as :py:func:`seek`.
+
+    Returns
+    -------
+    numpy.ndarray(float, shape = (N, 2))
+        Linear acceleration of every character
+    """
+    characters = _characters(world, characters)
+    points, _ = _targets(world, targets, len(world.position[characters]))
+    return seek_points(world, characters, points, -1)
+
+def arrive(world, characters, targets, target_radius, slow_radius = None, time_to_target = 0.2):
+    """ Batched :py:class:`~.kinematic.Arrive`
+
+    Parameters
+    ----------
+    world: :py:class:`~world.AgentWorld`
+        World the characters live in
+    characters: array_like(int, shape = (N,)) or None
+        Indices of the characters, None for every agent of the world
+    targets: array_like(int, shape = (N,)) or array_like(float, shape = (N, 2))
+        Indices of the agents to arrive at, or points to arrive at
+    target_radius: float or array_like(float, shape = (N,))
+        Distance from the center of the target at which the character will stop
+    slow_radius: float or array_like(float, shape = (N,)), optional
+        Distance from the center of the target at which the character will
+        start to slow down, defaults to 5 times target_radius
+    time_to_target: float, optional
+        Estimated time, in seconds, to **Arrive** at the target
+
+    Returns
+    -------
+    numpy.ndarray(float, shape = (N, 2))
+        Linear acceleration of every character
+    """
+    characters = _characters(world, characters)
+    position = world.position[characters]
+    target_position, _ = _targets(world, targets, len(position))
+    target_radius = numpy.broadcast_to(numpy.asarray(target_radius, dtype = float), (len(position),))
+    if slow_radius is None:
+        slow_radius = target_radius * 5
+    slow_radius = numpy.broadcast_to(numpy.asarray(slow_radius, dtype = float), (len(position),))
+
+    direction = target_position - position
+    distance = _length(direction)
+    max_speed = world.max_speed[characters]
+
+    # Full speed outside slow radius, 'slow' speed inside it
+    target_speed = max_speed.copy()
+    slow = (distance <= slow_radius) & (distance > target_radius)
+    target_speed[slow] = max_speed[slow]*distance[slow]/slow_radius[slow]
+
+    # Acceleration tries to get to the target velocity
+    linear = _scale_to(direction, distance, target_speed)
+    linear -= world.velocity[characters]
+    # Vector2 divides by multiplying with the inverse, do the same to get the same results
+    linear *= 1/time_to_target
+    _clip(linear, world.max_accel[characters])
+
+    # No steering within target radius
+    linear[distance <= target_radius] = 0
+    return linear
+
+def pursue(world, characters, targets, max_prediction_time = 0.2):
+    """ Batched :py:class:`~.kinematic.Pursue`
+
+    Parameters
+    ----------
+    world: :py:class:`~world.AgentWorld`
+        World the characters live in
+    characters: array_like(int, shape = (N,)) or None
+        Indices of the characters, None for every agent of the world
+    targets: array_like(int, shape = (N,)) or array_like(float, shape = (N, 2))
+        Indices of the agents to pursue
+    max_prediction_time: float, optional
+        Maximum time, in seconds, to look ahead while predicting future position
+
+    Returns
+    -------
+    numpy.ndarray(float, shape = (N, 2))
+        Linear acceleration of every character
+    """
+    characters, points = _predicted_points(world, characters, targets, max_prediction_time)
+    return seek_points(world, characters, points, 1)
+
+def evade(world, characters, targets, max_prediction_time = 0.2):
+    """ Batched :py:class:`~.kinematic.Evade`
+
+    Takes the same parameters as :py:func:`pursue`.
+
+    Returns
+    -------
+    numpy.ndarray(float, shape = (N, 2))
+        Linear acceleration of every character
+    """
+    characters, points = _predicted_points(world, characters, targets, max_prediction_time)
+    return seek_points(world, characters, points, -1)
+
+def _target_orientations(world, targets, rows):
+    """ Returns the orientation of the targets in the given rows, points have orientation 0
+
+    Parameters
+    ----------
+    targets: numpy.ndarray
+        Targets as given to :py:func:`face`
+    rows: numpy.ndarray(bool, shape = (N,))
+        Rows whose target orientation is needed
+    """
+    if _is_points(targets):
+        return numpy.zeros(rows.sum())
+    return numpy.broadcast_to(world.orientation[targets], rows.shape)[rows]
+
+def angles_from_vectors(vectors):
+    """ Batched :py:func:`~utils.math_utils.get_angle_from_vector`, returns the angle in degrees of every row of an (N, 2) array """
+    return numpy.arctan2(-vectors[:, 1], vectors[:, 0]) * (180/numpy.pi)
+
+def map_to_range(orientations):
+    """ Batched :py:func:`~utils.math_utils.map_to_range`, maps every angle in degrees to [-180, 180) """
+    return orientations - 360*numpy.floor((orientations + 180) * (1/360))
+
+def _align_to(world, characters, target_orientation, target_radius, slow_radius, time_to_target):
+    """ Shared implementation of align, face and look_where_youre_going """
+    rotation = map_to_range(target_orientation - world.orientation[characters])
+    rotation_size = numpy.abs(rotation)
+    max_rotation = world.max_rotation[characters]
+
+    # Full rotation outside slow radius, 'slow' rotation inside it, none within target radius
+    target_rotation = numpy.zeros(len(rotation))
+    fast = rotation_size > slow_radius
+    target_rotation[fast] = max_rotation[fast]
+    slow = ~fast & (rotation_size >= target_radius)
+    target_rotation[slow] = max_rotation[slow]*rotation_size[slow]/slow_radius
+    turning = fast | slow
+    target_rotation[turning] *= rotation[turning]/rotation_size[turning]
+
+    # Same precedence as Align: only the current rotation is divided by time_to_target
+    angular = target_rotation - world.rotation[characters]/time_to_target
+
+    # Clip angular acceleration
+    angular_accel = numpy.abs(angular)
+    max_angular_accel = world.max_angular_accel[characters]
+    too_fast = angular_accel > max_angular_accel
+    angular[too_fast] /= angular_accel[too_fast]
+    angular[too_fast] *= max_angular_accel[too_fast]
+    return angular
+
+def align(world, characters, targets = None, target_radius = 1, slow_radius = 20, time_to_target = 0.1, orientations = None):
+    """ Batched :py:class:`~.kinematic.Align`
+
+    Parameters
+    ----------
+    world: :py:class:`~world.AgentWorld`
+        World the characters live in
+    characters: array_like(int, shape = (N,)) or None
+        Indices of the characters, None for every agent of the world
+    targets: array_like(int, shape = (N,)) or array_like(float, shape = (N,))
+        Indices of the agents to align with, or orientations in degrees.
+        Integer orientations can't be told apart from indices, give them
+        as orientations instead
+    target_radius: int, optional
+        Distance, in degrees, from the target orientation at which the character will stop rotation
+    slow_radius: int, optional
+        Distance, in degrees, from the target orientation at which the character will start to slow rotation
+    time_to_target: float, optional
+        Estimated time, in seconds, to Align with the target's orientation
+    orientations: array_like(float, shape = (N,)), optional
+        Orientations in degrees to align with, given instead of targets
+
+    Returns
+    -------
+    numpy.ndarray(float, shape = (N,))
+        Angular acceleration of every character
+    """
+    characters = _characters(world, characters)
+    count = len(world.orientation[characters])
+    if orientations is None:
+        targets = numpy.asarray(targets)
+        if targets.dtype.kind in 'iu':
+            orientations = world.orientation[targets]
+        else:
+            orientations = targets
+    target_orientation = numpy.broadcast_to(numpy.asarray(orientations, dtype = float), (count,))
+    return _align_to(world, characters, target_orientation, target_radius, slow_radius, time_to_target)
+
+def face(world, characters, targets, target_radius = 1, slow_radius = 10, time_to_target = 0.1):
+    """ Batched :py:class:`~.kinematic.Face`
+
+    Parameters
+    ----------
+    world: :py:class:`~world.AgentWorld`
+        World the characters live in
+    characters: array_like(int, shape = (N,)) or None
+        Indices of the characters, None for every agent of the world
+    targets: array_like(int, shape = (N,)) or array_like(float, shape = (N, 2))
+        Indices of the agents to face, or points to face
+    target_radius: int, optional
+        Distance, in degrees, from the target orientation at which the character will stop rotation
+    slow_radius: int, optional
+        Distance, in degrees, from the target orientation at which the character will start to slow rotation
+    time_to_target: float, optional
+        Estimated time, in seconds, to **Face** the target
+
+    Returns
+    -------
+    numpy.ndarray(float, shape = (N,))
+        Angular acceleration of every character
+    """
+    characters = _characters(world, characters)
+    position = world.position[characters]
+    target_position, _ = _targets(world, targets, len(position))
+
+    # Characters on top of their target take the target's orientation
+    direction = target_position - position
+    target_orientation = angles_from_vectors(direction)
+    still = (direction[:, 0] == 0) & (direction[:, 1] == 0)
+    if still.any():
+        target_orientation[still] = _target_orientations(world, numpy.asarray(targets), still)
+
+    return _align_to(world, characters, target_orientation, target_radius, slow_radius, time_to_target)
+
+def look_where_youre_going(world, characters = None, target_radius = 1, slow_radius = 20, time_to_target = 0.1):
+    """ Batched :py:class:`~.kinematic.LookWhereYoureGoing`
+
+    Parameters
+    ----------
+    world: :py:class:`~world.AgentWorld`
+        World the characters live in
+    characters: array_like(int, shape = (N,)), optional
+        Indices of the characters, defaults to every agent of the world
+    target_radius: int, optional
+        Distance, in degrees, from the target orientation at which the character will stop rotation
+    slow_radius: int, optional
+        Distance, in degrees, from the target orientation at which the character will start to slow rotation
+    time_to_target: float, optional
+        Estimated time, in seconds, to **LookWhereYoureGoing**
+
+    Returns
+    -------
+    numpy.ndarray(float, shape = (N,))
+        Angular acceleration of every character
+    """
+    characters = _characters(world, characters)
+    velocity = world.velocity[characters]
+    angular = _align_to(world, characters, angles_from_vectors(velocity), target_radius, slow_radius, time_to_target)
+
+    # Characters that don't move don't rotate
+    angular[(velocity[:, 0] == 0) & (velocity[:, 1] == 0)] = 0
+    return angular
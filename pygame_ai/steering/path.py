@@ -12,10 +12,21 @@ Aswell as the following pre-implemented useful paths:
 
     * :py:class:`~.path.PathCircumference`
     * :py:class:`~.path.PathParabola`
+    * :py:class:`~.path.PolylinePath`
+    * :py:class:`~.path.CatmullRomPath`
+    * :py:class:`~.path.BezierPath`
+
+Paths whose points only move along with an *anchor* (see
+:py:meth:`~.path.Path.anchor`) can be :py:meth:`~.path.Path.bake` d:
+the path function is sampled once into a table that is translated when
+the anchor moves, instead of being evaluated again for every point.
 
 """
+import bisect
 import math
 
+import numpy
+
 class Path(object):
     """ Iterator that describes a **Path**
     
@@ -94,6 +105,19 @@ class Path(object):
         >>> character = SomeGameObjectWithARect()
         # The 'center' parameter is now defined as a lambda functions that gets the position of a character
         >>> mypath = OnceCircumferencePath(center = (lambda: character.rect.center), radius = 50)
+        
+    If the points of your path only depend on x and on a point that
+    moves, like 'center' here, override :py:meth:`anchor` to return that
+    point. The current point is then cached until x or the anchor change,
+    and the path can be :py:meth:`bake` d.
+    
+    .. code-block:: python
+    
+        class OnceCircumferencePath(Path):
+            ...
+            
+            def anchor(self):
+                return self.center()
     """
     
     def __init__(self, path_func, domain_end, domain_start = 0, increment = 1):
@@ -102,7 +126,11 @@ class Path(object):
         self.x = -increment + domain_start
         self.domain_start = domain_start
         self.domain_end = domain_end
-        self.current = None
+        self.table = None
+        self.table_anchor = None
+        self._cached_x = None
+        self._cached_anchor = None
+        self._cached_point = None
         
     def __iter__(self):
         return self
@@ -110,7 +138,6 @@ class Path(object):
     def __next__(self):
         if self.x < self.domain_end:
             self.x += self.increment
-            self.current = lambda: self.path_func(self, self.x)
             return self.current()
         else:
             raise StopIteration
@@ -122,6 +149,92 @@ class Path(object):
         """ Returns the iterator to it's initial point """
         self.x = self.domain_start
         
+    def anchor(self):
+        """ Returns the point the whole path moves with, or None
+        
+        Override it in paths whose points only depend on x and on a
+        moving point, like the center of :py:class:`~.PathCircumference`.
+        While it returns None, which is the default, :py:meth:`current`
+        evaluates the path function on every call, since the points might
+        depend on anything.
+        
+        Returns
+        -------
+        list_like(float, float) or None
+        """
+        return None
+        
+    def current(self):
+        """ Returns the current point of the path
+        
+        The point is cached until x or the :py:meth:`anchor` change.
+        
+        Returns
+        -------
+        tuple(float, float)
+        """
+        anchor = self.anchor()
+        if anchor is not None:
+            anchor = (anchor[0], anchor[1])
+        elif self.table is None:
+            return self.path_func(self, self.x)
+        
+        if self.x != self._cached_x or anchor != self._cached_anchor:
+            self._cached_point = self.point_at(self.x, anchor)
+            self._cached_x = self.x
+            self._cached_anchor = anchor
+        return self._cached_point
+        
+    def point_at(self, x, anchor = None):
+        """ Returns the point of the path at x
+        
+        Uses the baked table if there is one, see :py:meth:`bake`.
+        
+        Parameters
+        ----------
+        x: int
+            Value of the path function's domain
+        anchor: list_like(float, float), optional
+            Current :py:meth:`anchor`, it is looked up if not given
+        """
+        if self.table is not None:
+            index, remainder = divmod(x - self.domain_start, abs(self.increment))
+            if remainder == 0 and 0 <= index < len(self.table):
+                px, py = self.table[int(index)]
+                if self.table_anchor is not None:
+                    if anchor is None:
+                        anchor = self.anchor()
+                    px += anchor[0] - self.table_anchor[0]
+                    py += anchor[1] - self.table_anchor[1]
+                return float(px), float(py)
+        return self.path_func(self, x)
+        
+    def domain(self):
+        """ Returns the values of x of every point in the path, in order """
+        return range(self.domain_start, self.domain_end+1, abs(self.increment))
+        
+    def bake(self):
+        """ Samples the path function once and uses the samples from now on
+        
+        Every point in :py:meth:`domain` is evaluated and stored in
+        :py:attr:`table`, along with the :py:meth:`anchor` at the time of
+        baking. Later lookups only translate the table by how much the
+        anchor has moved, so only bake paths that move along with their
+        anchor without changing shape. Paths without anchor are assumed
+        to never change.
+        
+        Returns
+        -------
+        :py:class:`Path`
+            This same path, to allow ``path = PathCircumference(...).bake()``
+        """
+        self.table = None
+        anchor = self.anchor()
+        self.table_anchor = None if anchor is None else (anchor[0], anchor[1])
+        self.table = numpy.array([self.path_func(self, x) for x in self.domain()], dtype = float).reshape(-1, 2)
+        self._cached_x = None
+        return self
+        
     def as_list(self):
         """ Returns the path as a list of points
         
@@ -136,6 +249,9 @@ class Path(object):
         -------
             list(tuple(float, float))
         """
+        if self.table is not None:
+            return self._translated_table()
+            
         path_list = []
         
         for x in range(self.domain_start, self.domain_end+1, self.increment):
@@ -143,6 +259,15 @@ class Path(object):
             
         return path_list
         
+    def _translated_table(self):
+        """ Returns the baked table, translated to the current anchor, as a list of points """
+        if self.table_anchor is None:
+            return [tuple(point) for point in self.table.tolist()]
+        anchor = self.anchor()
+        dx = anchor[0] - self.table_anchor[0]
+        dy = anchor[1] - self.table_anchor[1]
+        return [(x + dx, y + dy) for x, y in self.table.tolist()]
+        
         
 class CyclicPath(Path):
     """Iterator that implements Cyclic Paths
@@ -187,10 +312,15 @@ class MirroredPath(Path):
             self.increment = -self.increment
             self.x += self.increment
         
-        self.current = lambda: self.path_func(self, self.x)
         return self.current()
         
     def as_list(self):
+        if self.table is not None:
+            path_list = self._translated_table()
+            if self.increment < 0:
+                path_list.reverse()
+            return path_list
+            
         path_list = []
         
         if self.increment > 0:
@@ -236,6 +366,9 @@ class PathCircumference(CyclicPath):
     def __repr__(self):
         return 'PathCircumference'
         
+    def anchor(self):
+        return self.center()
+        
 class PathParabola(MirroredPath):
     """ Parabola-like :py:class:`~.MirroredPath`
     
@@ -266,3 +399,459 @@ class PathParabola(MirroredPath):
         
     def __repr__(self):
         return 'PathParbola'
+        
+    def anchor(self):
+        return self.origin()
+        
+        
+class PolylinePath(Path):
+    """ :py:class:`~.Path` made of straight segments, parameterized by arc length
+    
+    Iterating over it yields its vertices, so it can be used anywhere a
+    :py:class:`~.Path` is used. It also knows the distance along the path
+    of every point, which allows :py:class:`~.kinematic.FollowPath` to
+    follow it predictively:
+    
+        * :py:meth:`point_at_distance` returns the point at a given distance along
+          the path, in O(log n) with a binary search over the cumulative
+          length of the segments
+        * :py:meth:`nearest` returns the point of the path closest to a
+          given point and its distance along the path. For paths with many
+          segments it uses a grid of segments, so only the segments around
+          the given point are tested
+    
+    Parameters
+    ----------
+    points: list(list_like(float, float))
+        Vertices of the path, in order
+    cyclic: bool, optional
+        If True the last vertex is joined with the first one and the path
+        never ends, defaults to False
+    cell_size: float, optional
+        Side of the cells of the segment grid, defaults to twice the mean
+        length of the segments
+    index_threshold: int, optional
+        Minimum number of segments for the segment grid to be used, paths
+        with fewer segments test all of them at once
+        
+    Attributes
+    ----------
+    vertices: numpy.ndarray(float, shape = (n, 2))
+        Vertices of the path, for cyclic paths the first vertex is repeated at the end
+    arc: numpy.ndarray(float, shape = (n,))
+        Distance along the path of every vertex
+    length: float
+        Total length of the path
+    tangents: numpy.ndarray(float, shape = (n, 2)) or None
+        Direction of the path at every vertex, for paths that sample a
+        curve, like :py:class:`CatmullRomPath`. Plain polylines have
+        None, their direction is the one of their segments
+    """
+    
+    def __init__(self, points, cyclic = False, cell_size = None, index_threshold = 64):
+        vertices = numpy.array(points, dtype = float).reshape(-1, 2)
+        if len(vertices) < 2:
+            raise ValueError('a PolylinePath needs at least 2 points')
+        if cyclic and (vertices[0] != vertices[-1]).any():
+            vertices = numpy.vstack([vertices, vertices[:1]])
+            
+        self.cyclic = cyclic
+        self.vertices = vertices
+        self.tangents = None
+        self.starts = vertices[:-1]
+        self.deltas = vertices[1:] - vertices[:-1]
+        self.segment_lengths = numpy.hypot(self.deltas[:, 0], self.deltas[:, 1])
+        # Columns used by the nearest point queries
+        self._x, self._y = self.starts[:, 0].copy(), self.starts[:, 1].copy()
+        self._dx, self._dy = self.deltas[:, 0].copy(), self.deltas[:, 1].copy()
+        lengths_sq = self.segment_lengths**2
+        self._inverse_lengths_sq = numpy.divide(1, lengths_sq, out = numpy.zeros_like(lengths_sq), where = lengths_sq > 0)
+        self.arc = numpy.concatenate([[0.0], numpy.cumsum(self.segment_lengths)])
+        self.length = float(self.arc[-1])
+        self._points = [tuple(vertex) for vertex in vertices.tolist()]
+        self._arc = self.arc.tolist()
+        
+        self.cell_size = cell_size
+        self.cells = None
+        if len(self.starts) >= index_threshold:
+            self._build_index()
+        
+        def polyline_path(self, i):
+            return self._points[i]
+            
+        super(PolylinePath, self).__init__(polyline_path, domain_start = 0, domain_end = len(vertices) - 1, increment = 1)
+        
+    def __repr__(self):
+        return 'PolylinePath({} vertices)'.format(len(self.vertices))
+        
+    def __next__(self):
+        if self.cyclic and self.x >= self.domain_end:
+            self.reset()
+        return super(PolylinePath, self).__next__()
+        
+    def _build_index(self):
+        """ Buckets every segment in the cells its bounding box overlaps """
+        if self.cell_size is None:
+            self.cell_size = max(2*float(self.segment_lengths.mean()), 1.0)
+        cell_size = self.cell_size
+        
+        ends = self.starts + self.deltas
+        low = numpy.floor(numpy.minimum(self.starts, ends) / cell_size).astype(int)
+        high = numpy.floor(numpy.maximum(self.starts, ends) / cell_size).astype(int)
+        
+        cells = {}
+        for index in range(len(self.starts)):
+            for cx in range(low[index, 0], high[index, 0] + 1):
+                for cy in range(low[index, 1], high[index, 1] + 1):
+                    cells.setdefault((cx, cy), []).append(index)
+        self.cells = {key: numpy.array(bucket, dtype = int) for key, bucket in cells.items()}
+        self._cell_bounds = (low.min(axis = 0), high.max(axis = 0))
+        
+    def point_at_distance(self, s):
+        """ Returns the point at distance s along the path
+        
+        Distances outside the path are clamped to its ends, or wrapped
+        around for cyclic paths.
+        
+        Parameters
+        ----------
+        s: float
+            Distance along the path
+            
+        Returns
+        -------
+        tuple(float, float)
+        """
+        i, t = self._locate(s)
+        (x0, y0), (x1, y1) = self._points[i], self._points[i+1]
+        return x0 + (x1 - x0)*t, y0 + (y1 - y0)*t
+        
+    def tangent_at_distance(self, s):
+        """ Returns the direction of the path at distance s along it
+        
+        It is the direction of the segment s falls in, or the
+        interpolation of the :py:attr:`tangents` at its ends when the
+        path has them.
+        
+        Parameters
+        ----------
+        s: float
+            Distance along the path
+            
+        Returns
+        -------
+        tuple(float, float)
+            Unit vector, or (0, 0) where the path has no direction
+        """
+        i, t = self._locate(s)
+        if self.tangents is None:
+            x, y = self._dx[i], self._dy[i]
+        else:
+            (x0, y0), (x1, y1) = self.tangents[i], self.tangents[i+1]
+            x, y = x0 + (x1 - x0)*t, y0 + (y1 - y0)*t
+        length = math.hypot(x, y)
+        if length == 0:
+            return 0.0, 0.0
+        return float(x / length), float(y / length)
+        
+    def points_at_distance(self, s):
+        """ Vectorized :py:meth:`point_at_distance`, returns the points at many distances along the path
+        
+        Parameters
+        ----------
+        s: array_like(float, shape = (N,))
+            Distances along the path
+            
+        Returns
+        -------
+        numpy.ndarray(float, shape = (N, 2))
+        """
+        i, t = self._locate_many(s)
+        return self.vertices[i] + self.deltas[i]*t[:, None]
+        
+    def tangents_at_distance(self, s):
+        """ Vectorized :py:meth:`tangent_at_distance`, returns the directions at many distances along the path
+        
+        Parameters
+        ----------
+        s: array_like(float, shape = (N,))
+            Distances along the path
+            
+        Returns
+        -------
+        numpy.ndarray(float, shape = (N, 2))
+            Unit vectors, or null ones where the path has no direction
+        """
+        i, t = self._locate_many(s)
+        if self.tangents is None:
+            tangents = self.deltas[i]
+        else:
+            tangents = self.tangents[i] + (self.tangents[i+1] - self.tangents[i])*t[:, None]
+        lengths = numpy.hypot(tangents[:, 0], tangents[:, 1])[:, None]
+        return numpy.divide(tangents, lengths, out = numpy.zeros_like(tangents), where = lengths > 0)
+        
+    def _locate_many(self, s):
+        """ Vectorized :py:meth:`_locate` """
+        s = numpy.asarray(s, dtype = float)
+        if self.cyclic and self.length > 0:
+            s = s % self.length
+        else:
+            s = numpy.clip(s, 0, self.length)
+        i = numpy.searchsorted(self.arc, s, side = 'right') - 1
+        numpy.clip(i, 0, len(self.arc) - 2, out = i)
+        lengths = self.segment_lengths[i]
+        t = numpy.divide(s - self.arc[i], lengths, out = numpy.zeros_like(s), where = lengths > 0)
+        return i, t
+        
+    def _locate(self, s):
+        """ Returns the segment s falls in and how far along it, from 0 to 1 """
+        length = self.length
+        if self.cyclic and length > 0:
+            s %= length
+        elif s <= 0:
+            return 0, 0.0
+        elif s >= length:
+            return len(self._arc) - 2, 1.0
+            
+        i = min(bisect.bisect_right(self._arc, s) - 1, len(self._arc) - 2)
+        segment_length = self._arc[i+1] - self._arc[i]
+        return i, (s - self._arc[i]) / segment_length if segment_length > 0 else 0.0
+        
+    def bake(self):
+        """ Does nothing, the vertices of a :py:class:`PolylinePath` already are a table """
+        return self
+        
+    def _closest_on_segments(self, point, indices):
+        """ Returns (distance along path, closest point, distance) among the given segments """
+        x, y = float(point[0]), float(point[1])
+        dx = self._dx[indices]
+        dy = self._dy[indices]
+        # Offset from the point to the start of every segment
+        ox = self._x[indices] - x
+        oy = self._y[indices] - y
+        t = (ox*dx + oy*dy) * self._inverse_lengths_sq[indices]
+        numpy.clip(-t, 0, 1, out = t)
+        ox += dx*t
+        oy += dy*t
+        distances_sq = ox*ox + oy*oy
+        best = int(distances_sq.argmin())
+        segment = int(indices[best])
+        s = self._arc[segment] + float(t[best])*float(self.segment_lengths[segment])
+        return s, (x + float(ox[best]), y + float(oy[best])), math.sqrt(distances_sq[best])
+        
+    def nearest(self, point):
+        """ Returns the point of the path closest to point
+        
+        Parameters
+        ----------
+        point: list_like(float, float)
+        
+        Returns
+        -------
+        tuple(float, tuple(float, float), float)
+            Distance along the path of the closest point, the closest
+            point, and its distance to the given point
+        """
+        if self.cells is None:
+            return self._closest_on_segments(point, numpy.arange(len(self.starts)))
+            
+        cell_size = self.cell_size
+        x, y = point[0] / cell_size, point[1] / cell_size
+        cx, cy = int(math.floor(x)), int(math.floor(y))
+        low, high = self._cell_bounds
+        # Rings around points outside the grid would mostly be empty,
+        # testing every segment is cheaper
+        if not (low[0] <= cx <= high[0] and low[1] <= cy <= high[1]):
+            return self._closest_on_segments(point, numpy.arange(len(self.starts)))
+            
+        # Search rings of cells around the point until no unsearched
+        # segment can be closer than the best one found
+        # Distance from the point to the border of its own cell
+        margin = min(x - cx, cx + 1 - x, y - cy, cy + 1 - y) * cell_size
+        max_ring = max(cx - low[0], high[0] - cx, cy - low[1], high[1] - cy, 1)
+        cells = self.cells
+        best = None
+        buckets = []
+        for ring in range(max_ring + 1):
+            for i in range(cx - ring, cx + ring + 1):
+                for j in ((cy - ring, cy + ring) if ring else (cy,)):
+                    bucket = cells.get((i, j))
+                    if bucket is not None:
+                        buckets.append(bucket)
+            for j in range(cy - ring + 1, cy + ring):
+                for i in ((cx - ring, cx + ring) if ring else ()):
+                    bucket = cells.get((i, j))
+                    if bucket is not None:
+                        buckets.append(bucket)
+            # The cell of the point is searched along with the first ring
+            if buckets and ring:
+                found = self._closest_on_segments(point, numpy.concatenate(buckets))
+                if best is None or found[2] < best[2]:
+                    best = found
+                buckets = []
+            if best is not None and best[2] <= ring*cell_size + margin:
+                break
+        return best
+        
+        
+class _SplinePath(PolylinePath):
+    """ :py:class:`PolylinePath` that samples a piecewise cubic curve
+    
+    Sub-classes compute the position and tangent of every sample, the
+    curve is then just a :py:class:`PolylinePath` through the positions,
+    with the tangents as :py:attr:`~PolylinePath.tangents`.
+    """
+    
+    def __init__(self, positions, tangents, pieces, resolution, cyclic, cell_size, index_threshold):
+        super(_SplinePath, self).__init__(positions, cyclic, cell_size, index_threshold)
+        lengths = numpy.hypot(tangents[:, 0], tangents[:, 1])
+        self.tangents = numpy.divide(tangents, lengths[:, None], out = numpy.zeros_like(tangents), where = lengths[:, None] > 0)
+        self.pieces = pieces
+        self.resolution = resolution
+        
+    def __repr__(self):
+        return '{}({} pieces)'.format(type(self).__name__, self.pieces)
+        
+    def sample(self, u):
+        """ Returns the point of the curve at parameter u
+        
+        The integer part of u is the piece of the curve and the fractional
+        part how far along it, so the point is found with an index into
+        the table and a lerp. Unlike :py:meth:`~PolylinePath.point_at_distance`, the
+        same increment of u doesn't always cover the same distance.
+        
+        Parameters
+        ----------
+        u: float
+            Parameter between 0 and :py:attr:`pieces`
+            
+        Returns
+        -------
+        tuple(float, float)
+        """
+        last = len(self._points) - 1
+        if self.cyclic:
+            u %= self.pieces
+        f = min(max(u*self.resolution, 0), last)
+        i = min(int(f), last - 1)
+        t = f - i
+        (x0, y0), (x1, y1) = self._points[i], self._points[i+1]
+        return x0 + (x1 - x0)*t, y0 + (y1 - y0)*t
+        
+    @staticmethod
+    def _parameters(resolution):
+        """ Returns the values of the parameter of every sample of a piece, and their powers """
+        u = numpy.arange(resolution) / resolution
+        return u[:, None], (u*u)[:, None], (u*u*u)[:, None]
+        
+        
+class CatmullRomPath(_SplinePath):
+    """ Smooth :py:class:`PolylinePath` that goes through every control point
+    
+    The uniform Catmull-Rom spline through the control points is sampled
+    once, resolution times between every two of them, into a table of
+    positions and tangents. Following it costs the same as following a
+    :py:class:`PolylinePath`, no polynomial is evaluated afterwards.
+    
+    Parameters
+    ----------
+    points: list(list_like(float, float))
+        Control points, at least 2
+    resolution: int, optional
+        Number of samples between every two control points
+    cyclic: bool, optional
+        If True the curve closes smoothly back to the first point
+    cell_size: float, optional
+        See :py:class:`PolylinePath`
+    index_threshold: int, optional
+        See :py:class:`PolylinePath`
+        
+    Attributes
+    ----------
+    pieces: int
+        Number of pieces of the curve, one between every two control points
+    """
+    
+    def __init__(self, points, resolution = 16, cyclic = False, cell_size = None, index_threshold = 64):
+        controls = numpy.array(points, dtype = float).reshape(-1, 2)
+        if len(controls) < 2:
+            raise ValueError('a CatmullRomPath needs at least 2 points')
+        if cyclic and (controls[0] == controls[-1]).all():
+            controls = controls[:-1]
+            
+        # Every piece goes from p1 to p2, neighbours are wrapped around
+        # on cyclic curves and repeated at the ends of open ones
+        if cyclic:
+            padded = numpy.vstack([controls[-1:], controls, controls[:2]])
+        else:
+            padded = numpy.vstack([controls[:1], controls, controls[-1:]])
+        pieces = len(padded) - 3
+        p0, p1, p2, p3 = (padded[k:k + pieces][:, None] for k in range(4))
+        
+        u, u2, u3 = self._parameters(resolution)
+        b = p2 - p0
+        c = 2*p0 - 5*p1 + 4*p2 - p3
+        d = -p0 + 3*p1 - 3*p2 + p3
+        positions = 0.5*(2*p1 + b*u + c*u2 + d*u3)
+        tangents = 0.5*(b + 2*c*u + 3*d*u2)
+        
+        # The curve ends exactly on the last point
+        end = padded[-2]
+        end_tangent = 0.5*(b[-1, 0] + 2*c[-1, 0] + 3*d[-1, 0])
+        positions = numpy.vstack([positions.reshape(-1, 2), end])
+        tangents = numpy.vstack([tangents.reshape(-1, 2), end_tangent])
+        
+        self.controls = controls
+        super(CatmullRomPath, self).__init__(positions, tangents, pieces, resolution, cyclic, cell_size, index_threshold)
+        
+        
+class BezierPath(_SplinePath):
+    """ Smooth :py:class:`PolylinePath` made of cubic Bézier curves
+    
+    Every piece of the curve goes from a control point to the third
+    next one, pulled by the two in between, the last point of a piece
+    being the first of the next one. The curve is sampled once,
+    resolution times per piece, into a table of positions and tangents.
+    
+    Parameters
+    ----------
+    points: list(list_like(float, float))
+        Control points, 3 per piece plus the last one
+    resolution: int, optional
+        Number of samples per piece
+    cyclic: bool, optional
+        If True the path loops, the last point should be the first one
+    cell_size: float, optional
+        See :py:class:`PolylinePath`
+    index_threshold: int, optional
+        See :py:class:`PolylinePath`
+        
+    Attributes
+    ----------
+    pieces: int
+        Number of cubic curves in the path
+    """
+    
+    def __init__(self, points, resolution = 16, cyclic = False, cell_size = None, index_threshold = 64):
+        controls = numpy.array(points, dtype = float).reshape(-1, 2)
+        if len(controls) < 4 or (len(controls) - 1) % 3:
+            raise ValueError('a BezierPath needs 3 points per piece plus the last one, got {}'.format(len(controls)))
+            
+        if cyclic and (controls[0] != controls[-1]).any():
+            raise ValueError('the last point of a cyclic BezierPath must be the first one')
+            
+        pieces = (len(controls) - 1) // 3
+        p0, p1, p2 = (controls[k:-1:3][:, None] for k in range(3))
+        p3 = controls[3::3][:, None]
+        
+        u, u2, u3 = self._parameters(resolution)
+        v = 1 - u
+        positions = v*v*v*p0 + 3*v*v*u*p1 + 3*v*u2*p2 + u3*p3
+        tangents = 3*(v*v*(p1 - p0) + 2*v*u*(p2 - p1) + u2*(p3 - p2))
+        
+        end_tangent = 3*(controls[-1] - controls[-2])
+        positions = numpy.vstack([positions.reshape(-1, 2), controls[-1]])
+        tangents = numpy.vstack([tangents.reshape(-1, 2), end_tangent])
+        
+        self.controls = controls
+        super(BezierPath, self).__init__(positions, tangents, pieces, resolution, cyclic, cell_size, index_threshold)
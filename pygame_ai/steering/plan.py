@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+""" Compiled Steering Plans
+
+This module implements :py:func:`compile_plan`, which flattens a tree of
+:py:class:`~.blended.BlendedSteering` and :py:class:`~.priority.PrioritySteering`
+into a :py:class:`SteeringPlan`: a linear list of groups, each one a list of
+leaf behaviors with their weights already multiplied together. Evaluating
+a plan is a couple of flat loops instead of a recursive walk through the
+composites, and every leaf behavior is evaluated at most once even if it
+appears several times in the tree.
+
+:py:func:`run` evaluates the plans of many agents at once. Leaves that
+have a batched equivalent in :py:mod:`~.kinematic_batch` and whose
+character and target are :py:class:`~world.AgentView` s of the same
+:py:class:`~world.AgentWorld` are evaluated together, one NumPy call per
+kind of behavior, see :py:data:`batched_behaviors`. Every other leaf is
+still evaluated by its own ``get_steering``.
+
+The flattening follows these rules:
+
+    * A :py:class:`~.blended.BlendedSteering` nested inside another one is
+      merged into its parent, its weights are multiplied by the weight of
+      the nested blend. Only the clipping of the outermost blend is kept,
+      so nested blends whose output used to be clipped may produce larger
+      accelerations.
+    * A :py:class:`~.priority.PrioritySteering` nested inside another one
+      with the same ``epsilon`` is spliced into its parent's list of groups.
+    * Any other combination is compiled on its own and used as a leaf.
+
+Example
+-------
+
+.. code-block:: python
+
+    plans = [plan.compile_plan(npc.ai) for npc in npcs]
+
+    # Inside the game loop
+    linear, angular = plan.run(plans)
+    world.integrate(linear, angular, tick)
+"""
+
+import operator
+
+import numpy
+
+from pygame_ai.world import AgentView
+from . import kinematic
+from . import kinematic_batch
+from . import blended
+from . import priority
+
+default_costs = {
+    kinematic.ObstacleAvoidance: 20,
+    kinematic.CollisionAvoidance: 10,
+    kinematic.Separation: 10,
+    kinematic.FollowPath: 3,
+    kinematic.Wander: 3,
+}
+""" dict(type, int) : Relative evaluation cost of behavior classes, used by :py:func:`compile_plan` to order groups, any class not listed costs 1 """
+
+batched_behaviors = {
+    kinematic.Seek: (kinematic_batch.seek, (), operator.attrgetter('steering')),
+    kinematic.Flee: (kinematic_batch.flee, (), operator.attrgetter('steering')),
+    kinematic.Arrive: (kinematic_batch.arrive, ('target_radius', 'slow_radius', 'time_to_target'), operator.attrgetter('steering')),
+    kinematic.Pursue: (kinematic_batch.pursue, ('max_prediction_time',), operator.attrgetter('seek.steering')),
+    kinematic.Evade: (kinematic_batch.evade, ('max_prediction_time',), operator.attrgetter('flee.steering')),
+}
+""" dict(type, tuple(function, tuple(str), function)) : Leaf classes that :py:func:`run` evaluates in batches
+
+Every class maps to its batched function, the names of the attributes
+passed to it after the targets, and a function that returns the
+:py:class:`~.kinematic.SteeringOutput` the leaf's ``get_steering`` returns.
+Only exact classes are batched, subclasses may override ``get_steering``.
+"""
+
+def behavior_cost(behavior, costs = None):
+    """ Returns the estimated evaluation cost of a behavior
+
+    Parameters
+    ----------
+    behavior: :py:class:`~.KinematicSteeringBehavior`
+    costs: dict(type, int), optional
+        Cost of behavior classes, defaults to :py:data:`default_costs`
+    """
+    if isinstance(behavior, SteeringPlan):
+        return behavior.cost
+    if costs is None:
+        costs = default_costs
+    for cls in type(behavior).__mro__:
+        if cls in costs:
+            return costs[cls]
+    return 1
+
+
+class PlanGroup(object):
+    """ Weighted sum of leaf behaviors, one step of a :py:class:`SteeringPlan`
+
+    Attributes
+    ----------
+    leaves: list(:py:class:`~.KinematicSteeringBehavior`)
+        Behaviors to evaluate
+    weights: list(float)
+        Weight of every leaf
+    character: :py:class:`~gameobject.GameObject` or None
+        Character whose maximum accelerations clip the sum, None for no clipping
+    cost: int
+        Estimated evaluation cost of the group
+    """
+
+    __slots__ = ('leaves', 'weights', 'character', 'cost')
+
+    def __init__(self, terms, character = None, costs = None):
+        # Merge duplicated leaves
+        leaves = []
+        weights = []
+        for leaf, weight in terms:
+            for i in range(len(leaves)):
+                if leaves[i] is leaf:
+                    weights[i] += weight
+                    break
+            else:
+                leaves.append(leaf)
+                weights.append(weight)
+
+        self.leaves = leaves
+        self.weights = weights
+        self.character = character
+        self.cost = sum(behavior_cost(leaf, costs) for leaf in leaves)
+
+    def __repr__(self):
+        return ' + '.join('{}*{}'.format(weight, leaf) for leaf, weight in zip(self.leaves, self.weights))
+
+
+class SteeringPlan(kinematic.KinematicSteeringBehavior):
+    """ Flat evaluation plan of a behavior tree
+
+    Derives from :py:class:`~.KinematicSteeringBehavior`, so a plan can be
+    used anywhere the original tree was used. Plans should be created with
+    :py:func:`compile_plan`.
+
+    If the plan has more than one group they are tested in order, as in
+    :py:class:`~.priority.PrioritySteering`, and the first one whose output
+    surpasses epsilon is returned.
+
+    Parameters
+    ----------
+    groups: list(:py:class:`PlanGroup`)
+    epsilon: float, optional
+        Treshold used to select among groups
+    """
+
+    def __init__(self, groups, epsilon = 0.1):
+        self.groups = groups
+        self.epsilon = epsilon
+        self.cost = sum(group.cost for group in groups)
+        self.steering = kinematic.SteeringOutput()
+        self.leaves = []
+        # Index of every leaf of every group in self.leaves
+        self._terms = []
+        for group in groups:
+            terms = []
+            for leaf, weight in zip(group.leaves, group.weights):
+                for i, seen in enumerate(self.leaves):
+                    if leaf is seen:
+                        break
+                else:
+                    i = len(self.leaves)
+                    self.leaves.append(leaf)
+                terms.append((i, weight))
+            self._terms.append((group, terms))
+        # Outputs of the leaves, valid while their stamp equals the
+        # current call, so nothing has to be cleared between calls
+        self._outputs = [None] * len(self.leaves)
+        self._stamps = [0] * len(self.leaves)
+        self._call = 0
+        # Leaves run() may evaluate in batches, as (index, leaf)
+        self._batchable = [(i, leaf) for i, leaf in enumerate(self.leaves) if type(leaf) in batched_behaviors]
+
+    def __repr__(self):
+        return 'SteeringPlan [' + ' | '.join(repr(group) for group in self.groups) + ']'
+
+    def draw_indicators(self, screen, offset = (lambda pos: pos)):
+        for leaf in self.leaves:
+            leaf.draw_indicators(screen, offset)
+
+    def get_steering(self):
+        """ Evaluates the plan
+
+        The same :py:class:`~.kinematic.SteeringOutput` is reused on every
+        call, copy it if you need to keep it across calls.
+
+        Returns
+        -------
+        :py:class:`~.kinematic.SteeringOutput`
+        """
+        steering = self.steering
+        epsilon = self.epsilon
+        leaves = self.leaves
+        outputs = self._outputs
+        stamps = self._stamps
+        self._call += 1
+        call = self._call
+        for group, terms in self._terms:
+            steering.reset()
+            for i, weight in terms:
+                if stamps[i] != call:
+                    outputs[i] = leaves[i].get_steering()
+                    stamps[i] = call
+                steering.iadd_scaled(outputs[i], weight)
+
+            if group.character is not None:
+                steering.clamp_ip(group.character.max_accel, group.character.max_angular_accel)
+
+            # If any of it's components surpases the treshold, return it
+            if steering.linear.length() > epsilon or abs(steering.angular) > epsilon:
+                return steering
+
+        # If we get here, no group surpased the treshold
+        # Return the last group's steering as small as it is
+        return steering
+
+
+def _blend_terms(behavior, scale, costs, reorder):
+    """ Returns the (leaf, weight) terms of a BlendedSteering, merging nested blends """
+    terms = []
+    for entry in behavior.behaviors:
+        child = entry.behavior
+        weight = scale * entry.weight
+        if isinstance(child, blended.BlendedSteering):
+            terms.extend(_blend_terms(child, weight, costs, reorder))
+        elif isinstance(child, priority.PrioritySteering):
+            terms.append((compile_plan(child, costs, reorder), weight))
+        else:
+            terms.append((child, weight))
+    return terms
+
+def _priority_groups(behavior, costs, reorder):
+    """ Returns the groups of a PrioritySteering, splicing nested ones with the same epsilon """
+    groups = []
+    for child in behavior.behaviors:
+        if isinstance(child, blended.BlendedSteering):
+            groups.append(PlanGroup(_blend_terms(child, 1, costs, reorder), child.character, costs))
+        elif isinstance(child, priority.PrioritySteering) and child.epsilon == behavior.epsilon:
+            groups.extend(_priority_groups(child, costs, reorder))
+        elif isinstance(child, priority.PrioritySteering):
+            groups.append(PlanGroup([(compile_plan(child, costs, reorder), 1)], costs = costs))
+        else:
+            groups.append(PlanGroup([(child, 1)], costs = costs))
+    return groups
+
+def compile_plan(behavior, costs = None, reorder = False):
+    """ Flattens a behavior tree into a :py:class:`SteeringPlan`
+
+    Parameters
+    ----------
+    behavior: :py:class:`~.KinematicSteeringBehavior`
+        Root of the tree, normally a :py:class:`~.blended.BlendedSteering`
+        or a :py:class:`~.priority.PrioritySteering`
+    costs: dict(type, int), optional
+        Evaluation cost of behavior classes, defaults to :py:data:`default_costs`
+    reorder: bool, optional
+        If True, priority groups are sorted so that the cheapest ones are
+        tested first. This changes which group wins when several of them
+        surpass epsilon, so only use it when the order of the priorities
+        doesn't matter, defaults to False
+
+    Returns
+    -------
+    :py:class:`SteeringPlan`
+    """
+    if isinstance(behavior, priority.PrioritySteering):
+        groups = _priority_groups(behavior, costs, reorder)
+        epsilon = behavior.epsilon
+    elif isinstance(behavior, blended.BlendedSteering):
+        groups = [PlanGroup(_blend_terms(behavior, 1, costs, reorder), behavior.character, costs)]
+        epsilon = 0
+    else:
+        groups = [PlanGroup([(behavior, 1)], costs = costs)]
+        epsilon = 0
+
+    if reorder:
+        groups.sort(key = lambda group: group.cost)
+
+    return SteeringPlan(groups, epsilon)
+
+def _gather_batched(calls, leaf, owner, slot):
+    """ Adds leaf to the batched call it can be evaluated in, if there is one """
+    character = leaf.character
+    target = leaf.target
+    if not (isinstance(character, AgentView) and isinstance(target, AgentView)):
+        return
+    world = character.world
+    if target.world is not world:
+        return
+
+    cls = type(leaf)
+    key = (cls, world, tuple([getattr(leaf, name) for name in batched_behaviors[cls][1]]))
+    call = calls.get(key)
+    if call is None:
+        call = calls[key] = ([], [], [])
+    call[0].append(character.index)
+    call[1].append(target.index)
+    call[2].append((leaf, owner, slot))
+
+def _run_batched(plans, linear, angular):
+    """ Evaluates the leaves of plans that have a batched equivalent
+
+    Outputs of leaves of a :py:class:`SteeringPlan` are handed to the plan,
+    which uses them in its next call instead of evaluating the leaves.
+    Plans that are leaves of other plans are left alone, they may not be
+    evaluated in this call. Plans given as bare behaviors are written to
+    linear and angular directly.
+
+    Returns
+    -------
+    set(int)
+        Rows of linear and angular that are already written
+    """
+    calls = {}
+    for row, behavior in enumerate(plans):
+        cls = type(behavior)
+        if cls is SteeringPlan:
+            for i, leaf in behavior._batchable:
+                _gather_batched(calls, leaf, behavior, i)
+        elif cls in batched_behaviors:
+            _gather_batched(calls, behavior, None, row)
+
+    done = set()
+    for (cls, world, parameters), (characters, targets, leaves) in calls.items():
+        function, _, output_of = batched_behaviors[cls]
+        result = function(world, numpy.array(characters, dtype = int), numpy.array(targets, dtype = int), *parameters)
+        for (leaf, owner, slot), (x, y) in zip(leaves, result.tolist()):
+            output = output_of(leaf)
+            output.linear[0], output.linear[1] = x, y
+            output.angular = 0
+            if owner is None:
+                linear[slot] = x, y
+                angular[slot] = 0
+                done.add(slot)
+            else:
+                owner._outputs[slot] = output
+                owner._stamps[slot] = owner._call + 1
+
+    return done
+
+def run(plans, linear = None, angular = None):
+    """ Evaluates many plans, one per agent, into acceleration arrays
+
+    The result can be handed straight to :py:meth:`~world.AgentWorld.integrate`.
+
+    Leaves listed in :py:data:`batched_behaviors` whose character and
+    target are :py:class:`~world.AgentView` s of the same world are
+    evaluated first, in one :py:mod:`~.kinematic_batch` call for all the
+    leaves of the same class and parameters, and the plans reuse their
+    outputs. The rest of every plan, the other leaves and the weighted
+    sums, is still evaluated one plan after the other.
+
+    Parameters
+    ----------
+    plans: list(:py:class:`SteeringPlan`)
+        One plan per agent, plain behaviors are accepted too
+    linear: numpy.ndarray(float, shape = (N, 2)), optional
+        Array where linear accelerations will be written, allocated if not given
+    angular: numpy.ndarray(float, shape = (N,)), optional
+        Array where angular accelerations will be written, allocated if not given
+
+    Returns
+    -------
+    tuple(numpy.ndarray (N, 2), numpy.ndarray (N,))
+        Linear and angular acceleration requested by every plan
+    """
+    if linear is None:
+        linear = numpy.empty((len(plans), 2))
+    if angular is None:
+        angular = numpy.empty(len(plans))
+
+    done = _run_batched(plans, linear, angular)
+    for i, plan in enumerate(plans):
+        if i in done:
+            continue
+        steering = plan.get_steering()
+        linear[i] = steering.linear
+        angular[i] = steering.angular
+
+    return linear, angular
@@ -33,17 +33,55 @@ returns a steering greater than the treshold.
             kinematic.Pursue(character, target),
         ],
     )
+    
+Expensive behaviors can be given a refresh interval, here obstacle
+avoidance is evaluated every 6th loop, or right away if the character's
+velocity changes a lot, while **Pursue** is evaluated every loop:
+
+.. code-block:: python
+
+    mybehavior = PrioritySteering(
+        behaviors = [
+            kinematic.ObstacleAvoidance(character, obstacles),
+            kinematic.Pursue(character, target),
+        ],
+        intervals = [6, 1],
+        invalidate = [scheduler.velocity_changed(10), None],
+    )
 
 """
 
 from . import kinematic
 from . import blended
 from . import path
+from .scheduler import throttle
 
 
 class PrioritySteering(kinematic.KinematicSteeringBehavior):
+    """ :py:class:`~.kinematic.KinematicSteeringBehavior` that applies the first behavior with a meaningful output
+    
+    Parameters
+    ----------
+    behaviors: list(:py:class:`~.KinematicSteeringBehavior`)
+        Behaviors, from the most to the least important
+    epsilon: float, optional
+        Minimum linear or angular output for a behavior to be applied
+    intervals: list(int), optional
+        Refresh interval of every behavior, the last output of a behavior
+        is reused in between, see :py:func:`~.scheduler.throttle`.
+        Defaults to evaluating every behavior on every call
+    invalidate: list(function :py:class:`~.scheduler.Throttled` -> bool or None), optional
+        Invalidation trigger of every behavior, see :py:class:`~.scheduler.Throttled`
+    """
     
-    def __init__(self, behaviors, epsilon = 0.1):
+    def __init__(self, behaviors, epsilon = 0.1, intervals = None, invalidate = None):
+        if intervals is not None or invalidate is not None:
+            intervals = intervals or [1]*len(behaviors)
+            invalidate = invalidate or [None]*len(behaviors)
+            behaviors = [
+                throttle(behavior, interval, trigger)
+                for behavior, interval, trigger in zip(behaviors, intervals, invalidate)
+            ]
         self.behaviors = behaviors
         self.epsilon = epsilon
         
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+""" Level of Detail AI Scheduling
+
+This module implements :py:class:`AIScheduler`, which decides how often the
+steering behavior of every agent is evaluated based on how far the agent is
+from one or more *focus points* (the player, the camera...). Agents close
+to a focus point are evaluated every loop, while far away agents are
+evaluated only every few loops; in between, the last
+:py:class:`~.kinematic.SteeringOutput` of the agent is applied again.
+
+Agents in the same tier are spread across loops, so that the evaluations
+of a tier don't all happen in the same loop.
+
+Example
+-------
+
+.. code-block:: python
+
+    scheduler = AIScheduler(focus = [player])
+    for npc in npcs:
+        scheduler.add(npc, blended.Arrive(npc, player, walls))
+
+    # Inside the game loop
+    scheduler.update(tick)
+    for npc in npcs:
+        npc.rect.move_ip(npc.velocity)
+"""
+
+import itertools
+
+import numpy
+import pygame
+
+from . import kinematic
+
+default_tiers = ((400, 1), (1200, 4), (float('inf'), 16))
+""" tuple(tuple(float, int)) : Default (maximum distance, update interval) of every tier """
+
+_phases = itertools.count()
+
+class ScheduledAgent(object):
+    """ Scheduling state of an agent registered in an :py:class:`AIScheduler`
+
+    Attributes
+    ----------
+    character: :py:class:`~gameobject.GameObject`
+    behavior: :py:class:`~.KinematicSteeringBehavior`
+    steering: :py:class:`~.kinematic.SteeringOutput`
+        Last evaluated steering
+    tier: int
+        Index of the agent's current tier
+    phase: int
+        Offset used to spread agents of the same tier across loops
+    """
+
+    __slots__ = ('character', 'behavior', 'steering', 'tier', 'phase')
+
+    def __init__(self, character, behavior, phase):
+        self.character = character
+        self.behavior = behavior
+        self.steering = kinematic.SteeringOutput()
+        self.tier = 0
+        self.phase = phase
+
+    def __repr__(self):
+        return 'ScheduledAgent({}, tier {})'.format(self.behavior, self.tier)
+
+
+class AIScheduler(object):
+    """ Evaluates the behaviors of many agents at a rate that depends on their distance to focus points
+
+    Parameters
+    ----------
+    focus: list(:py:class:`~gameobject.GameObject` or list_like(float, float))
+        Focus points, either objects with a position or fixed positions
+    tiers: list(tuple(float, int)), optional
+        (maximum distance, update interval) of every tier, sorted by
+        distance. An agent belongs to the first tier whose maximum distance
+        is greater than its distance to the closest focus point, and its
+        behavior is evaluated once every *update interval* loops. Agents
+        farther than every tier use the last one. Defaults to
+        :py:data:`default_tiers`
+
+    Attributes
+    ----------
+    agents: list(:py:class:`ScheduledAgent`)
+        Registered agents
+    frame: int
+        Number of times :py:meth:`update` has been called
+    evaluations: int
+        Number of behaviors evaluated in the last :py:meth:`update`
+    """
+
+    def __init__(self, focus, tiers = default_tiers):
+        self.focus = list(focus)
+        self.tiers = list(tiers)
+        self.agents = []
+        self.frame = 0
+        self.evaluations = 0
+
+    def __repr__(self):
+        return 'AIScheduler({} agents)'.format(len(self.agents))
+
+    def add(self, character, behavior):
+        """ Registers an agent
+
+        Parameters
+        ----------
+        character: :py:class:`~gameobject.GameObject`
+            Character that will be steered
+        behavior: :py:class:`~.KinematicSteeringBehavior`
+            Behavior that steers the character
+
+        Returns
+        -------
+        :py:class:`ScheduledAgent`
+        """
+        agent = ScheduledAgent(character, behavior, len(self.agents))
+        agent.tier = self.tier_of(character)
+        self.agents.append(agent)
+        return agent
+
+    def remove(self, character):
+        """ Unregisters every agent of the given character """
+        self.agents = [agent for agent in self.agents if agent.character is not character]
+
+    def focus_positions(self):
+        """ Returns the current position of every focus point """
+        return [point.position if hasattr(point, 'position') else point for point in self.focus]
+
+    def tier_of(self, character, focus_positions = None):
+        """ Returns the index of the tier the character belongs to """
+        return int(self.tiers_of([character.position], focus_positions)[0])
+
+    def tiers_of(self, positions, focus_positions = None):
+        """ Returns the index of the tier of every position
+
+        Parameters
+        ----------
+        positions: array_like(float, shape = (N, 2))
+        focus_positions: list(list_like(float, float)), optional
+            Defaults to :py:meth:`focus_positions`
+
+        Returns
+        -------
+        numpy.ndarray(int, shape = (N,))
+        """
+        if focus_positions is None:
+            focus_positions = self.focus_positions()
+        positions = numpy.asarray(positions, dtype = float).reshape(-1, 2)
+        focus = numpy.asarray(focus_positions, dtype = float).reshape(-1, 2)
+
+        # Squared distance to the closest focus point
+        offsets = positions[:, None, :] - focus[None, :, :]
+        distance_sq = (offsets*offsets).sum(axis = 2).min(axis = 1, initial = numpy.inf)
+
+        limits_sq = numpy.array([max_distance for max_distance, _ in self.tiers], dtype = float)**2
+        tiers = numpy.searchsorted(limits_sq, distance_sq, side = 'right')
+        return numpy.minimum(tiers, len(self.tiers) - 1)
+
+    def update(self, tick):
+        """ Steers every registered agent
+
+        The tier of every agent is recomputed on every call, so agents
+        react as soon as a focus point comes close. Agents whose turn it
+        is, or that just moved to a faster tier, get their behavior
+        evaluated, the rest apply their last steering again. Every agent
+        is then updated with :py:meth:`~.kinematic.SteeringOutput.update`.
+
+        Parameters
+        ----------
+        tick: float
+            Time transcurred since last loop
+        """
+        frame = self.frame
+        agents = self.agents
+        intervals = [interval for _, interval in self.tiers]
+        evaluations = 0
+
+        if agents:
+            tiers = self.tiers_of([agent.character.position for agent in agents]).tolist()
+        else:
+            tiers = []
+
+        for agent, tier in zip(agents, tiers):
+            interval = intervals[tier]
+            if (frame + agent.phase) % interval == 0 or interval < intervals[agent.tier]:
+                agent.steering.copy_from(agent.behavior.get_steering())
+                evaluations += 1
+            agent.tier = tier
+            agent.steering.update(agent.character, tick)
+
+        self.frame = frame + 1
+        self.evaluations = evaluations
+
+
+def velocity_changed(threshold):
+    """ Returns an invalidation trigger for :py:class:`Throttled`
+
+    The trigger fires when the character's velocity has changed by more
+    than threshold since the behavior was last evaluated. The
+    :py:class:`Throttled` behavior must have a character.
+
+    Parameters
+    ----------
+    threshold: float
+        Length of the velocity change that forces an evaluation
+    """
+    def trigger(throttled):
+        return (throttled.character.velocity - throttled.evaluated_velocity).length() > threshold
+    return trigger
+
+
+class Throttled(kinematic.KinematicSteeringBehavior):
+    """ :py:class:`~.KinematicSteeringBehavior` that evaluates another behavior at a lower rate
+
+    The wrapped behavior is evaluated once every interval calls to
+    :py:meth:`get_steering`, the rest of the calls return its last output.
+    This allows expensive behaviors, like :py:class:`~.kinematic.ObstacleAvoidance`,
+    to run less often than cheap ones inside a
+    :py:class:`~.blended.BlendedSteering` or a :py:class:`~.priority.PrioritySteering`.
+
+    Parameters
+    ----------
+    behavior: :py:class:`~.KinematicSteeringBehavior`
+        Behavior to evaluate
+    interval: int
+        Number of calls between evaluations, at 60 loops per second an
+        interval of 6 evaluates the behavior at 10 Hz
+    invalidate: function :py:class:`Throttled` -> bool, optional
+        Called on every stale call, if it returns True the behavior is
+        evaluated anyway, see :py:func:`velocity_changed`
+    phase: int, optional
+        Offset of the first evaluation, use different phases to spread
+        the evaluations of many throttled behaviors across loops
+    character: :py:class:`~gameobject.GameObject`, optional
+        Character whose velocity is tracked, defaults to the character of
+        the wrapped behavior. Behaviors without one, like a
+        :py:class:`~.priority.PrioritySteering`, need it to be given
+        when there is an invalidation trigger
+
+    Attributes
+    ----------
+    evaluated: bool
+        Whether the behavior has been evaluated at least once
+    evaluated_velocity: :pgmath:`Vector2` or None
+        Character velocity at the time of the last evaluation, None if
+        there is no character
+    """
+
+    def __init__(self, behavior, interval, invalidate = None, phase = 0, character = None):
+        if character is None:
+            character = getattr(behavior, 'character', None)
+        if invalidate is not None and character is None:
+            raise ValueError('an invalidation trigger needs a character, the behavior has none')
+        self.behavior = behavior
+        self.interval = interval
+        self.invalidate = invalidate
+        self.calls = phase
+        self.character = character
+        self.evaluated = False
+        self.evaluated_velocity = None
+        self.steering = kinematic.SteeringOutput()
+
+    def __repr__(self):
+        return 'Throttled ' + repr(self.behavior)
+
+    def draw_indicators(self, screen, offset = (lambda pos: pos)):
+        self.behavior.draw_indicators(screen, offset)
+
+    def get_steering(self):
+        stale = self.calls % self.interval != 0 and self.evaluated
+        if stale and self.invalidate is not None and self.invalidate(self):
+            stale = False
+        self.calls += 1
+
+        if not stale:
+            self.steering.copy_from(self.behavior.get_steering())
+            self.evaluated = True
+            if self.character is not None:
+                # Copy it, the character's velocity is updated in place
+                self.evaluated_velocity = pygame.Vector2(self.character.velocity)
+
+        return self.steering
+
+def throttle(behavior, interval = 1, invalidate = None, phase = None, character = None):
+    """ Returns behavior wrapped in a :py:class:`Throttled` if it isn't evaluated every call
+
+    Used for the refresh intervals of :py:class:`~.blended.BehaviorAndWeight`
+    and :py:class:`~.priority.PrioritySteering`.
+
+    Parameters
+    ----------
+    behavior: :py:class:`~.KinematicSteeringBehavior`
+        Behavior to evaluate
+    interval: int, optional
+        Number of calls between evaluations, defaults to 1, every call
+    invalidate: function :py:class:`Throttled` -> bool, optional
+        See :py:class:`Throttled`
+    phase: int, optional
+        See :py:class:`Throttled`. By default every new throttled behavior
+        gets the next phase, so that behaviors with the same interval
+        don't all refresh in the same loop
+    character: :py:class:`~gameobject.GameObject`, optional
+        See :py:class:`Throttled`
+
+    Returns
+    -------
+    :py:class:`~.KinematicSteeringBehavior`
+        behavior itself if interval is 1 and there is no trigger
+    """
+    if interval <= 1 and invalidate is None:
+        return behavior
+    if phase is None:
+        phase = next(_phases) % interval
+    return Throttled(behavior, interval, invalidate, phase, character)
@@ -9,11 +9,12 @@ Notes
 -----
     This might need a slightly better explaination
 """
-import random
+import math
 
 import pygame
 
 from pygame_ai.utils import math_utils
+from pygame_ai.utils.random_streams import default_streams
 
 class SteeringOutput(object):
     """ Container for Steering data
@@ -47,9 +48,10 @@ class SteeringOutput(object):
     def update(self, gameobject, tick):
         """ Update a :py:class:`~gameobject.GameObject`'s velocity and rotation
         
-        This method should be called once per loop, it updates the given 
-        :py:class:`gameobject.GameObject`'s velocity and rotation based 
-        on this :py:class:`~SteeringOutput`'s acceleration request
+        This method should be called once per loop, it sets the given 
+        :py:class:`gameobject.GameObject`'s velocity and rotation to the 
+        ones requested by this :py:class:`~SteeringOutput`, velocity is
+        clipped to the object's max_speed
         
         Parameters
         ----------
@@ -58,12 +60,9 @@ class SteeringOutput(object):
         tick : int
             Time transcurred since last loop
         """
-        gameobject.velocity += self.linear * tick
-        gameobject.rotation += self.rotation * tick
-        
-        if gameobject.velocity.length() > gameobject.max_speed:
-            gameobject.velocity.normalize_ip()
-            gameobject.velocity *= gameobject.max_speed
+        gameobject.velocity = pygame.Vector2(self.velocity)
+        gameobject.rotation = self.rotation
+        math_utils.clip_velocity(gameobject)
         
 null_steering = SteeringOutput(velocity = pygame.Vector2(0, 0), rotation = 0)
 """:py:class:`SteeringOutput` : Constant with 0 linear velocity and 0 angular velocity """
@@ -236,12 +235,16 @@ class Wander(StaticSteeringBehavior):
     ----------
     character: :py:class:`~gameobject.GameObject`
         Character with this behavior
+    streams: :py:class:`~utils.random_streams.RandomStreams`, optional
+        Streams from which this behavior gets its own random stream,
+        defaults to :py:data:`~utils.random_streams.default_streams`
     """
     
-    def __init__(self, character):
+    def __init__(self, character, streams = None):
         self.character = character
+        self.random = (streams if streams is not None else default_streams).stream()
         self.counter = 0
-        self.max_timer = random.randint(7, 13)
+        self.max_timer = self.random.randint(7, 13)
         
     def get_steering(self):
         # Output steering
@@ -254,9 +257,9 @@ class Wander(StaticSteeringBehavior):
         
         # Change orientation randomly after random amount of iterations
         if(self.counter > self.max_timer):
-            steering.rotation = (random.random() - random.random())*self.character.max_rotation
+            steering.rotation = self.random.binomial()*self.character.max_rotation
             self.counter = 0
-            self.max_timer = random.randint(7, 13)
+            self.max_timer = self.random.randint(7, 13)
         self.counter += 1
         
         return steering
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+""" Batched Static Steering Behaviors
+
+This module implements vectorized counterparts of the behaviors in
+:py:mod:`~steering.static`, for agents that live in an
+:py:class:`~world.AgentWorld`. Every function computes the requested
+velocities of many characters in one NumPy pass, and :py:func:`update`
+sets them, so whole crowds of background characters can be moved without
+a single Python call per character.
+
+As their scalar counterparts, :py:func:`seek`, :py:func:`flee` and
+:py:func:`arrive` turn every moving character to face the direction of
+its new velocity.
+
+Characters and targets are given as in :py:mod:`~steering.kinematic_batch`:
+characters as indices into the world, targets as indices of other agents
+or as fixed points.
+
+Example
+-------
+
+.. code-block:: python
+
+    wander = static_batch.Wander(world, crowd)
+
+    # Inside the game loop
+    velocity, rotation = wander.get_steering()
+    static_batch.update(world, velocity, rotation, crowd)
+    world.move(crowd)
+"""
+
+import numpy
+
+from pygame_ai.utils.random_streams import default_streams
+from .kinematic_batch import _characters, _targets, _length, _scale_to, _clip, angles_from_vectors
+
+def _face_velocity(world, characters, velocity):
+    """ Turns every character with non null velocity to face it """
+    moving = (velocity[:, 0] != 0) | (velocity[:, 1] != 0)
+    orientation = world.orientation[characters]
+    orientation[moving] = angles_from_vectors(velocity[moving])
+    world.orientation[characters] = orientation
+
+def _seek_points(world, characters, points, sign):
+    """ Shared implementation of seek and flee towards given points """
+    velocity = sign*(points - world.position[characters])
+    _scale_to(velocity, _length(velocity), world.max_speed[characters])
+    _face_velocity(world, characters, velocity)
+    return velocity
+
+def seek(world, characters, targets):
+    """ Batched :py:class:`~.static.Seek`
+
+    Parameters
+    ----------
+    world: :py:class:`~world.AgentWorld`
+        World the characters live in
+    characters: array_like(int, shape = (N,)) or None
+        Indices of the characters, None for every agent of the world
+    targets: array_like(int, shape = (N,)) or array_like(float, shape = (N, 2))
+        Indices of the agents to seek, or points to seek
+
+    Returns
+    -------
+    numpy.ndarray(float, shape = (N, 2))
+        Velocity of every character
+    """
+    characters = _characters(world, characters)
+    points, _ = _targets(world, targets, len(world.position[characters]))
+    return _seek_points(world, characters, points, 1)
+
+def flee(world, characters, targets):
+    """ Batched :py:class:`~.static.Flee`
+
+    Takes the same parameters as :py:func:`seek`.
+
+    Returns
+    -------
+    numpy.ndarray(float, shape = (N, 2))
+        Velocity of every character
+    """
+    characters = _characters(world, characters)
+    points, _ = _targets(world, targets, len(world.position[characters]))
+    return _seek_points(world, characters, points, -1)
+
+def arrive(world, characters, targets, radius, time_to_arrive = 0.25):
+    """ Batched :py:class:`~.static.Arrive`
+
+    Parameters
+    ----------
+    world: :py:class:`~world.AgentWorld`
+        World the characters live in
+    characters: array_like(int, shape = (N,)) or None
+        Indices of the characters, None for every agent of the world
+    targets: array_like(int, shape = (N,)) or array_like(float, shape = (N, 2))
+        Indices of the agents to arrive at, or points to arrive at
+    radius: float or array_like(float, shape = (N,))
+        Distance from the center of the target at which the character will stop
+    time_to_arrive: float, optional
+        Estimated time, in seconds, to **Arrive** at the target
+
+    Returns
+    -------
+    numpy.ndarray(float, shape = (N, 2))
+        Velocity of every character
+    """
+    characters = _characters(world, characters)
+    position = world.position[characters]
+    target_position, _ = _targets(world, targets, len(position))
+
+    velocity = target_position - position
+    arrived = _length(velocity) < radius
+
+    # Clip to get there in time_to_arrive, as Vector2 does divisions
+    velocity *= 1/time_to_arrive
+    _clip(velocity, world.max_speed[characters])
+
+    velocity[arrived] = 0
+    _face_velocity(world, characters, velocity)
+    return velocity
+
+def update(world, velocity, rotation, characters = None):
+    """ Batched :py:meth:`.static.SteeringOutput.update`
+
+    Sets the velocity and rotation of many characters at once, velocities
+    are clipped to each character's max_speed.
+
+    Parameters
+    ----------
+    world: :py:class:`~world.AgentWorld`
+        World the characters live in
+    velocity: array_like(float, shape = (N, 2))
+        Velocity requested for every character
+    rotation: float or array_like(float, shape = (N,))
+        Rotation requested for every character
+    characters: array_like(int, shape = (N,)), optional
+        Indices of the characters, defaults to every agent of the world
+    """
+    characters = _characters(world, characters)
+    velocity = numpy.array(velocity, dtype = float)
+    world.velocity[characters] = _clip(velocity, world.max_speed[characters])
+    world.rotation[characters] = rotation
+
+
+class Wander(object):
+    """ Batched :py:class:`~.static.Wander`
+
+    Holds the wander timers of many characters, every character keeps
+    moving at full speed in the direction it is facing and changes its
+    rotation randomly after a random number of calls. Every character
+    gets its own random stream, and the random numbers of all the
+    characters that change rotation in a call are drawn at once.
+
+    Parameters
+    ----------
+    world: :py:class:`~world.AgentWorld`
+        World the characters live in
+    characters: array_like(int, shape = (N,)), optional
+        Indices of the characters, defaults to every agent currently in the world
+    streams: :py:class:`~utils.random_streams.RandomStreams`, optional
+        Streams from which every character gets its own random stream,
+        defaults to :py:data:`~utils.random_streams.default_streams`
+
+    Attributes
+    ----------
+    counter: numpy.ndarray(int, shape = (N,))
+        Calls since every character last changed its rotation
+    max_timer: numpy.ndarray(int, shape = (N,))
+        Calls after which every character will change its rotation
+    """
+
+    def __init__(self, world, characters = None, streams = None):
+        if characters is None:
+            characters = numpy.arange(world.count)
+        if streams is None:
+            streams = default_streams
+        self.world = world
+        self.characters = numpy.asarray(characters, dtype = int)
+        self.streams = streams
+        self.stream_ids = streams.new_streams(len(self.characters))
+        self.counter = numpy.zeros(len(self.characters), dtype = int)
+        self.max_timer = streams.integers(self.stream_ids, 7, 14)
+
+    def __repr__(self):
+        return 'Wander({} characters)'.format(len(self.characters))
+
+    def get_steering(self):
+        """ Returns the velocity and rotation requested by every character
+
+        Returns
+        -------
+        tuple(numpy.ndarray (N, 2), numpy.ndarray (N,))
+        """
+        world = self.world
+        characters = self.characters
+        radians = numpy.radians(world.orientation[characters])
+        max_speed = world.max_speed[characters]
+        velocity = numpy.empty((len(characters), 2))
+        velocity[:, 0] = numpy.cos(radians) * max_speed
+        velocity[:, 1] = -numpy.sin(radians) * max_speed
+
+        # Change orientation randomly after random amount of iterations
+        rotation = numpy.zeros(len(characters))
+        change = numpy.nonzero(self.counter > self.max_timer)[0]
+        if len(change):
+            stream_ids = self.stream_ids[change]
+            rotation[change] = self.streams.binomial(stream_ids) * world.max_rotation[characters[change]]
+            self.counter[change] = 0
+            self.max_timer[change] = self.streams.integers(stream_ids, 7, 14)
+        self.counter += 1
+
+        return velocity, rotation
@@ -0,0 +1,44 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import gc
+from unittest import TestCase
+
+from pygame_ai.gameobject import GameObject
+from pygame_ai.steering import kinematic
+from pygame_ai.steering.cache import SteeringCache
+
+class TestSteeringCache(TestCase):
+    def setUp(self):
+        self.cache = SteeringCache()
+        self.character = GameObject(pos = (0, 0))
+        self.target = GameObject(pos = (50, 10))
+
+    def test_once_per_tick(self):
+        seek = self.cache.wrap(kinematic.Seek(self.character, self.target))
+        seek.get_steering()
+        seek.get_steering()
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.cache.advance()
+        seek.get_steering()
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_shared_face_align(self):
+        first = kinematic.Face(self.character, self.target, cache = self.cache)
+        second = kinematic.Face(self.character, self.target, cache = self.cache)
+        self.assertIs(first.align, second.align)
+        expected = kinematic.Face(self.character, self.target).get_steering().angular
+        self.assertAlmostEqual(first.get_steering().angular, expected)
+        self.assertAlmostEqual(second.get_steering().angular, expected)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_discarded_behaviors_are_dropped(self):
+        seek = self.cache.wrap(kinematic.Seek(self.character, self.target))
+        face = kinematic.Face(self.character, self.target, cache = self.cache)
+        seek.get_steering()
+        face.get_steering()
+        del seek, face
+        gc.collect()
+        self.assertEqual(len(self.cache.entries), 0)
+        self.assertEqual(len(self.cache.wrappers), 0)
+        self.assertEqual(len(self.cache.shared_behaviors), 0)
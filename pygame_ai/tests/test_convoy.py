@@ -0,0 +1,84 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from unittest import TestCase
+
+import numpy
+
+from pygame_ai.world import AgentWorld
+from pygame_ai.steering.convoy import Convoy
+from pygame_ai.steering.path import PolylinePath
+
+class TestConvoy(TestCase):
+    def setUp(self):
+        self.world = AgentWorld()
+        for x in (100, 200, 300):
+            self.world.add(pos = (x, 0), max_speed = 10, max_accel = 4)
+        self.road = PolylinePath([(0, 0), (1000, 0)])
+
+    def test_default_progress_is_nearest(self):
+        self.world.position[1] = (200, 50)
+        convoy = Convoy(self.world, self.road)
+        numpy.testing.assert_allclose(convoy.progress, [100, 200, 300])
+        self.assertEqual(len(convoy), 3)
+
+    def test_lanes(self):
+        convoy = Convoy(self.world, self.road, lane_offset = [-20, 0, 20])
+        points = convoy.lane_points(numpy.array([50.0, 50.0, 50.0]))
+        # Positive offsets are to the right of the direction of travel,
+        # which is down the screen when heading along +x
+        numpy.testing.assert_allclose(points, [[50, -20], [50, 0], [50, 20]])
+
+        # Heading the other way flips the sides
+        back = Convoy(self.world, PolylinePath([(1000, 0), (0, 0)]), lane_offset = [-20, 0, 20])
+        numpy.testing.assert_allclose(back.lane_points(numpy.array([50.0] * 3)), [[950, 20], [950, 0], [950, -20]])
+
+    def test_seeks_ahead_in_lane(self):
+        convoy = Convoy(self.world, self.road, lane_offset = 20, path_offset = 30)
+        linear = convoy.get_steering()
+        numpy.testing.assert_allclose(convoy.targets, [[130, 20], [230, 20], [330, 20]])
+        expected = numpy.array([30, 20]) / numpy.hypot(30, 20) * 4
+        numpy.testing.assert_allclose(linear, [expected] * 3)
+
+    def test_progress_predicts_and_never_goes_back(self):
+        self.world.velocity[0] = (50, 0)
+        self.world.velocity[1] = (-50, 0)
+        convoy = Convoy(self.world, self.road, predict_time = 0.5)
+        convoy.get_steering()
+        numpy.testing.assert_allclose(convoy.progress, [125, 200, 300])
+
+    def test_finished_on_open_path(self):
+        self.world.position[1] = (995, 0)
+        self.world.position[2] = (1000, 0)
+        self.world.velocity[1] = (50, 0)
+        convoy = Convoy(self.world, self.road, progress = [100, 995, 1000])
+        numpy.testing.assert_array_equal(convoy.finished, [False, False, True])
+        linear = convoy.get_steering()
+        # Progress is clamped to the end of the path
+        numpy.testing.assert_allclose(convoy.progress, [100, 1000, 1000])
+        numpy.testing.assert_array_equal(convoy.finished, [False, True, True])
+        self.assertGreater(abs(linear[0]).sum(), 0)
+        numpy.testing.assert_array_equal(linear[1:], 0)
+
+    def test_cyclic_wrap(self):
+        square = PolylinePath([(0, 0), (100, 0), (100, 100), (0, 100)], cyclic = True)
+        self.assertEqual(square.length, 400)
+        world = AgentWorld()
+        world.add(pos = (0, 10), max_speed = 10, max_accel = 4)
+        world.velocity[0] = (0, -60)
+        convoy = Convoy(world, square, progress = [390], predict_time = 0.5)
+        linear = convoy.get_steering()
+        # 390 + 30 wraps past the start of the path
+        numpy.testing.assert_allclose(convoy.progress, [20])
+        numpy.testing.assert_allclose(convoy.targets, [[50, 0]])
+        numpy.testing.assert_array_equal(convoy.finished, [False])
+        self.assertGreater(abs(linear).sum(), 0)
+
+    def test_members_reach_the_end(self):
+        convoy = Convoy(self.world, self.road, lane_offset = [-10, 0, 10])
+        for _ in range(300):
+            linear = convoy.get_steering()
+            self.world.integrate(linear, numpy.zeros(3), 1)
+            self.world.move()
+        self.assertTrue(convoy.finished.all())
+        numpy.testing.assert_allclose(self.world.position[:3, 1], [-10, 0, 10], atol = 5)
@@ -0,0 +1,71 @@
+import os
+import types
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from unittest import TestCase
+
+import pygame
+
+from pygame_ai.gameobject import GameObject, CompactGameObject, TargetPoint
+from pygame_ai.steering import kinematic
+
+class TestCompactGameObject(TestCase):
+    def test_slots(self):
+        for name in ('_position', '_rect', 'velocity', 'orientation'):
+            self.assertIsInstance(CompactGameObject.__dict__[name], types.MemberDescriptorType)
+
+    def test_position_is_always_the_same_vector(self):
+        obj = CompactGameObject(pos = (10, 20))
+        position = obj.position
+        obj.velocity = pygame.Vector2(0.5, 0.25)
+        obj.move()
+        self.assertIs(obj.position, position)
+        self.assertEqual(position, pygame.Vector2(10.5, 20.25))
+        obj.position = (1, 2)
+        self.assertIs(obj.position, position)
+        self.assertEqual(position, pygame.Vector2(1, 2))
+
+    def test_assigning_copies(self):
+        other = pygame.Vector2(5, 5)
+        obj = CompactGameObject()
+        obj.position = other
+        other.x = 100
+        self.assertEqual(obj.position, pygame.Vector2(5, 5))
+
+    def test_sub_pixel_movement(self):
+        obj = CompactGameObject(pos = (0, 0))
+        obj.velocity = pygame.Vector2(0.25, 0)
+        for _ in range(12):
+            obj.move()
+        self.assertAlmostEqual(obj.position.x, 3)
+        self.assertEqual(obj.rect.center, (3, 0))
+
+    def test_rect(self):
+        obj = CompactGameObject(pygame.Surface((10, 10)), pos = (50, 60))
+        self.assertEqual(obj.rect.center, (50, 60))
+        obj.position = (70, 80)
+        self.assertEqual(obj.rect.center, (70, 80))
+        obj.rect = pygame.Rect(0, 0, 10, 10)
+        self.assertEqual(obj.position, pygame.Vector2(5, 5))
+
+    def test_behaves_like_game_object(self):
+        target = GameObject(pos = (100, 40))
+        compact = CompactGameObject(pos = (0, 0))
+        plain = GameObject(pos = (0, 0))
+        self.assertEqual(kinematic.Arrive(compact, target, 5, 50).get_steering().linear,
+                         kinematic.Arrive(plain, target, 5, 50).get_steering().linear)
+
+    def test_pursue_does_not_move_target(self):
+        target = CompactGameObject(pos = (100, 0))
+        target.velocity = pygame.Vector2(5, 0)
+        kinematic.Pursue(GameObject(pos = (0, 0)), target).get_steering()
+        self.assertEqual(target.position, pygame.Vector2(100, 0))
+
+class TestTargetPoint(TestCase):
+    def test_assigning_copies(self):
+        other = pygame.Vector2(5, 5)
+        point = TargetPoint()
+        point.position = other
+        other.x = 100
+        self.assertEqual(point.position, pygame.Vector2(5, 5))
+        self.assertEqual(point.rect.topleft, (5, 5))
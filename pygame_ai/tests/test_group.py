@@ -0,0 +1,83 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from unittest import TestCase
+
+import pygame
+
+from pygame_ai.gameobject import GameObject, CompactGameObject
+from pygame_ai.group import AIGroup
+from pygame_ai.steering import kinematic
+from pygame_ai.world import AgentWorld
+
+class TestAIGroup(TestCase):
+    def setUp(self):
+        self.target = GameObject(pos = (300, 0))
+        self.world = AgentWorld()
+
+    def make_group(self, agents):
+        group = AIGroup()
+        for agent in agents:
+            group.add_agent(agent, kinematic.Seek(agent, self.target))
+        return group
+
+    def test_matches_scalar_loop(self):
+        views = [self.world.add(pos = (i*10, 50)) for i in range(3)]
+        # Float positions, like the world's
+        objects = [CompactGameObject(pos = (i*10, 50)) for i in range(3)]
+        group = self.make_group(views)
+        behaviors = [kinematic.Seek(obj, self.target) for obj in objects]
+        for _ in range(5):
+            group.update(0.5)
+            for obj, behavior in zip(objects, behaviors):
+                behavior.get_steering().update(obj, 0.5)
+                obj.move()
+        for view, obj in zip(views, objects):
+            self.assertAlmostEqual(view.position.x, obj.position.x)
+            self.assertAlmostEqual(view.position.y, obj.position.y)
+
+    def test_world_grows(self):
+        group = self.make_group([self.world.add(pos = (i*10, 0)) for i in range(3)])
+        group.update(0.5)
+        new = self.world.add(pos = (0, 100))
+        group.update(0.5)
+        self.assertEqual(new.position, pygame.Vector2(0, 100))
+        group.add_agent(new, kinematic.Seek(new, self.target))
+        group.update(0.5)
+        self.assertNotEqual(new.position, pygame.Vector2(0, 100))
+
+    def test_removed_agent_stays(self):
+        views = [self.world.add(pos = (i*10, 0)) for i in range(3)]
+        group = self.make_group(views)
+        group.remove(views[0])
+        group.update(0.5)
+        self.assertEqual(views[0].position, pygame.Vector2(0, 0))
+        self.assertNotEqual(views[1].position, pygame.Vector2(10, 0))
+
+    def test_tick_advanced_once_per_world(self):
+        group = self.make_group([self.world.add() for _ in range(3)])
+        tick = self.world.tick_id
+        group.update(0.5)
+        self.assertEqual(self.world.tick_id, tick + 1)
+
+        # Groups sharing a world don't end its tick, the game loop does
+        other = self.make_group([self.world.add() for _ in range(2)])
+        group.update(0.5)
+        other.update(0.5)
+        self.assertEqual(self.world.tick_id, tick + 1)
+        self.world.advance()
+        self.assertEqual(self.world.tick_id, tick + 2)
+
+    def test_mixed_agents(self):
+        view = self.world.add(pos = (0, 0))
+        obj = GameObject(pos = (0, 0))
+        group = self.make_group([view, obj])
+        for _ in range(3):
+            group.update(0.5)
+        self.assertEqual(view.rect.center, obj.rect.center)
+        self.assertNotEqual(obj.rect.center, (0, 0))
+
+    def test_dirty_rects(self):
+        group = self.make_group([GameObject(pos = (0, 0)), GameObject(pos = (300, 0))])
+        dirty = group.update(1)
+        self.assertEqual(len(dirty), 1)
@@ -0,0 +1,84 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from unittest import TestCase
+
+import pygame
+
+from pygame_ai.gameobject import GameObject
+from pygame_ai.utils.image_cache import SurfaceCache
+
+class TestSurfaceCache(TestCase):
+    def setUp(self):
+        self.surface = pygame.Surface((20, 10))
+        self.cache = SurfaceCache(max_size = 3, angle_step = 10)
+
+    def test_quantize(self):
+        self.assertEqual(self.cache.quantize(0), 0)
+        self.assertEqual(self.cache.quantize(14), 10)
+        self.assertEqual(self.cache.quantize(16), 20)
+        self.assertEqual(self.cache.quantize(-10), 350)
+        self.assertEqual(self.cache.quantize(358), 0)
+        self.assertEqual(self.cache.quantize(725), 0)
+
+    def test_hits_share_surface(self):
+        first = self.cache.rotated(self.surface, 90)
+        self.assertEqual(first.get_size(), (10, 20))
+        # Same step, same surface object
+        self.assertIs(self.cache.rotated(self.surface, 92), first)
+        self.assertIs(self.cache.rotated(self.surface, 450), first)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+        self.assertEqual(len(self.cache), 1)
+
+    def test_evicts_least_recently_used(self):
+        a = self.cache.rotated(self.surface, 0)
+        self.cache.rotated(self.surface, 10)
+        self.cache.rotated(self.surface, 20)
+        # Touch 0 so that 10 becomes the oldest
+        self.assertIs(self.cache.rotated(self.surface, 0), a)
+        self.cache.rotated(self.surface, 30)
+        self.assertEqual(len(self.cache), 3)
+        keys = [angle for _, angle in self.cache.entries]
+        self.assertEqual(keys, [20, 0, 30])
+
+        misses = self.cache.misses
+        self.cache.rotated(self.surface, 10)
+        self.assertEqual(self.cache.misses, misses + 1)
+        self.assertIs(self.cache.rotated(self.surface, 0), a)
+
+    def test_surfaces_kept_apart(self):
+        other = pygame.Surface((20, 10))
+        self.assertIsNot(self.cache.rotated(self.surface, 40), self.cache.rotated(other, 40))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_stale_id_is_not_reused(self):
+        # An entry whose surface is not the one asked for is a miss
+        rotated = self.cache.rotated(self.surface, 0)
+        other = pygame.Surface((4, 4))
+        self.cache.entries[(id(other), 0)] = (self.surface, rotated)
+        self.assertEqual(self.cache.rotated(other, 0).get_size(), (4, 4))
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_clear(self):
+        self.cache.rotated(self.surface, 0)
+        self.cache.rotated(self.surface, 0)
+        self.cache.clear()
+        self.assertEqual((len(self.cache), self.cache.hits, self.cache.misses), (0, 0, 0))
+
+class TestRotateImage(TestCase):
+    def test_objects_share_rotations(self):
+        cache = SurfaceCache()
+        image = pygame.Surface((30, 10))
+        objects = [GameObject(image, pos = (100, 100), copy_image = False) for _ in range(4)]
+        for obj in objects:
+            self.assertIs(obj.image, image)
+            obj.orientation = 90
+            obj.rotate_image(cache)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+        self.assertTrue(all(obj.image is objects[0].image for obj in objects))
+        self.assertEqual(objects[0].rect.size, (10, 30))
+        self.assertEqual(objects[0].rect.center, (100, 100))
+
+    def test_copy_image(self):
+        image = pygame.Surface((30, 10))
+        self.assertIsNot(GameObject(image).image, image)
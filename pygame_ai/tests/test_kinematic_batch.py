@@ -0,0 +1,81 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import random
+from unittest import TestCase
+
+import numpy
+
+from pygame_ai.world import AgentWorld
+from pygame_ai.gameobject import TargetPoint
+from pygame_ai.steering import kinematic, kinematic_batch
+
+class TestBatchMatchesScalar(TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.world = AgentWorld()
+        self.views = []
+        for _ in range(40):
+            view = self.world.add(pos = (rng.uniform(0, 800), rng.uniform(0, 600)), max_speed = 8, max_accel = 3)
+            view.velocity = (rng.uniform(-5, 5), rng.uniform(-5, 5))
+            view.orientation = rng.uniform(-180, 180)
+            view.rotation = rng.uniform(-5, 5)
+            self.views.append(view)
+        self.characters = numpy.arange(0, 40, 2)
+        self.targets = self.characters + 1
+
+    def assertLinearEqual(self, batch, factory):
+        for row, i, j in zip(batch, self.characters, self.targets):
+            linear = factory(self.views[i], self.views[j]).get_steering().linear
+            self.assertAlmostEqual(row[0], linear.x, places = 6)
+            self.assertAlmostEqual(row[1], linear.y, places = 6)
+
+    def assertAngularEqual(self, batch, factory):
+        for value, i, j in zip(batch, self.characters, self.targets):
+            angular = factory(self.views[i], self.views[j]).get_steering().angular
+            self.assertAlmostEqual(value, angular, places = 6)
+
+    def test_seek_and_flee(self):
+        world, characters, targets = self.world, self.characters, self.targets
+        self.assertLinearEqual(kinematic_batch.seek(world, characters, targets), kinematic.Seek)
+        self.assertLinearEqual(kinematic_batch.flee(world, characters, targets), kinematic.Flee)
+
+    def test_arrive(self):
+        batch = kinematic_batch.arrive(self.world, self.characters, self.targets, 50, 300)
+        self.assertLinearEqual(batch, lambda c, t: kinematic.Arrive(c, t, 50, 300))
+
+    def test_pursue_and_evade(self):
+        world, characters, targets = self.world, self.characters, self.targets
+        self.assertLinearEqual(kinematic_batch.pursue(world, characters, targets, 2), lambda c, t: kinematic.Pursue(c, t, 2))
+        self.assertLinearEqual(kinematic_batch.evade(world, characters, targets, 2), lambda c, t: kinematic.Evade(c, t, 2))
+
+    def test_align_and_face(self):
+        world, characters, targets = self.world, self.characters, self.targets
+        self.assertAngularEqual(kinematic_batch.align(world, characters, targets), kinematic.Align)
+        self.assertAngularEqual(kinematic_batch.face(world, characters, targets), kinematic.Face)
+
+    def test_point_targets(self):
+        points = numpy.array([[100, 200]] * len(self.characters))
+        batch = kinematic_batch.seek(self.world, self.characters, points)
+        for row, i in zip(batch, self.characters):
+            linear = kinematic.Seek(self.views[i], TargetPoint((100, 200))).get_steering().linear
+            self.assertAlmostEqual(row[0], linear.x, places = 6)
+            self.assertAlmostEqual(row[1], linear.y, places = 6)
+
+    def test_integer_point_targets(self):
+        for points in (numpy.array([[100, 5]] * len(self.characters)), numpy.array([[1, 0]] * len(self.characters))):
+            batch = kinematic_batch.face(self.world, self.characters, points)
+            for value, i in zip(batch, self.characters):
+                angular = kinematic.Face(self.views[i], TargetPoint(points[0])).get_steering().angular
+                self.assertAlmostEqual(value, angular, places = 6)
+
+    def test_face_still_takes_target_orientation(self):
+        self.world.position[self.targets] = self.world.position[self.characters]
+        self.assertAngularEqual(kinematic_batch.face(self.world, self.characters, self.targets), kinematic.Face)
+
+    def test_integer_orientations(self):
+        orientations = numpy.arange(len(self.characters)) * 15
+        batch = kinematic_batch.align(self.world, self.characters, orientations = orientations)
+        for value, i, orientation in zip(batch, self.characters, orientations):
+            angular = kinematic.Align(self.views[i], TargetPoint(orientation = orientation)).get_steering().angular
+            self.assertAlmostEqual(value, angular, places = 6)
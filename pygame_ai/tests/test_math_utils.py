@@ -0,0 +1,98 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import random
+from unittest import TestCase
+
+import numpy
+import pygame
+
+from pygame_ai.gameobject import GameObject
+from pygame_ai.steering import kinematic
+from pygame_ai.utils import math_utils
+from pygame_ai.utils.spatial import ObstacleGrid
+
+class TestRaysIntersect(TestCase):
+    def setUp(self):
+        rng = random.Random(11)
+        point = lambda: (rng.randint(0, 400), rng.randint(0, 400))
+        self.rays = [[point(), point()] for _ in range(60)]
+        self.segments = [[point(), point()] for _ in range(40)]
+
+    def test_matches_lines_intersect(self):
+        points, indices, distances = math_utils.rays_intersect(self.rays, self.segments)
+        hits = 0
+        for ray, point, index, distance in zip(self.rays, points, indices, distances):
+            start = numpy.array(ray[0], dtype = float)
+            scalar = [math_utils.lines_intersect(ray, segment) for segment in self.segments]
+            found = [(numpy.hypot(*(numpy.array(p) - start)), i) for i, p in enumerate(scalar) if p is not None]
+            if not found:
+                self.assertEqual(index, -1)
+                self.assertTrue(numpy.isinf(distance))
+                continue
+            hits += 1
+            # lines_intersect rounds to integers, the closest segment can
+            # only differ when two hits are that close
+            closest = min(found)[0]
+            self.assertLessEqual(abs(closest - distance), 1.5)
+            self.assertLessEqual(numpy.hypot(*(point - numpy.array(scalar[index]))), 1.5)
+        self.assertGreater(hits, 0)
+
+    def test_candidates_match_all_pairs(self):
+        n_rays, n_segments = len(self.rays), len(self.segments)
+        full = math_utils.rays_intersect(self.rays, self.segments)
+        candidates = (numpy.repeat(numpy.arange(n_rays), n_segments), numpy.tile(numpy.arange(n_segments), n_rays))
+        pairs = math_utils.rays_intersect(self.rays, self.segments, candidates = candidates)
+        numpy.testing.assert_array_equal(full[1], pairs[1])
+        numpy.testing.assert_allclose(full[2], pairs[2])
+
+    def test_chunks(self):
+        full = math_utils.rays_intersect(self.rays, self.segments)
+        chunked = math_utils.rays_intersect(self.rays, self.segments, chunk_size = 50)
+        numpy.testing.assert_array_equal(full[1], chunked[1])
+        numpy.testing.assert_allclose(full[2], chunked[2])
+
+class TestCastObstacleRays(TestCase):
+    def setUp(self):
+        rng = random.Random(23)
+        self.walls = [
+            GameObject(pygame.Surface((rng.randint(5, 60), rng.randint(5, 60))), pos = (rng.randint(0, 600), rng.randint(0, 600)))
+            for _ in range(25)
+        ]
+        self.characters = []
+        for _ in range(50):
+            character = GameObject(pygame.Surface((10, 10)), pos = (rng.randint(0, 600), rng.randint(0, 600)))
+            character.velocity = pygame.Vector2(rng.uniform(-10, 10), rng.uniform(-10, 10))
+            self.characters.append(character)
+        # Far from every wall, its ray crosses no occupied cell
+        lonely = GameObject(pygame.Surface((10, 10)), pos = (5000, 5000))
+        lonely.velocity = pygame.Vector2(1, 0)
+        self.characters.append(lonely)
+
+    def check(self, obstacles):
+        behaviors = [kinematic.ObstacleAvoidance(character, obstacles, lookahead = 120) for character in self.characters]
+        kinematic.cast_obstacle_rays(behaviors)
+        hits = 0
+        for behavior in behaviors:
+            _, _, point, line = behavior.precast
+            expected, _ = behavior.cast_ray()
+            if expected is None:
+                self.assertIsNone(point)
+                continue
+            hits += 1
+            # cast_ray rounds to integers
+            self.assertLessEqual((point - expected).length(), 1.5)
+        self.assertGreater(hits, 0)
+        self.assertIsNone(behaviors[-1].precast[2])
+
+    def test_list(self):
+        self.check(self.walls)
+
+    def test_grid(self):
+        self.check(ObstacleGrid(50, self.walls))
+
+    def test_grid_without_candidates(self):
+        grid = ObstacleGrid(50, self.walls)
+        behavior = kinematic.ObstacleAvoidance(self.characters[-1], grid, lookahead = 120)
+        kinematic.cast_obstacle_rays([behavior])
+        self.assertEqual(behavior.precast[2:], (None, None))
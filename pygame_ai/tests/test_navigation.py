@@ -0,0 +1,136 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import heapq
+import math
+import random
+from unittest import TestCase
+
+import pygame
+
+from pygame_ai.navigation import OccupancyGrid, Navigator
+
+def shortest_distance(grid, start, goal):
+    """ Dijkstra over the same moves A* allows, returns the length in cells """
+    columns, rows, blocked = grid.columns, grid.rows, grid.blocked
+    distances = {start: 0}
+    heap = [(0, start)]
+    while heap:
+        distance, cell = heapq.heappop(heap)
+        if cell == goal:
+            return distance
+        if distance > distances[cell]:
+            continue
+        row, col = divmod(cell, columns)
+        for drow in (-1, 0, 1):
+            for dcol in (-1, 0, 1):
+                r, c = row + drow, col + dcol
+                if (drow, dcol) == (0, 0) or not (0 <= r < rows and 0 <= c < columns):
+                    continue
+                if blocked[r*columns + c]:
+                    continue
+                # No corner cutting
+                if drow and dcol and (blocked[row*columns + c] or blocked[r*columns + col]):
+                    continue
+                new = distance + (math.sqrt(2) if drow and dcol else 1)
+                if new < distances.get(r*columns + c, float('inf')):
+                    distances[r*columns + c] = new
+                    heapq.heappush(heap, (new, r*columns + c))
+    return None
+
+def route_length(grid, cells):
+    """ Length in cells of a route given by its turning cells """
+    points = [divmod(cell, grid.columns) for cell in cells]
+    return sum(math.hypot(r2 - r1, c2 - c1) for (r1, c1), (r2, c2) in zip(points, points[1:]))
+
+class TestNavigator(TestCase):
+    def setUp(self):
+        rng = random.Random(2)
+        self.rng = rng
+        self.grid = OccupancyGrid((0, 0, 400, 400), 10)
+        for _ in range(30):
+            self.grid.add_obstacle(pygame.Rect(rng.randrange(400), rng.randrange(400), rng.randrange(10, 80), rng.randrange(10, 80)))
+
+    def random_free_cell(self):
+        while True:
+            cell = self.rng.randrange(len(self.grid))
+            if not self.grid.blocked[cell]:
+                return cell
+
+    def test_routes_are_shortest(self):
+        navigator = Navigator(self.grid, cache_size = 0)
+        for _ in range(30):
+            start, goal = self.random_free_cell(), self.random_free_cell()
+            cells = navigator.find_cells(start, goal)
+            expected = shortest_distance(self.grid, start, goal)
+            if expected is None:
+                self.assertIsNone(cells)
+                continue
+            self.assertEqual(cells[0], start)
+            self.assertEqual(cells[-1], goal)
+            self.assertAlmostEqual(route_length(self.grid, cells), expected, places = 6)
+
+    def test_unreachable(self):
+        grid = OccupancyGrid((0, 0, 100, 100), 10, [pygame.Rect(50, 0, 10, 100)])
+        navigator = Navigator(grid)
+        self.assertIsNone(navigator.find_path((5, 5), (95, 95)))
+
+    def test_blocked_start_and_goal_snap(self):
+        grid = OccupancyGrid((0, 0, 100, 100), 10, [pygame.Rect(40, 40, 20, 20)])
+        navigator = Navigator(grid)
+        path = navigator.find_path((45, 45), (95, 95))
+        self.assertIsNotNone(path)
+        for x, y in path.as_list()[1:]:
+            self.assertFalse(grid.is_blocked((x, y)))
+
+    def test_path_avoids_obstacles(self):
+        walls = [pygame.Rect(100, 0, 20, 150), pygame.Rect(200, 50, 20, 150)]
+        grid = OccupancyGrid((0, 0, 300, 200), 10, walls)
+        path = Navigator(grid).find_path((50, 50), (250, 50))
+        points = path.as_list()
+        self.assertEqual(points[0], (50, 50))
+        self.assertEqual(points[-1], (250, 50))
+        for (x1, y1), (x2, y2) in zip(points, points[1:]):
+            for wall in walls:
+                self.assertFalse(wall.clipline((x1, y1), (x2, y2)))
+
+class TestRouteCache(TestCase):
+    def setUp(self):
+        self.grid = OccupancyGrid((0, 0, 200, 200), 10)
+
+    def test_hits_and_misses(self):
+        navigator = Navigator(self.grid)
+        first = navigator.find_cells(0, 399)
+        self.assertIs(navigator.find_cells(0, 399), first)
+        self.assertEqual((navigator.hits, navigator.misses), (1, 1))
+
+    def test_least_recently_used_is_evicted(self):
+        navigator = Navigator(self.grid, cache_size = 2)
+        navigator.find_cells(0, 10)
+        navigator.find_cells(0, 20)
+        navigator.find_cells(0, 10)
+        navigator.find_cells(0, 30)
+        self.assertEqual(len(navigator.cache), 2)
+        misses = navigator.misses
+        navigator.find_cells(0, 10)
+        self.assertEqual(navigator.misses, misses)
+        navigator.find_cells(0, 20)
+        self.assertEqual(navigator.misses, misses + 1)
+
+    def test_grid_changes_invalidate(self):
+        navigator = Navigator(self.grid)
+        navigator.find_cells(0, 19)
+        self.grid.set_blocked((50, 0, 10, 10))
+        # The route along the first row now has to go around the blocked cell
+        self.assertGreater(len(navigator.find_cells(0, 19)), 2)
+        self.assertEqual(navigator.misses, 2)
+
+    def test_disabled_cache(self):
+        navigator = Navigator(self.grid, cache_size = 0)
+        navigator.find_cells(0, 399)
+        navigator.find_cells(0, 399)
+        self.assertEqual((navigator.hits, navigator.misses, len(navigator.cache)), (0, 2, 0))
+
+    def test_new_path_every_call(self):
+        navigator = Navigator(self.grid)
+        self.assertIsNot(navigator.find_path((5, 5), (195, 195)), navigator.find_path((5, 5), (195, 195)))
@@ -0,0 +1,164 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import math
+import random
+from unittest import TestCase
+
+from pygame_ai.steering.path import Path, PathCircumference, PathParabola, PolylinePath, CatmullRomPath
+
+def brute_force_distance(points, point):
+    """ Distance from point to the closest segment of a polyline """
+    best = float('inf')
+    for (x1, y1), (x2, y2) in zip(points, points[1:]):
+        dx, dy = x2 - x1, y2 - y1
+        length_sq = dx*dx + dy*dy
+        t = 0 if length_sq == 0 else ((point[0] - x1)*dx + (point[1] - y1)*dy) / length_sq
+        t = min(max(t, 0), 1)
+        best = min(best, math.hypot(x1 + dx*t - point[0], y1 + dy*t - point[1]))
+    return best
+
+class TestPolylinePath(TestCase):
+    def setUp(self):
+        rng = random.Random(5)
+        self.rng = rng
+        self.points = [(rng.uniform(0, 1000), rng.uniform(0, 1000)) for _ in range(300)]
+        self.path = PolylinePath(self.points, cell_size = 50)
+
+    def test_nearest_matches_brute_force(self):
+        queries = [(self.rng.uniform(-200, 1200), self.rng.uniform(-200, 1200)) for _ in range(200)]
+        # Far outside the indexed area too
+        queries += [(5000, 5000), (-3000, 400)]
+        for query in queries:
+            s, closest, distance = self.path.nearest(query)
+            self.assertAlmostEqual(distance, brute_force_distance(self.points, query), places = 6)
+            self.assertAlmostEqual(math.hypot(closest[0] - query[0], closest[1] - query[1]), distance, places = 6)
+            expected = self.path.point_at_distance(s)
+            self.assertAlmostEqual(expected[0], closest[0], places = 6)
+            self.assertAlmostEqual(expected[1], closest[1], places = 6)
+
+    def test_unindexed_path(self):
+        path = PolylinePath(self.points[:10])
+        self.assertIsNone(path.cells)
+        s, closest, distance = path.nearest((500, 500))
+        self.assertAlmostEqual(distance, brute_force_distance(self.points[:10], (500, 500)), places = 6)
+
+    def test_arc_length(self):
+        path = PolylinePath([(0, 0), (30, 0), (30, 40)])
+        self.assertEqual(path.length, 70)
+        self.assertEqual(tuple(path.point_at_distance(15)), (15, 0))
+        self.assertEqual(tuple(path.point_at_distance(50)), (30, 20))
+
+    def test_cyclic(self):
+        path = PolylinePath([(0, 0), (10, 0), (10, 10), (0, 10)], cyclic = True)
+        self.assertEqual(path.length, 40)
+        s, closest, distance = path.nearest((-1, 5))
+        self.assertAlmostEqual(s, 35)
+
+class TestCatmullRomPath(TestCase):
+    def test_passes_through_controls(self):
+        controls = [(0, 0), (100, 50), (200, 0), (300, 80)]
+        path = CatmullRomPath(controls, resolution = 8)
+        for control in controls:
+            self.assertAlmostEqual(path.nearest(control)[2], 0, places = 6)
+
+def _count_calls(path):
+    """ Wraps the path function of path, returns the list of x it is called with """
+    calls = []
+    path_func = path.path_func
+    def counted(self, x):
+        calls.append(x)
+        return path_func(self, x)
+    path.path_func = counted
+    return calls
+
+class TestPathCaching(TestCase):
+    def setUp(self):
+        self.center = [100, 200]
+        self.path = PathCircumference(lambda: self.center, 50)
+        self.calls = _count_calls(self.path)
+
+    def test_current_cached_until_x_or_anchor_change(self):
+        point = next(self.path)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.path.current(), point)
+        self.assertEqual(len(self.calls), 1)
+
+        next(self.path)
+        self.assertEqual(len(self.calls), 2)
+
+        self.center[0] += 10
+        moved = self.path.current()
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(self.path.x, 15)
+        self.assertAlmostEqual(moved[0], 110 + 50 * math.cos(math.radians(15)))
+        self.assertAlmostEqual(moved[1], 200 + 50 * math.sin(math.radians(15)))
+
+    def test_no_anchor_is_never_cached(self):
+        values = [1]
+        path = Path(lambda self, x: (x, values[0]), 10)
+        calls = _count_calls(path)
+        next(path)
+        path.current()
+        path.current()
+        self.assertEqual(len(calls), 3)
+        values[0] = 2
+        self.assertEqual(path.current(), (0, 2))
+
+    def test_bake_matches_function(self):
+        expected = self.path.as_list()
+        self.assertIs(self.path.bake(), self.path)
+        del self.calls[:]
+
+        self.assertEqual(len(self.path.table), len(expected))
+        for (x, y), (bx, by) in zip(expected, self.path.as_list()):
+            self.assertAlmostEqual(x, bx)
+            self.assertAlmostEqual(y, by)
+        for _ in range(30):
+            point = next(self.path)
+            x = self.path.x
+            angle = math.radians(x)
+            self.assertAlmostEqual(point[0], 100 + 50 * math.cos(angle))
+            self.assertAlmostEqual(point[1], 200 + 50 * math.sin(angle))
+        self.assertEqual(self.calls, [])
+
+    def test_bake_follows_anchor(self):
+        self.path.bake()
+        del self.calls[:]
+        next(self.path)
+        self.center[:] = [-40, 7]
+        x, y = self.path.current()
+        self.assertAlmostEqual(x, 10)
+        self.assertAlmostEqual(y, 7)
+        self.assertEqual(self.path.as_list()[0], (10.0, 7.0))
+        self.assertEqual(self.calls, [])
+
+    def test_point_off_table_uses_function(self):
+        self.path.bake()
+        del self.calls[:]
+        x, y = self.path.point_at(7)
+        self.assertEqual(self.calls, [7])
+        self.assertAlmostEqual(x, 100 + 50 * math.cos(math.radians(7)))
+        self.assertAlmostEqual(y, 200 + 50 * math.sin(math.radians(7)))
+
+    def test_rebake_invalidates_current(self):
+        # Shape changes are only picked up by baking again
+        next(self.path)
+        self.path.bake()
+        self.path.radius = 10
+        self.assertAlmostEqual(self.path.current()[0], 150)
+        self.path.bake()
+        self.assertAlmostEqual(self.path.current()[0], 110)
+
+    def test_mirrored_bake(self):
+        origin = [0, 0]
+        path = PathParabola(lambda: origin).bake()
+        forward = path.as_list()
+        self.assertEqual(len(forward), len(list(path.domain())))
+        origin[1] = 5
+        # One step past the end turns it around
+        for _ in range(len(forward) + 1):
+            next(path)
+        self.assertLess(path.increment, 0)
+        backward = path.as_list()
+        self.assertEqual(backward, [(x, y + 5) for x, y in reversed(forward)])
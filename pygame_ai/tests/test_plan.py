@@ -0,0 +1,268 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from unittest import TestCase
+
+import numpy
+import pygame
+
+from pygame_ai.world import AgentWorld
+from pygame_ai.gameobject import DummyGameObject, TargetPoint
+from pygame_ai.steering import kinematic, plan
+from pygame_ai.steering.blended import BlendedSteering, BehaviorAndWeight
+from pygame_ai.steering.priority import PrioritySteering
+
+class Constant(kinematic.KinematicSteeringBehavior):
+    """ Leaf that always requests the same steering and counts its evaluations """
+
+    def __init__(self, linear = (0, 0), angular = 0):
+        self.steering = kinematic.SteeringOutput(pygame.Vector2(linear), angular)
+        self.evaluations = 0
+
+    def get_steering(self):
+        self.evaluations += 1
+        return self.steering
+
+class Expensive(Constant):
+    pass
+
+def _character(max_accel = 100, max_angular_accel = 100):
+    character = DummyGameObject()
+    character.max_accel = max_accel
+    character.max_angular_accel = max_angular_accel
+    return character
+
+class TestCompilePlan(TestCase):
+    def assertSameSteering(self, a, b):
+        self.assertAlmostEqual(a.linear[0], b.linear[0])
+        self.assertAlmostEqual(a.linear[1], b.linear[1])
+        self.assertAlmostEqual(a.angular, b.angular)
+
+    def test_blend_matches_tree(self):
+        character = _character()
+        tree = BlendedSteering(character, [
+            BehaviorAndWeight(Constant((3, 4), 1), 2),
+            BehaviorAndWeight(Constant((-1, 0), 5), 0.5),
+        ])
+        compiled = plan.compile_plan(tree)
+        self.assertEqual(len(compiled.groups), 1)
+        self.assertSameSteering(compiled.get_steering(), tree.get_steering())
+
+    def test_outer_blend_clips(self):
+        character = _character(max_accel = 5, max_angular_accel = 2)
+        tree = BlendedSteering(character, [BehaviorAndWeight(Constant((30, 40), 10), 1)])
+        steering = plan.compile_plan(tree).get_steering()
+        self.assertAlmostEqual(steering.linear.length(), 5)
+        self.assertAlmostEqual(steering.angular, 2)
+
+    def test_nested_blends_multiply_weights(self):
+        character = _character()
+        a, b, c = Constant((1, 0)), Constant((0, 1)), Constant((1, 1), 1)
+        inner = BlendedSteering(character, [BehaviorAndWeight(b, 3), BehaviorAndWeight(c, 0.5)])
+        innermost = BlendedSteering(character, [BehaviorAndWeight(a, 2)])
+        middle = BlendedSteering(character, [BehaviorAndWeight(inner, 2), BehaviorAndWeight(innermost, 5)])
+        tree = BlendedSteering(character, [BehaviorAndWeight(a, 1), BehaviorAndWeight(middle, 0.5)])
+
+        compiled = plan.compile_plan(tree)
+        self.assertEqual(len(compiled.groups), 1)
+        group = compiled.groups[0]
+        # a appears twice, merged into one leaf with 1 + 0.5*5*2
+        self.assertEqual(group.leaves, [a, b, c])
+        self.assertEqual(group.weights, [6, 3, 0.5])
+        self.assertSameSteering(compiled.get_steering(), tree.get_steering())
+
+    def test_nested_blend_loses_its_clip(self):
+        inner_character = _character(max_accel = 1)
+        inner = BlendedSteering(inner_character, [BehaviorAndWeight(Constant((10, 0)), 1)])
+        tree = BlendedSteering(_character(), [BehaviorAndWeight(inner, 1)])
+        self.assertAlmostEqual(tree.get_steering().linear.length(), 1)
+        self.assertAlmostEqual(plan.compile_plan(tree).get_steering().linear.length(), 10)
+
+    def test_shared_leaf_evaluated_once(self):
+        character = _character()
+        shared = Constant((0, 0))
+        tree = PrioritySteering([
+            BlendedSteering(character, [BehaviorAndWeight(shared, 1)]),
+            BlendedSteering(character, [BehaviorAndWeight(shared, 2), BehaviorAndWeight(Constant((5, 0)), 1)]),
+        ])
+        compiled = plan.compile_plan(tree)
+        self.assertEqual(compiled.leaves.count(shared), 1)
+        compiled.get_steering()
+        self.assertEqual(shared.evaluations, 1)
+        compiled.get_steering()
+        self.assertEqual(shared.evaluations, 2)
+
+    def test_priority_matches_tree(self):
+        character = _character()
+        for first in [(0, 0), (0.05, 0), (3, 0)]:
+            tree = PrioritySteering([
+                Constant(first),
+                BlendedSteering(character, [BehaviorAndWeight(Constant((0, 2)), 1)]),
+                Constant((7, 7)),
+            ])
+            self.assertSameSteering(plan.compile_plan(tree).get_steering(), tree.get_steering())
+
+        # Nothing surpasses epsilon, the last group is returned
+        tree = PrioritySteering([Constant((0.01, 0)), Constant((0, 0.02))])
+        self.assertSameSteering(plan.compile_plan(tree).get_steering(), tree.get_steering())
+
+    def test_nested_priority(self):
+        a, b, c, d = Constant(), Constant(), Constant((1, 0)), Constant((2, 0))
+        tree = PrioritySteering([a, PrioritySteering([b, c]), d])
+        compiled = plan.compile_plan(tree)
+        # Same epsilon, spliced into the parent
+        self.assertEqual([group.leaves for group in compiled.groups], [[a], [b], [c], [d]])
+        self.assertSameSteering(compiled.get_steering(), tree.get_steering())
+
+        tree = PrioritySteering([a, PrioritySteering([b, c], epsilon = 5), d])
+        compiled = plan.compile_plan(tree)
+        # Different epsilon, compiled on its own and kept as a leaf
+        self.assertEqual(len(compiled.groups), 3)
+        self.assertIsInstance(compiled.groups[1].leaves[0], plan.SteeringPlan)
+        self.assertSameSteering(compiled.get_steering(), tree.get_steering())
+        # The inner plan falls back to its last group, which the outer epsilon accepts
+        self.assertEqual(compiled.get_steering().linear, pygame.Vector2(1, 0))
+
+    def test_priority_inside_blend(self):
+        character = _character()
+        tree = BlendedSteering(character, [
+            BehaviorAndWeight(PrioritySteering([Constant(), Constant((0, 3))]), 2),
+            BehaviorAndWeight(Constant((1, 0)), 1),
+        ])
+        compiled = plan.compile_plan(tree)
+        self.assertIsInstance(compiled.groups[0].leaves[0], plan.SteeringPlan)
+        self.assertSameSteering(compiled.get_steering(), tree.get_steering())
+
+    def test_reorder(self):
+        costs = {Expensive: 50}
+        expensive, cheap = Expensive((1, 0)), Constant((0, 1))
+        tree = PrioritySteering([expensive, cheap])
+
+        kept = plan.compile_plan(tree, costs = costs)
+        self.assertEqual(kept.get_steering().linear, pygame.Vector2(1, 0))
+
+        reordered = plan.compile_plan(tree, costs = costs, reorder = True)
+        self.assertEqual([group.leaves for group in reordered.groups], [[cheap], [expensive]])
+        self.assertEqual([group.cost for group in reordered.groups], [1, 50])
+        expensive.evaluations = 0
+        self.assertEqual(reordered.get_steering().linear, pygame.Vector2(0, 1))
+        # The cheap group surpassed epsilon, the expensive one is never evaluated
+        self.assertEqual(expensive.evaluations, 0)
+
+    def test_default_costs(self):
+        self.assertEqual(plan.behavior_cost(Constant()), 1)
+        self.assertEqual(plan.behavior_cost(Constant(), {Constant: 4}), 4)
+        self.assertEqual(plan.behavior_cost(Expensive(), {Constant: 4}), 4)
+        self.assertEqual(plan.behavior_cost(kinematic.NullSteering()), 1)
+        compiled = plan.compile_plan(PrioritySteering([Constant(), Expensive()]), costs = {Expensive: 7})
+        self.assertEqual(plan.behavior_cost(compiled), 8)
+
+class TestRun(TestCase):
+    def test_matches_get_steering(self):
+        character = _character()
+        plans = [
+            plan.compile_plan(BlendedSteering(character, [BehaviorAndWeight(Constant((i, -i), i * 0.5), 1)]))
+            for i in range(5)
+        ]
+        linear, angular = plan.run(plans)
+        self.assertEqual(linear.shape, (5, 2))
+        for i, compiled in enumerate(plans):
+            steering = compiled.get_steering()
+            numpy.testing.assert_allclose(linear[i], steering.linear)
+            self.assertAlmostEqual(angular[i], steering.angular)
+
+    def test_reuses_buffers(self):
+        plans = [plan.compile_plan(Constant((1, 2), 3)) for _ in range(3)]
+        linear = numpy.zeros((3, 2))
+        angular = numpy.zeros(3)
+        out_linear, out_angular = plan.run(plans, linear, angular)
+        self.assertIs(out_linear, linear)
+        self.assertIs(out_angular, angular)
+        numpy.testing.assert_array_equal(linear, [[1, 2]] * 3)
+        numpy.testing.assert_array_equal(angular, [3] * 3)
+
+def _not_called():
+    raise AssertionError('batched leaf evaluated on its own')
+
+class TestRunBatched(TestCase):
+    def setUp(self):
+        rng = numpy.random.RandomState(3)
+        self.world = AgentWorld()
+        self.views = []
+        for _ in range(30):
+            view = self.world.add(pos = tuple(rng.uniform(0, 600, 2)), max_speed = 8, max_accel = 3)
+            view.velocity = tuple(rng.uniform(-5, 5, 2))
+            self.views.append(view)
+
+    def trees(self):
+        views = self.views
+        trees = []
+        for i in range(0, 30, 3):
+            character, target, other = views[i], views[i + 1], views[i + 2]
+            trees.append(PrioritySteering([
+                kinematic.Evade(character, other, 0.5),
+                BlendedSteering(character, [
+                    BehaviorAndWeight(kinematic.Seek(character, target), 1),
+                    BehaviorAndWeight(kinematic.Flee(character, other), 0.5),
+                    BehaviorAndWeight(kinematic.Arrive(character, target, 10, 80), 2),
+                    BehaviorAndWeight(kinematic.Pursue(character, target), 0.25),
+                    BehaviorAndWeight(Constant((0, 1), 2), 1),
+                ]),
+            ], epsilon = 2.5))
+        return trees
+
+    def test_matches_scalar(self):
+        trees = self.trees()
+        plans = [plan.compile_plan(tree) for tree in trees]
+        linear, angular = plan.run(plans)
+        for row, tree in enumerate(trees):
+            steering = tree.get_steering()
+            numpy.testing.assert_allclose(linear[row], steering.linear, atol = 1e-9)
+            self.assertAlmostEqual(angular[row], steering.angular)
+
+    def test_batched_leaves_skip_get_steering(self):
+        plans = [plan.compile_plan(tree) for tree in self.trees()]
+        expected = plan.run(plans)[0].copy()
+        batched = 0
+        for compiled in plans:
+            for _, leaf in compiled._batchable:
+                leaf.get_steering = _not_called
+                batched += 1
+        self.assertEqual(batched, 50)
+        for _ in range(2):
+            numpy.testing.assert_allclose(plan.run(plans)[0], expected)
+
+    def test_bare_behaviors(self):
+        views = self.views
+        behaviors = [kinematic.Seek(views[i], views[i + 1]) for i in range(10)]
+        behaviors.append(kinematic.Arrive(views[10], views[11], 10, 80))
+        behaviors.append(Constant((1, 2), 3))
+        scalar = [(behavior.get_steering().linear, behavior.get_steering().angular) for behavior in behaviors[:-1]]
+        for behavior in behaviors[:-1]:
+            behavior.get_steering = _not_called
+        linear, angular = plan.run(behaviors)
+        for row, (expected_linear, expected_angular) in enumerate(scalar):
+            numpy.testing.assert_allclose(linear[row], expected_linear, atol = 1e-9)
+            self.assertEqual(angular[row], expected_angular)
+        numpy.testing.assert_array_equal(linear[-1], [1, 2])
+        self.assertEqual(angular[-1], 3)
+
+    def test_other_targets_fall_back(self):
+        # Targets outside the world are evaluated one by one
+        point = TargetPoint((50, 50))
+        other_world = AgentWorld()
+        stranger = other_world.add(pos = (300, 300))
+        behaviors = [kinematic.Seek(self.views[0], point), kinematic.Seek(self.views[1], stranger)]
+        linear, _ = plan.run([plan.compile_plan(behavior) for behavior in behaviors])
+        for row, behavior in enumerate(behaviors):
+            numpy.testing.assert_allclose(linear[row], behavior.get_steering().linear)
+
+    def test_nested_plans_not_preset(self):
+        # An inner plan that isn't reached keeps evaluating its own leaves
+        character, target = self.views[0], self.views[1]
+        seek = kinematic.Seek(character, target)
+        tree = PrioritySteering([Constant((5, 0)), PrioritySteering([seek], epsilon = 0.5)])
+        compiled = plan.compile_plan(tree)
+        plan.run([compiled])
+        inner = compiled.groups[1].leaves[0]
+        self.assertEqual(inner._stamps, [0])
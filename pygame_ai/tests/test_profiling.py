@@ -0,0 +1,54 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from unittest import TestCase
+
+from pygame_ai import profiling
+from pygame_ai.gameobject import GameObject
+from pygame_ai.steering import kinematic, static, blended
+
+class CountedSeek(kinematic.Seek):
+    def get_steering(self):
+        return super(CountedSeek, self).get_steering()
+
+class TestProfiling(TestCase):
+    def setUp(self):
+        self.character = GameObject(pos = (0, 0))
+        self.target = GameObject(pos = (100, 0))
+        self.profiler = profiling.enable()
+
+    def tearDown(self):
+        profiling.disable()
+
+    def calls(self):
+        profiling.new_frame()
+        return {name: count for name, (count, _) in self.profiler.frame().by_behavior().items()}
+
+    def test_same_class_names_are_kept_apart(self):
+        kinematic.Seek(self.character, self.target).get_steering()
+        static.Seek(self.character, self.target).get_steering()
+        calls = self.calls()
+        self.assertEqual(calls['pygame_ai.steering.kinematic.Seek'], 1)
+        self.assertEqual(calls['pygame_ai.steering.static.Seek'], 1)
+
+    def test_inherited_get_steering(self):
+        flock = blended.Flocking(self.character, [self.character], self.target)
+        flock.get_steering()
+        calls = self.calls()
+        self.assertEqual(calls['pygame_ai.steering.blended.Flocking'], 1)
+        self.assertNotIn('pygame_ai.steering.blended.BlendedSteering', calls)
+
+    def test_super_calls_are_counted_once(self):
+        CountedSeek(self.character, self.target).get_steering()
+        calls = self.calls()
+        self.assertEqual(calls, {__name__ + '.CountedSeek': 1})
+
+    def test_counters_and_disable(self):
+        profiling.count('test.counter', 3)
+        profiling.new_frame()
+        self.assertEqual(self.profiler.frame().counters['test.counter'], 3)
+        profiling.disable()
+        self.assertNotIn('__wrapped__', kinematic.Seek.get_steering.__dict__)
+        kinematic.Seek(self.character, self.target).get_steering()
+        profiling.new_frame()
+        self.assertEqual(len(self.profiler.frames), 1)
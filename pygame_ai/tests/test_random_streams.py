@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+import numpy
+
+from pygame_ai.utils.random_streams import RandomStreams
+
+class TestRandomStreams(TestCase):
+    def test_same_seed_same_values(self):
+        a = RandomStreams(seed = 5)
+        b = RandomStreams(seed = 5)
+        ids_a = a.new_streams(10)
+        ids_b = b.new_streams(10)
+        numpy.testing.assert_array_equal(a.random(ids_a, 4), b.random(ids_b, 4))
+
+    def test_different_seeds(self):
+        a = RandomStreams(seed = 1)
+        b = RandomStreams(seed = 2)
+        self.assertFalse(numpy.array_equal(a.random(a.new_streams(10)), b.random(b.new_streams(10))))
+
+    def test_streams_are_independent(self):
+        # A stream gives the same values whatever is drawn from the others
+        a = RandomStreams(seed = 3)
+        b = RandomStreams(seed = 3)
+        ids = a.new_streams(3)
+        b.new_streams(3)
+        a.random(ids[:2], 7)
+        numpy.testing.assert_array_equal(a.random([2], 5), b.random([2], 5))
+
+    def test_batch_matches_single_stream(self):
+        streams = RandomStreams(seed = 9)
+        ids = streams.new_streams(4)
+        batch = streams.random(ids, 3)
+        streams.seed(9)
+        single = streams.stream(int(ids[2]))
+        self.assertEqual([single.random() for _ in range(3)], list(batch[2]))
+
+    def test_reset(self):
+        streams = RandomStreams(seed = 4)
+        first = streams.random(streams.new_streams(5))
+        streams.reset(4)
+        numpy.testing.assert_array_equal(streams.random(streams.new_streams(5)), first)
+
+    def test_range(self):
+        streams = RandomStreams()
+        values = streams.random(streams.new_streams(100), 50)
+        self.assertTrue(((values >= 0) & (values < 1)).all())
+        integers = streams.integers(streams.new_streams(100), 3, 6)
+        self.assertTrue(((integers >= 3) & (integers < 6)).all())
+
+    def test_reseed_after_draw(self):
+        streams = RandomStreams(seed = 6)
+        stream = streams.stream()
+        first = [stream.random() for _ in range(3)]
+        stream.binomial()
+        streams.seed(6)
+        self.assertEqual([stream.random() for _ in range(3)], first)
+        streams.seed(7)
+        self.assertNotEqual([stream.random() for _ in range(3)], first)
+
+    def test_reseed_wander(self):
+        from pygame_ai.gameobject import GameObject
+        from pygame_ai.steering import kinematic
+        streams = RandomStreams(seed = 1)
+        wander = kinematic.Wander(GameObject(), streams = streams)
+        first = [tuple(wander.get_steering().linear) for _ in range(5)]
+        streams.seed(1)
+        wander.wander_orientation = 0
+        self.assertEqual([tuple(wander.get_steering().linear) for _ in range(5)], first)
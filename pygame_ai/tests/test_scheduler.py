@@ -0,0 +1,150 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from unittest import TestCase
+
+import pygame
+
+from pygame_ai.gameobject import GameObject
+from pygame_ai.steering import kinematic, scheduler, priority
+
+class CountingSeek(kinematic.Seek):
+    def __init__(self, character, target):
+        super(CountingSeek, self).__init__(character, target)
+        self.evaluations = 0
+
+    def get_steering(self):
+        self.evaluations += 1
+        return super(CountingSeek, self).get_steering()
+
+class TestThrottled(TestCase):
+    def setUp(self):
+        self.character = GameObject(pos = (0, 0))
+        self.target = GameObject(pos = (500, 0))
+        self.behavior = CountingSeek(self.character, self.target)
+
+    def test_interval(self):
+        throttled = scheduler.Throttled(self.behavior, 4)
+        for _ in range(12):
+            throttled.get_steering()
+        self.assertEqual(self.behavior.evaluations, 3)
+
+    def test_stale_calls_return_last_output(self):
+        throttled = scheduler.Throttled(self.behavior, 4)
+        first = pygame.Vector2(throttled.get_steering().linear)
+        self.target.position = pygame.Vector2(-500, 0)
+        self.assertEqual(throttled.get_steering().linear, first)
+
+    def test_phase(self):
+        throttled = scheduler.Throttled(self.behavior, 4, phase = 2)
+        # The first call always evaluates, then every 4 calls from the phase
+        for _ in range(3):
+            throttled.get_steering()
+        self.assertEqual(self.behavior.evaluations, 2)
+
+    def test_velocity_trigger(self):
+        throttled = scheduler.Throttled(self.behavior, 100, scheduler.velocity_changed(10))
+        throttled.get_steering()
+        throttled.get_steering()
+        self.assertEqual(self.behavior.evaluations, 1)
+        # In-place changes must be seen by the trigger
+        self.character.velocity.x += 11
+        throttled.get_steering()
+        self.assertEqual(self.behavior.evaluations, 2)
+        self.character.velocity.x += 5
+        throttled.get_steering()
+        self.assertEqual(self.behavior.evaluations, 2)
+
+    def test_trigger_needs_character(self):
+        entries = priority.PrioritySteering([self.behavior])
+        with self.assertRaises(ValueError):
+            scheduler.Throttled(entries, 4, scheduler.velocity_changed(10))
+        throttled = scheduler.Throttled(entries, 4, scheduler.velocity_changed(10), character = self.character)
+        throttled.get_steering()
+        self.character.velocity.x += 11
+        throttled.get_steering()
+        self.assertEqual(self.behavior.evaluations, 2)
+
+    def test_without_character(self):
+        throttled = scheduler.Throttled(priority.PrioritySteering([self.behavior]), 3)
+        for _ in range(6):
+            throttled.get_steering()
+        self.assertEqual(self.behavior.evaluations, 2)
+        self.assertIsNone(throttled.evaluated_velocity)
+
+    def test_throttle_leaves_unthrottled_behaviors(self):
+        self.assertIs(scheduler.throttle(self.behavior), self.behavior)
+        self.assertIsInstance(scheduler.throttle(self.behavior, 2), scheduler.Throttled)
+
+class TestPriorityIntervals(TestCase):
+    def test_entries_have_their_own_rate(self):
+        character = GameObject(pos = (0, 0))
+        target = GameObject(pos = (500, 0))
+        slow = CountingSeek(character, target)
+        fast = CountingSeek(character, target)
+        # Slow never reaches epsilon, so fast is always evaluated too
+        behavior = priority.PrioritySteering([slow, fast], epsilon = 1e9, intervals = [6, 1])
+        for _ in range(12):
+            behavior.get_steering()
+        # Once right away, then twice in 12 calls depending on its phase
+        self.assertIn(slow.evaluations, (2, 3))
+        self.assertEqual(fast.evaluations, 12)
+
+    def test_entry_trigger(self):
+        character = GameObject(pos = (0, 0))
+        target = GameObject(pos = (500, 0))
+        slow = CountingSeek(character, target)
+        behavior = priority.PrioritySteering([slow], intervals = [100], invalidate = [scheduler.velocity_changed(10)])
+        behavior.get_steering()
+        character.velocity.x += 20
+        behavior.get_steering()
+        self.assertEqual(slow.evaluations, 2)
+
+class TestAIScheduler(TestCase):
+    def setUp(self):
+        self.focus = GameObject(pos = (0, 0))
+        self.scheduler = scheduler.AIScheduler([self.focus], tiers = ((100, 1), (float('inf'), 8)))
+        self.near = GameObject(pos = (10, 0))
+        self.far = GameObject(pos = (1000, 0))
+        self.near_behavior = CountingSeek(self.near, self.focus)
+        self.far_behavior = CountingSeek(self.far, self.focus)
+        self.scheduler.add(self.near, self.near_behavior)
+        self.scheduler.add(self.far, self.far_behavior)
+
+    def test_tiers(self):
+        self.assertEqual([agent.tier for agent in self.scheduler.agents], [0, 1])
+        tiers = self.scheduler.tiers_of([(0, 0), (99, 0), (100, 0), (5000, 0)])
+        self.assertEqual(tiers.tolist(), [0, 0, 1, 1])
+
+    def test_rates(self):
+        for _ in range(16):
+            self.scheduler.update(0)
+        self.assertEqual(self.near_behavior.evaluations, 16)
+        self.assertEqual(self.far_behavior.evaluations, 2)
+
+    def test_focus_moves_next_to_far_agent(self):
+        # Let the far agent be evaluated and fall out of phase
+        for _ in range(3):
+            self.scheduler.update(0)
+        evaluations = self.far_behavior.evaluations
+        self.focus.rect.center = (1000, 10)
+        self.scheduler.update(0)
+        self.assertEqual(self.far_behavior.evaluations, evaluations + 1)
+        self.assertEqual(self.scheduler.agents[1].tier, 0)
+        self.scheduler.update(0)
+        self.assertEqual(self.far_behavior.evaluations, evaluations + 2)
+
+    def test_applies_last_steering(self):
+        for _ in range(8):
+            self.scheduler.update(0)
+        self.assertEqual(self.far_behavior.evaluations, 1)
+        steering = pygame.Vector2(self.scheduler.agents[1].steering.linear)
+        self.assertNotEqual(steering.length(), 0)
+        self.scheduler.update(1)
+        self.assertEqual(self.far_behavior.evaluations, 1)
+        self.assertEqual(self.far.velocity, steering)
+
+    def test_remove(self):
+        self.scheduler.remove(self.far)
+        self.scheduler.update(0)
+        self.assertEqual(self.far_behavior.evaluations, 0)
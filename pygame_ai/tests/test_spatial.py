@@ -0,0 +1,204 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import random
+from unittest import TestCase
+
+import numpy
+import pygame
+
+from pygame_ai.gameobject import GameObject, DummyGameObject
+from pygame_ai.steering import kinematic
+from pygame_ai.utils import math_utils
+from pygame_ai.utils.spatial import SpatialHashGrid, ObstacleGrid
+
+def _scatter(count, seed, size = 400):
+    rng = random.Random(seed)
+    objects = []
+    for _ in range(count):
+        obj = DummyGameObject((rng.randint(-size, size), rng.randint(-size, size)))
+        obj.velocity = pygame.Vector2(rng.uniform(-5, 5), rng.uniform(-5, 5))
+        obj.max_accel = 20
+        objects.append(obj)
+    return objects
+
+class TestSpatialHashGrid(TestCase):
+    def setUp(self):
+        self.objects = _scatter(150, 3)
+        self.grid = SpatialHashGrid(50, self.objects)
+
+    def test_query_contains_everything_in_radius(self):
+        rng = random.Random(5)
+        for _ in range(40):
+            position = pygame.Vector2(rng.uniform(-400, 400), rng.uniform(-400, 400))
+            radius = rng.choice([10, 49, 50, 120, 900])
+            found = self.grid.query(position, radius)
+            self.assertEqual(len(found), len(set(map(id, found))))
+            expected = [obj for obj in self.objects if position.distance_to(obj.position) <= radius]
+            for obj in expected:
+                self.assertIn(obj, found)
+
+    def test_large_query_walks_buckets(self):
+        # A circle covering more cells than there are buckets returns everything
+        found = self.grid.query((0, 0), 10000)
+        self.assertEqual(len(found), len(self.objects))
+
+    def test_rebuild_follows_movement(self):
+        obj = self.objects[0]
+        obj.position = (1000, 1000)
+        self.assertNotIn(obj, self.grid.query((1000, 1000), 10))
+        self.grid.rebuild()
+        self.assertIn(obj, self.grid.query((1000, 1000), 10))
+
+    def test_add_remove(self):
+        extra = DummyGameObject((2000, 2000))
+        extra.velocity = pygame.Vector2(30, 40)
+        self.grid.add(extra)
+        self.assertEqual(len(self.grid), len(self.objects) + 1)
+        self.assertIn(extra, self.grid.query((2000, 2000), 1))
+        self.assertEqual(self.grid.max_speed, 50)
+
+        self.grid.remove(extra)
+        self.grid.rebuild()
+        self.assertNotIn(extra, list(self.grid))
+        self.assertEqual(self.grid.query((2000, 2000), 1), [])
+        self.assertLess(self.grid.max_speed, 50)
+
+    def test_rebuild_replaces_objects(self):
+        others = _scatter(10, 8)
+        self.grid.rebuild(others)
+        self.assertEqual(list(self.grid), others)
+        self.assertEqual(sum(len(bucket) for bucket in self.grid.cells.values()), 10)
+
+    def test_negative_positions_bucket_by_floor(self):
+        grid = SpatialHashGrid(10, [DummyGameObject((-1, -1))])
+        self.assertEqual(list(grid.cells), [(-1, -1)])
+
+class TestGridBehaviors(TestCase):
+    def setUp(self):
+        self.objects = _scatter(80, 13, size = 150)
+        self.grid = SpatialHashGrid(40, self.objects)
+
+    def assertSameSteering(self, a, b):
+        self.assertAlmostEqual(a.linear[0], b.linear[0], places = 6)
+        self.assertAlmostEqual(a.linear[1], b.linear[1], places = 6)
+
+    def test_separation_matches_list(self):
+        steered = 0
+        for character in self.objects[:20]:
+            with_list = kinematic.Separation(character, self.objects, treshold = 40).get_steering()
+            with_grid = kinematic.Separation(character, self.grid, treshold = 40).get_steering()
+            self.assertSameSteering(with_list, with_grid)
+            steered += with_list.linear.length() > 0
+        self.assertGreater(steered, 0)
+
+    def test_collision_avoidance_matches_list(self):
+        steered = 0
+        for character in self.objects[:20]:
+            with_list = kinematic.CollisionAvoidance(character, self.objects, radius = 30).get_steering()
+            with_grid = kinematic.CollisionAvoidance(character, self.grid, radius = 30).get_steering()
+            self.assertSameSteering(with_list, with_grid)
+            steered += with_list.linear.length() > 0
+        self.assertGreater(steered, 0)
+
+def _walls(count, seed):
+    rng = random.Random(seed)
+    walls = []
+    for _ in range(count):
+        size = (rng.randint(5, 80), rng.randint(5, 80))
+        walls.append(GameObject(pygame.Surface(size), pos = (rng.randint(-300, 300), rng.randint(-300, 300))))
+    return walls
+
+def _segment_touches_cell(start, end, cell, cell_size, eps = 1e-9):
+    # Liang-Barsky clip of the segment against the closed cell square
+    x0, y0 = start
+    dx, dy = end[0] - x0, end[1] - y0
+    low, high = 0.0, 1.0
+    for p, q in ((-dx, x0 - cell[0] * cell_size), (dx, (cell[0] + 1) * cell_size - x0),
+                 (-dy, y0 - cell[1] * cell_size), (dy, (cell[1] + 1) * cell_size - y0)):
+        if p == 0:
+            if q < -eps:
+                return False
+            continue
+        t = q / float(p)
+        if p < 0:
+            low = max(low, t)
+        else:
+            high = min(high, t)
+    return low <= high + eps
+
+class TestObstacleGrid(TestCase):
+    def setUp(self):
+        self.walls = _walls(30, 21)
+        self.grid = ObstacleGrid(40, self.walls)
+        rng = random.Random(17)
+        point = lambda: (rng.uniform(-350, 350), rng.uniform(-350, 350))
+        self.segments = [(point(), point()) for _ in range(60)]
+        # Axis aligned, single cell and exactly on cell borders
+        self.segments += [((-100, 7.5), (250, 7.5)), ((13, 200), (13, -200)), ((5, 5), (30, 30)), ((0, 0), (120, 80))]
+
+    def test_cells_on_segment_matches_brute_force(self):
+        cell_size = self.grid.cell_size
+        for start, end in self.segments:
+            cells = self.grid.cells_on_segment(start, end)
+            self.assertEqual(cells[0], self.grid_cell(start))
+            self.assertEqual(cells[-1], self.grid_cell(end))
+            self.assertEqual(len(cells), len(set(cells)))
+            # Every step moves to a neighbouring cell
+            for (ax, ay), (bx, by) in zip(cells, cells[1:]):
+                self.assertEqual(abs(ax - bx) + abs(ay - by), 1)
+            # Every cell returned is touched by the segment
+            for cell in cells:
+                self.assertTrue(_segment_touches_cell(start, end, cell, cell_size), (start, end, cell))
+            # Every cell the segment goes through is returned
+            for i in range(1001):
+                t = i / 1000.0
+                sample = (start[0] + (end[0] - start[0]) * t, start[1] + (end[1] - start[1]) * t)
+                self.assertIn(self.grid_cell(sample), cells)
+
+    def grid_cell(self, point):
+        cell_size = self.grid.cell_size
+        return (int(numpy.floor(point[0] / cell_size)), int(numpy.floor(point[1] / cell_size)))
+
+    def test_ray_edges_contain_every_hit(self):
+        hits = 0
+        for segment in self.segments:
+            found = self.grid.ray_edges(*segment)
+            self.assertEqual(len(found), len(self.grid.ray_edge_indices(*segment)))
+            for edge in self.grid.edges:
+                if math_utils.lines_intersect(segment, edge) is not None:
+                    hits += 1
+                    self.assertIn(edge, found)
+        self.assertGreater(hits, 0)
+        # The broad phase has to discard something to be worth it
+        total = sum(len(self.grid.ray_edge_indices(*segment)) for segment in self.segments)
+        self.assertLess(total, len(self.segments) * len(self.grid.edges))
+
+    def test_rebuild_follows_obstacles(self):
+        self.assertEqual(len(self.grid.edges), 4 * len(self.walls))
+        self.assertEqual(self.grid.segments.shape, (4 * len(self.walls), 2, 2))
+        wall = GameObject(pygame.Surface((10, 10)), pos = (1000, 1000))
+        self.assertEqual(self.grid.ray_edges((990, 1000), (1010, 1000)), [])
+        self.grid.rebuild(self.walls + [wall])
+        self.assertEqual(len(self.grid), len(self.walls) + 1)
+        found = self.grid.ray_edges((990, 1000), (1010, 1000))
+        left, top, right, bottom = wall.get_lines()
+        self.assertIn(left, found)
+        self.assertIn(right, found)
+
+    def test_obstacle_avoidance_matches_list(self):
+        rng = random.Random(4)
+        hits = 0
+        for _ in range(40):
+            character = GameObject(pygame.Surface((10, 10)), pos = (rng.randint(-300, 300), rng.randint(-300, 300)))
+            character.velocity = pygame.Vector2(rng.uniform(-10, 10), rng.uniform(-10, 10))
+            with_list = kinematic.ObstacleAvoidance(character, self.walls, lookahead = 150)
+            with_grid = kinematic.ObstacleAvoidance(character, self.grid, lookahead = 150)
+            point, _ = with_list.cast_ray()
+            grid_point, _ = with_grid.cast_ray()
+            self.assertEqual(point, grid_point)
+            hits += point is not None
+            steering = with_list.get_steering()
+            grid_steering = with_grid.get_steering()
+            self.assertEqual(steering.linear, grid_steering.linear)
+        self.assertGreater(hits, 0)
@@ -0,0 +1,96 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import random
+from unittest import TestCase
+
+import numpy
+import pygame
+
+from pygame_ai.world import AgentWorld
+from pygame_ai.steering import static, static_batch
+from pygame_ai.utils.random_streams import RandomStreams
+
+def _world(count = 40, seed = 9):
+    rng = random.Random(seed)
+    world = AgentWorld()
+    for _ in range(count):
+        view = world.add(pos = (rng.uniform(0, 800), rng.uniform(0, 600)), max_speed = rng.uniform(2, 12), max_rotation = 30)
+        view.velocity = (rng.uniform(-5, 5), rng.uniform(-5, 5))
+        view.orientation = rng.uniform(-180, 180)
+    return world
+
+class TestStaticBatchMatchesScalar(TestCase):
+    def setUp(self):
+        # Static behaviors turn their characters, so the scalar and the
+        # batched ones get a world each
+        self.scalar = _world()
+        self.batch = _world()
+        self.characters = numpy.arange(0, 40, 2)
+        self.targets = self.characters + 1
+        # Put one character right on its target
+        for world in (self.scalar, self.batch):
+            world.position[self.characters[0]] = world.position[self.targets[0]]
+
+    def assertMatches(self, velocity, factory):
+        views = list(self.scalar)
+        for row, i, j in zip(velocity, self.characters, self.targets):
+            steering = factory(views[i], views[j]).get_steering()
+            self.assertAlmostEqual(row[0], steering.velocity[0], places = 6)
+            self.assertAlmostEqual(row[1], steering.velocity[1], places = 6)
+        # Same orientations, up to a full turn
+        difference = (self.batch.orientation - self.scalar.orientation + 180) % 360 - 180
+        numpy.testing.assert_allclose(difference, 0, atol = 1e-6)
+
+    def test_seek(self):
+        velocity = static_batch.seek(self.batch, self.characters, self.targets)
+        self.assertMatches(velocity, static.Seek)
+
+    def test_flee(self):
+        velocity = static_batch.flee(self.batch, self.characters, self.targets)
+        self.assertMatches(velocity, static.Flee)
+
+    def test_arrive(self):
+        for radius in (0.5, 60, 300):
+            velocity = static_batch.arrive(self.batch, self.characters, self.targets, radius, 2)
+            self.assertMatches(velocity, lambda c, t: static.Arrive(c, t, radius, 2))
+
+    def test_point_targets(self):
+        points = numpy.array([[400, 300]] * len(self.characters), dtype = float)
+        velocity = static_batch.seek(self.batch, self.characters, points)
+        target = self.scalar.add(pos = (400, 300))
+        views = list(self.scalar)
+        for row, i in zip(velocity, self.characters):
+            steering = static.Seek(views[i], target).get_steering()
+            numpy.testing.assert_allclose(row, steering.velocity)
+
+    def test_update(self):
+        rng = numpy.random.RandomState(1)
+        velocity = rng.uniform(-20, 20, (len(self.characters), 2))
+        rotation = rng.uniform(-5, 5, len(self.characters))
+        static_batch.update(self.batch, velocity, rotation, self.characters)
+        views = list(self.scalar)
+        for row, angle, i in zip(velocity, rotation, self.characters):
+            static.SteeringOutput(pygame.Vector2(*row), angle).update(views[i], 1)
+        numpy.testing.assert_allclose(self.batch.velocity, self.scalar.velocity)
+        numpy.testing.assert_allclose(self.batch.rotation, self.scalar.rotation)
+
+    def test_wander(self):
+        characters = numpy.arange(len(self.batch))
+        wander = static_batch.Wander(self.batch, characters, streams = RandomStreams(5))
+        streams = RandomStreams(5)
+        wanders = [static.Wander(view, streams = streams) for view in self.scalar]
+
+        turns = 0
+        for _ in range(40):
+            velocity, rotation = wander.get_steering()
+            static_batch.update(self.batch, velocity, rotation)
+            self.batch.move()
+            for view, behavior in zip(self.scalar, wanders):
+                behavior.get_steering().update(view, 1)
+            self.scalar.move()
+            turns += numpy.count_nonzero(rotation)
+            numpy.testing.assert_allclose(self.batch.velocity, self.scalar.velocity, atol = 1e-9)
+            numpy.testing.assert_allclose(self.batch.rotation, self.scalar.rotation, atol = 1e-9)
+            numpy.testing.assert_allclose(self.batch.position, self.scalar.position, atol = 1e-6)
+        self.assertGreater(turns, 0)
@@ -0,0 +1,65 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from unittest import TestCase
+
+import numpy
+import pygame
+
+from pygame_ai.world import AgentWorld
+from pygame_ai.gameobject import GameObject
+from pygame_ai.steering import kinematic
+
+class TestAgentWorld(TestCase):
+    def test_view_round_trip(self):
+        world = AgentWorld(capacity = 1)
+        views = [world.add(pos = (10*i, 20*i), max_speed = 5 + i) for i in range(5)]
+        self.assertEqual(len(world), 5)
+        view = views[3]
+        self.assertEqual(view.position, pygame.Vector2(30, 60))
+        self.assertEqual(view.max_speed, 8)
+
+        view.velocity = (1, 2)
+        view.velocity += pygame.Vector2(1, 1)
+        view.orientation = 45
+        self.assertEqual(tuple(world.velocity[3]), (2, 3))
+        self.assertEqual(world.orientation[3], 45)
+
+        world.position[3] = (7, 8)
+        self.assertEqual(view.position, pygame.Vector2(7, 8))
+        self.assertEqual(view.rect.center, (7, 8))
+
+    def test_view_move(self):
+        world = AgentWorld()
+        view = world.add(pos = (0, 0))
+        view.velocity = (3, 4)
+        view.rotation = 10
+        view.move()
+        self.assertEqual(view.position, pygame.Vector2(3, 4))
+        self.assertEqual(view.orientation, 10)
+
+    def test_integrate_matches_scalar_update(self):
+        world = AgentWorld()
+        objects = []
+        for i in range(4):
+            world.add(pos = (0, 0), max_speed = 3)
+            objects.append(GameObject(pos = (0, 0), max_speed = 3))
+        linear = numpy.array([[1, 0], [0, 2], [50, 50], [-3, 1]], dtype = float)
+        angular = numpy.array([1, -2, 3, 0], dtype = float)
+
+        for _ in range(3):
+            world.integrate(linear, angular, 0.5)
+            for obj, lin, ang in zip(objects, linear, angular):
+                kinematic.SteeringOutput(pygame.Vector2(*lin), ang).update(obj, 0.5)
+
+        for i, obj in enumerate(objects):
+            self.assertAlmostEqual(world.velocity[i][0], obj.velocity.x)
+            self.assertAlmostEqual(world.velocity[i][1], obj.velocity.y)
+            self.assertAlmostEqual(world.rotation[i], obj.rotation)
+
+    def test_move_advances_tick(self):
+        world = AgentWorld()
+        world.add()
+        tick = world.tick_id
+        world.move()
+        self.assertEqual(world.tick_id, tick + 1)
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+""" AI Frame Tracing
+
+This module records a timeline of what happens during every AI frame and
+exports it as a `Chrome Trace Event <https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU>`_
+JSON file, which can be opened in any trace viewer that supports the
+format (``chrome://tracing``, Perfetto, Speedscope...).
+
+Once :py:func:`enable` d, spans are recorded for:
+
+    * every ``get_steering`` call, from composite behaviors
+      (:py:class:`~.blended.BlendedSteering`, :py:class:`~.priority.PrioritySteering`...)
+      down to the leaf behaviors they are made of
+    * integration: :py:meth:`.kinematic.SteeringOutput.update`,
+      :py:meth:`~world.AgentWorld.integrate` and :py:meth:`~world.AgentWorld.move`
+    * neighbor index rebuilds of :py:class:`~utils.spatial.SpatialHashGrid`
+      and :py:class:`~utils.spatial.ObstacleGrid`
+    * perception: batched ray casts with :py:func:`~.kinematic.cast_obstacle_rays`
+    * path finding: :py:meth:`~navigation.Navigator.find_path`
+
+Your own game phases can be added with :py:func:`span`. Only the last few
+frames are kept in a ring buffer, so tracing can be left on and the trace
+dumped right after a hitch. While tracing is disabled nothing is wrapped.
+
+Example
+-------
+
+.. code-block:: python
+
+    tracing.enable(frames = 120)
+
+    # Inside the game loop
+    tracing.new_frame()
+    with tracing.span('ai'):
+        ...
+    if tick > 0.05:
+        tracing.dump('hitch.json')
+"""
+
+import collections
+import json
+import os
+import threading
+import time
+
+from pygame_ai.utils import instrumentation
+
+enabled = False
+""" bool : Whether tracing is enabled """
+
+_frames = collections.deque(maxlen = 120)
+_current = []
+_frame_start = 0
+_frame_index = 0
+
+def _now():
+    """ Returns the current time in microseconds """
+    return time.perf_counter() * 1e6
+
+def _add(name, category, start, end, args = None):
+    event = {
+        'name': name,
+        'cat': category,
+        'ph': 'X',
+        'ts': start,
+        'dur': end - start,
+        'pid': os.getpid(),
+        'tid': threading.get_ident(),
+    }
+    if args:
+        event['args'] = args
+    _current.append(event)
+
+class _Span(object):
+    """ Context manager that records a span when it exits """
+
+    __slots__ = ('name', 'category', 'args', 'start')
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = _now()
+        return self
+
+    def __exit__(self, *exc_info):
+        _add(self.name, self.category, self.start, _now(), self.args)
+
+class _NullSpan(object):
+    """ Context manager that does nothing, used while tracing is disabled """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+_null_span = _NullSpan()
+
+def span(name, category = 'game', args = None):
+    """ Returns a context manager that records a span while tracing is enabled
+
+    Parameters
+    ----------
+    name: str
+        Name shown in the trace viewer
+    category: str, optional
+        Category of the span
+    args: dict, optional
+        Extra data shown when selecting the span
+    """
+    if not enabled:
+        return _null_span
+    return _Span(name, category, args)
+
+def _traced(function, name, category):
+    """ Returns function wrapped so that every call records a span """
+    def traced(*args, **kwargs):
+        start = _now()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _add(name, category, start, _now())
+    traced.__doc__ = function.__doc__
+    traced.__wrapped__ = function
+    return traced
+
+def _patch(owner, attribute, name, category):
+    instrumentation.wrap(owner, attribute, 'tracing', lambda function: _traced(function, name, category))
+
+def _targets():
+    """ Returns (owner, attribute, span name, category) of everything that is traced """
+    from pygame_ai import navigation, profiling, world
+    from pygame_ai.steering import kinematic, static, blended, priority, plan
+    from pygame_ai.utils import spatial
+
+    composites = (blended.BlendedSteering, priority.PrioritySteering, plan.SteeringPlan)
+    targets = []
+    for cls in profiling.behavior_classes():
+        if 'get_steering' in cls.__dict__:
+            category = 'composite' if issubclass(cls, composites) else 'behavior'
+            targets.append((cls, 'get_steering', cls.__name__, category))
+
+    targets += [
+        (kinematic.SteeringOutput, 'update', 'SteeringOutput.update', 'integration'),
+        (static.SteeringOutput, 'update', 'static.SteeringOutput.update', 'integration'),
+        (world.AgentWorld, 'integrate', 'AgentWorld.integrate', 'integration'),
+        (world.AgentWorld, 'move', 'AgentWorld.move', 'integration'),
+        (spatial.SpatialHashGrid, 'rebuild', 'SpatialHashGrid.rebuild', 'neighbor index'),
+        (spatial.ObstacleGrid, 'rebuild', 'ObstacleGrid.rebuild', 'neighbor index'),
+        (kinematic, 'cast_obstacle_rays', 'cast_obstacle_rays', 'perception'),
+        (navigation.Navigator, 'find_path', 'Navigator.find_path', 'navigation'),
+    ]
+    return targets
+
+def enable(frames = 120):
+    """ Starts tracing
+
+    Wraps every traced function, behavior classes defined after this call
+    are not traced.
+
+    Parameters
+    ----------
+    frames: int, optional
+        Number of finished frames kept in the ring buffer
+    """
+    global enabled, _frames, _current, _frame_start
+    if not enabled:
+        for owner, attribute, name, category in _targets():
+            _patch(owner, attribute, name, category)
+    _frames = collections.deque(maxlen = frames)
+    _current = []
+    _frame_start = _now()
+    enabled = True
+
+def disable():
+    """ Stops tracing and unwraps everything, recorded frames are kept until the next :py:func:`enable` """
+    global enabled
+    instrumentation.unwrap('tracing')
+    enabled = False
+
+def new_frame():
+    """ Finishes the current frame and starts a new one, if tracing is enabled """
+    global _current, _frame_start, _frame_index
+    if not enabled:
+        return
+    end = _now()
+    _add('frame {}'.format(_frame_index), 'frame', _frame_start, end)
+    _frames.append(_current)
+    _current = []
+    _frame_start = end
+    _frame_index += 1
+
+def events():
+    """ Returns the recorded events of every frame in the ring buffer, plus the current one
+
+    Returns
+    -------
+    list(dict)
+        Chrome Trace Events
+    """
+    recorded = []
+    for frame in _frames:
+        recorded.extend(frame)
+    recorded.extend(_current)
+    return recorded
+
+def dump(path):
+    """ Writes the recorded frames to a Chrome Trace Event JSON file
+
+    Parameters
+    ----------
+    path: str
+        File to write
+    """
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events(), 'displayTimeUnit': 'ms'}, f)
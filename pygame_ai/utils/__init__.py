@@ -1,2 +1,6 @@
 from . import list_utils
 from . import math_utils
+from . import spatial
+from . import image_cache
+from . import random_streams
+from . import instrumentation
@@ -0,0 +1,93 @@
+""" Shared cache of rotated surfaces """
+import collections
+
+import pygame
+
+
+class SurfaceCache(object):
+    """ LRU cache of rotated versions of shared surfaces
+
+    Rotating the image of every agent to match its orientation costs a
+    ``pygame.transform.rotate`` per agent per frame. Agents that share the
+    same original image can share its rotated versions too: orientations
+    are quantized to steps of ``angle_step`` degrees, and every
+    (image, step) pair is only rotated once, until it is evicted.
+
+    Entries are keyed by the ``id`` of the original surface and keep a
+    reference to it, so a key can't be reused by another surface while
+    its entry is alive.
+
+    Parameters
+    ----------
+    max_size: int, optional
+        Maximum number of rotated surfaces to keep, the least recently
+        used ones are evicted first
+    angle_step: float, optional
+        Size, in degrees, of the steps orientations are quantized to
+
+    Attributes
+    ----------
+    hits: int
+        Number of lookups that found the rotated surface in the cache
+    misses: int
+        Number of lookups that had to rotate the surface
+    """
+
+    def __init__(self, max_size = 1024, angle_step = 5):
+        self.max_size = max_size
+        self.angle_step = angle_step
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return 'SurfaceCache({}/{} surfaces, {} hits, {} misses)'.format(len(self.entries), self.max_size, self.hits, self.misses)
+
+    def quantize(self, angle):
+        """ Returns the angle, in degrees between 0 and 360, rounded to the nearest step """
+        return round((angle % 360) / self.angle_step) * self.angle_step % 360
+
+    def rotated(self, surface, angle):
+        """ Returns surface rotated by angle, rounded to the nearest step
+
+        Parameters
+        ----------
+        surface: :pgsurf:`Surface`
+            Original surface, it must not be modified while it is cached
+        angle: float
+            Counterclockwise rotation in degrees, the same convention as
+            :py:attr:`~gameobject.GameObject.orientation`
+
+        Returns
+        -------
+        :pgsurf:`Surface`
+            Shared rotated surface, don't draw on it
+        """
+        angle = self.quantize(angle)
+        key = (id(surface), angle)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] is surface:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        rotated = pygame.transform.rotate(surface, angle)
+        self.entries[key] = (surface, rotated)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last = False)
+        return rotated
+
+    def clear(self):
+        """ Removes every cached surface and resets the statistics """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+default_cache = SurfaceCache()
+""" :py:class:`SurfaceCache` : Cache used by :py:meth:`~gameobject.GameObject.rotate_image` when none is given """
@@ -0,0 +1,49 @@
+""" Shared registry of instrumentation wrappers
+
+:py:mod:`~pygame_ai.profiling` and :py:mod:`~pygame_ai.tracing` both wrap
+methods like ``get_steering``. Wrapping through this module keeps every
+layer of every wrapped attribute in one place, so layers can be removed
+in any order: the attribute is rebuilt from the original function and the
+layers that are left, and restored once none are.
+"""
+
+_layers = {}
+""" dict(tuple(object, str), tuple(function, list(tuple(str, function)))) : Original function and (owner of the layer, factory) of every wrapped attribute """
+
+def _rebuild(owner, attribute):
+    original, layers = _layers[(owner, attribute)]
+    function = original
+    for _, factory in layers:
+        function = factory(function)
+    setattr(owner, attribute, function)
+    if not layers:
+        del _layers[(owner, attribute)]
+
+def wrap(owner, attribute, layer, factory):
+    """ Wraps owner.attribute in a new layer
+
+    Parameters
+    ----------
+    owner: class or module
+        Object whose attribute is wrapped, it must be defined in it, not inherited
+    attribute: str
+        Name of the attribute
+    layer: str
+        Name of whoever adds the layer, used to remove it
+    factory: function function -> function
+        Returns the wrapper of the function it is given
+    """
+    key = (owner, attribute)
+    if key not in _layers:
+        _layers[key] = (owner.__dict__[attribute], [])
+    _layers[key][1].append((layer, factory))
+    _rebuild(owner, attribute)
+
+def unwrap(layer):
+    """ Removes every layer added with the given name """
+    for key in list(_layers):
+        original, layers = _layers[key]
+        remaining = [entry for entry in layers if entry[0] != layer]
+        if len(remaining) != len(layers):
+            _layers[key] = (original, remaining)
+            _rebuild(*key)
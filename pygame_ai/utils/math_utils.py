@@ -1,5 +1,7 @@
 import math
 import random
+
+import numpy
 import pygame
 
 def is_not_null(vector2):
@@ -29,6 +31,17 @@ def random_binomial():
     """ Returns a random value in the range [-1, 1] """
     return random.random() - random.random()
     
+def clip_velocity(gameobject):
+    """ Scales the object's velocity down to its max_speed if it is faster
+    
+    The clipped velocity is assigned instead of changed in place, so it
+    also works for objects whose velocity property returns a copy, like
+    :py:class:`~world.AgentView`.
+    """
+    velocity = gameobject.velocity
+    if velocity.length() > gameobject.max_speed:
+        gameobject.velocity = velocity.normalize() * gameobject.max_speed
+    
 def vec2_to_int(vector2):
     return pygame.Vector2(int(vector2[0]), int(vector2[1]))
     
@@ -82,6 +95,102 @@ def lines_intersect(line1, line2):
     
     return pygame.Vector2(x, y)
     
+def _crossings(p, d, q, e):
+    """ Returns t where the rays p + t*d strictly cross the segments q + u*e, inf where they don't
+    
+    Works on any shapes that broadcast together, the last axis holds the coordinates.
+    """
+    qp = q - p
+    denom = d[..., 0] * e[..., 1] - d[..., 1] * e[..., 0]
+    with numpy.errstate(divide = 'ignore', invalid = 'ignore'):
+        t = (qp[..., 0] * e[..., 1] - qp[..., 1] * e[..., 0]) / denom
+        u = (qp[..., 0] * d[..., 1] - qp[..., 1] * d[..., 0]) / denom
+    hit = (denom != 0) & (t > 0) & (t < 1) & (u > 0) & (u < 1)
+    return numpy.where(hit, t, numpy.inf)
+    
+def rays_intersect(rays, segments, chunk_size = 1 << 20, candidates = None):
+    """ Returns the closest intersection of every ray with a set of segments
+    
+    Vectorized companion of :py:func:`lines_intersect`, every ray is tested
+    against every segment with NumPy broadcasting, or only against its
+    candidate segments if they are given. As in :py:func:`lines_intersect`
+    a ray and a segment only intersect if they strictly cross each other,
+    touching at an end point is not an intersection.
+    
+    :param rays: Rays as (start, end) pairs
+    :type rays: array_like(float, shape = (R, 2, 2))
+    :param segments: Segments as (start, end) pairs
+    :type segments: array_like(float, shape = (S, 2, 2))
+    :param chunk_size: Maximum number of ray-segment pairs tested at once, bounds memory use
+    :type chunk_size: int
+    :param candidates: Ray and segment indices of the only pairs to test,
+        for example the segments near every ray in a spatial grid
+    :type candidates: tuple(array_like(int, shape = (N,)), array_like(int, shape = (N,)))
+    
+    :returns: Per ray, the closest intersection point (NaN if there is none),
+        the index of the hit segment (-1 if there is none) and the distance
+        from the start of the ray to the intersection (inf if there is none)
+    :rtype: tuple(numpy.ndarray (R, 2), numpy.ndarray (R,), numpy.ndarray (R,))
+    """
+    rays = numpy.asarray(rays, dtype = float).reshape(-1, 2, 2)
+    segments = numpy.asarray(segments, dtype = float).reshape(-1, 2, 2)
+    n_rays = len(rays)
+    
+    points = numpy.full((n_rays, 2), numpy.nan)
+    indices = numpy.full(n_rays, -1, dtype = int)
+    distances = numpy.full(n_rays, numpy.inf)
+    if n_rays == 0 or len(segments) == 0:
+        return points, indices, distances
+        
+    if candidates is not None:
+        ray_indices = numpy.asarray(candidates[0], dtype = int)
+        segment_indices = numpy.asarray(candidates[1], dtype = int)
+        if len(ray_indices) == 0:
+            return points, indices, distances
+            
+        # One row per candidate pair
+        p = rays[ray_indices, 0]
+        d = rays[ray_indices, 1] - p
+        q = segments[segment_indices, 0]
+        t = _crossings(p, d, q, segments[segment_indices, 1] - q)
+        
+        # Closest hit along every ray: first pair of every ray sorted by t
+        order = numpy.lexsort((t, ray_indices))
+        sorted_rays = ray_indices[order]
+        first = order[numpy.concatenate(([True], sorted_rays[1:] != sorted_rays[:-1]))]
+        first = first[numpy.isfinite(t[first])]
+        
+        found = ray_indices[first]
+        indices[found] = segment_indices[first]
+        points[found] = p[first] + d[first] * t[first, None]
+        distances[found] = t[first] * numpy.hypot(d[first, 0], d[first, 1])
+        return points, indices, distances
+        
+    # Segments as q + u*e
+    q = segments[:, 0]
+    e = segments[:, 1] - q
+    
+    step = max(1, chunk_size // len(segments))
+    for start in range(0, n_rays, step):
+        stop = min(start + step, n_rays)
+        # Rays as p + t*d, against every segment by broadcasting
+        p = rays[start:stop, 0, None, :]
+        d = rays[start:stop, 1, None, :] - p
+        t = _crossings(p, d, q[None, :, :], e[None, :, :])
+        
+        # Closest hit along every ray
+        closest = numpy.argmin(t, axis = 1)
+        rows = numpy.arange(stop - start)
+        closest_t = t[rows, closest]
+        found = numpy.isfinite(closest_t)
+        
+        ray_d = d[:, 0, :]
+        indices[start:stop][found] = closest[found]
+        points[start:stop][found] = p[found, 0, :] + ray_d[found] * closest_t[found, None]
+        distances[start:stop][found] = closest_t[found] * numpy.hypot(ray_d[found, 0], ray_d[found, 1])
+        
+    return points, indices, distances
+    
 def get_perpendicular(line):
     """ Returns line perpendicular to line """
     (x1, y1), (x2, y2) = line
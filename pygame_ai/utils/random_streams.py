@@ -0,0 +1,216 @@
+""" Seeded, per-agent random number streams
+
+Random numbers are produced by a counter-based generator: every value is
+a hash (two rounds of splitmix64) of the seed, the stream it belongs to
+and its position in that stream. No generator state has to be carried
+around, so the numbers of many streams can be produced in one vectorized
+NumPy call, and every stream yields the same sequence no matter how many
+other streams exist or in what order they are used.
+"""
+import numpy
+
+_golden = numpy.uint64(0x9E3779B97F4A7C15)
+_mix1 = numpy.uint64(0xBF58476D1CE4E5B9)
+_mix2 = numpy.uint64(0x94D049BB133111EB)
+_stream_step = numpy.uint64(0xD1B54A32D192ED03)
+
+def _splitmix64(x):
+    """ splitmix64 finalizer of a uint64 array, wraps around on overflow """
+    z = x + _golden
+    z = (z ^ (z >> numpy.uint64(30))) * _mix1
+    z = (z ^ (z >> numpy.uint64(27))) * _mix2
+    return z ^ (z >> numpy.uint64(31))
+
+def _uniform(seed, streams, counters):
+    """ Returns uniform floats in [0, 1) for every (stream, counter) pair """
+    keys = _splitmix64(seed ^ (streams * _stream_step))
+    bits = _splitmix64(keys + counters)
+    return (bits >> numpy.uint64(11)) * (1.0 / (1 << 53))
+
+
+class RandomStreams(object):
+    """ Collection of reproducible random number streams
+
+    Every agent that needs random numbers gets its own stream, identified
+    by an integer id. Values can be drawn for many streams at once with
+    :py:meth:`random`, :py:meth:`binomial` and :py:meth:`integers`, or for
+    a single stream through the :py:class:`RandomStream` returned by
+    :py:meth:`stream`.
+
+    Parameters
+    ----------
+    seed: int, optional
+        Seed of every stream
+
+    Attributes
+    ----------
+    counters: numpy.ndarray(uint64)
+        Number of values drawn so far from every stream
+    epoch: int
+        Number of times the streams have been reseeded, :py:class:`RandomStream`
+        handles drop the values they generated before a reseed
+    """
+
+    def __init__(self, seed = 0, capacity = 64):
+        self.epoch = 0
+        self.seed(seed)
+        self.count = 0
+        self.counters = numpy.zeros(max(int(capacity), 1), dtype = numpy.uint64)
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return 'RandomStreams({} streams)'.format(self.count)
+
+    def seed(self, seed):
+        """ Changes the seed and rewinds every stream to its first value """
+        self._seed = numpy.uint64(seed % (1 << 64))
+        self.epoch += 1
+        if hasattr(self, 'counters'):
+            self.counters[:] = 0
+
+    def reset(self, seed = 0):
+        """ Changes the seed and forgets every stream, ids will be handed out from 0 again
+
+        Use it before creating the behaviors of a run that has to be
+        reproducible, behaviors created earlier would share streams with
+        the new ones.
+        """
+        self.seed(seed)
+        self.count = 0
+
+    def new_stream(self):
+        """ Returns the id of a new stream """
+        if self.count == len(self.counters):
+            counters = numpy.zeros(len(self.counters)*2, dtype = numpy.uint64)
+            counters[:self.count] = self.counters
+            self.counters = counters
+        self.count += 1
+        return self.count - 1
+
+    def new_streams(self, n):
+        """ Returns the ids of n new streams, as an int array """
+        return numpy.array([self.new_stream() for _ in range(n)], dtype = int)
+
+    def stream(self, stream_id = None):
+        """ Returns a :py:class:`RandomStream` to draw values one at a time
+
+        Parameters
+        ----------
+        stream_id: int, optional
+            Stream to draw from, a new one is created if not given
+        """
+        if stream_id is None:
+            stream_id = self.new_stream()
+        return RandomStream(self, stream_id)
+
+    def reserve(self, ids, n = 1):
+        """ Returns the next n positions of every stream in ids and advances them
+
+        Every id must appear only once.
+
+        Returns
+        -------
+        numpy.ndarray(uint64, shape = (len(ids), n))
+        """
+        ids = numpy.asarray(ids, dtype = int)
+        start = self.counters[ids]
+        self.counters[ids] = start + numpy.uint64(n)
+        return start[:, None] + numpy.arange(n, dtype = numpy.uint64)
+
+    def random(self, ids, n = 1):
+        """ Draws uniform floats in [0, 1) from many streams at once
+
+        Parameters
+        ----------
+        ids: array_like(int, shape = (N,))
+            Streams to draw from, every id must appear only once
+        n: int, optional
+            Number of values to draw from every stream
+
+        Returns
+        -------
+        numpy.ndarray(float, shape = (N,) or (N, n))
+            One value per stream if n is 1, otherwise n values per stream
+        """
+        ids = numpy.asarray(ids, dtype = int)
+        counters = self.reserve(ids, n)
+        values = _uniform(self._seed, ids.astype(numpy.uint64)[:, None], counters)
+        return values[:, 0] if n == 1 else values
+
+    def binomial(self, ids):
+        """ Batched :py:func:`~utils.math_utils.random_binomial`, returns a value in [-1, 1] per stream """
+        values = self.random(ids, 2)
+        return values[:, 0] - values[:, 1]
+
+    def integers(self, ids, low, high):
+        """ Returns an integer in [low, high) per stream """
+        return low + (self.random(ids) * (high - low)).astype(int)
+
+
+class RandomStream(object):
+    """ Single stream of a :py:class:`RandomStreams`
+
+    Values are generated in vectorized blocks and handed out one at a
+    time, so a draw is little more than popping from a list.
+
+    Parameters
+    ----------
+    streams: :py:class:`RandomStreams`
+        Collection the stream belongs to
+    stream_id: int
+        Id of the stream
+    block: int, optional
+        Number of values generated at a time
+    """
+
+    __slots__ = ('streams', 'stream_id', 'block', 'buffer', 'epoch')
+
+    def __init__(self, streams, stream_id, block = 256):
+        self.streams = streams
+        self.stream_id = stream_id
+        self.block = block
+        self.buffer = []
+        self.epoch = streams.epoch
+
+    def __repr__(self):
+        return 'RandomStream({})'.format(self.stream_id)
+
+    def refill(self):
+        """ Generates the next block of values """
+        # Values are popped from the end, so the new block goes reversed
+        # in front of the values that are left
+        self.buffer[:0] = self.streams.random([self.stream_id], self.block)[0, ::-1].tolist()
+
+    def _check_epoch(self):
+        """ Drops the values generated before the streams were reseeded """
+        if self.epoch != self.streams.epoch:
+            self.epoch = self.streams.epoch
+            del self.buffer[:]
+
+    def random(self):
+        """ Returns a uniform float in [0, 1) """
+        if self.epoch != self.streams.epoch:
+            self._check_epoch()
+        buffer = self.buffer
+        if not buffer:
+            self.refill()
+        return buffer.pop()
+
+    def binomial(self):
+        """ Returns a value in [-1, 1], as :py:func:`~utils.math_utils.random_binomial` """
+        if self.epoch != self.streams.epoch:
+            self._check_epoch()
+        buffer = self.buffer
+        if len(buffer) < 2:
+            self.refill()
+        return buffer.pop() - buffer.pop()
+
+    def randint(self, a, b):
+        """ Returns an integer in [a, b], as ``random.randint`` """
+        return a + int(self.random() * (b - a + 1))
+
+
+default_streams = RandomStreams()
+""" :py:class:`RandomStreams` : Streams used by the wander behaviors when none are given, reseed it to make runs reproducible """
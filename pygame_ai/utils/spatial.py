@@ -0,0 +1,282 @@
+""" Spatial indexes used to speed up proximity queries """
+import math
+
+import numpy
+
+
+class SpatialHashGrid(object):
+    """ Uniform bucket grid over a set of moving objects
+
+    Objects are bucketed by the cell their position falls in, so a
+    proximity query only has to look at the objects in the cells that
+    overlap the query circle instead of at every object. The grid does
+    not track movement by itself, call :py:meth:`rebuild` once per
+    tick, after all the objects have moved.
+
+    It can be passed in place of a flat list of targets to
+    :py:class:`~.kinematic.Separation` and
+    :py:class:`~.kinematic.CollisionAvoidance`; iterating over it
+    yields every indexed object.
+
+    Parameters
+    ----------
+    cell_size: int
+        Side of every cell, a good value is the largest query radius
+        that will be used with this grid
+    objects: iterable(:py:class:`~gameobject.GameObject`), optional
+        Objects to index
+
+    Attributes
+    ----------
+    max_speed: float
+        Largest velocity length among the indexed objects at the time
+        of the last :py:meth:`rebuild`
+    """
+
+    def __init__(self, cell_size, objects = ()):
+        self.cell_size = cell_size
+        self.objects = list(objects)
+        self.cells = {}
+        self.max_speed = 0
+        self.rebuild()
+
+    def __iter__(self):
+        return iter(self.objects)
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __repr__(self):
+        return 'SpatialHashGrid({} objects, {} cells)'.format(len(self.objects), len(self.cells))
+
+    def cell_of(self, position):
+        """ Returns the key of the cell that contains position """
+        return (int(math.floor(position[0] / self.cell_size)), int(math.floor(position[1] / self.cell_size)))
+
+    def add(self, obj):
+        """ Adds an object to the index """
+        self.objects.append(obj)
+        self.cells.setdefault(self.cell_of(obj.position), []).append(obj)
+        self.max_speed = max(self.max_speed, obj.velocity.length())
+
+    def remove(self, obj):
+        """ Removes an object from the index, it will be gone after the next :py:meth:`rebuild` """
+        self.objects.remove(obj)
+
+    def rebuild(self, objects = None):
+        """ Re-buckets every object based on its current position
+
+        Parameters
+        ----------
+        objects: iterable(:py:class:`~gameobject.GameObject`), optional
+            If given, replaces the set of indexed objects
+        """
+        if objects is not None:
+            self.objects = list(objects)
+
+        cells = {}
+        max_speed = 0
+        cell_size = self.cell_size
+        for obj in self.objects:
+            x, y = obj.position
+            key = (int(math.floor(x / cell_size)), int(math.floor(y / cell_size)))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [obj]
+            else:
+                bucket.append(obj)
+            speed = obj.velocity.length()
+            if speed > max_speed:
+                max_speed = speed
+
+        self.cells = cells
+        self.max_speed = max_speed
+
+    def query(self, position, radius):
+        """ Returns the objects in the cells overlapped by a circle
+
+        The result is a superset of the objects within radius of position,
+        callers are expected to do the exact distance check themselves.
+
+        Parameters
+        ----------
+        position: list_like(float, float)
+            Center of the query circle
+        radius: float
+            Radius of the query circle
+
+        Returns
+        -------
+        list(:py:class:`~gameobject.GameObject`)
+        """
+        cell_size = self.cell_size
+        x, y = position
+        min_x = int(math.floor((x - radius) / cell_size))
+        max_x = int(math.floor((x + radius) / cell_size))
+        min_y = int(math.floor((y - radius) / cell_size))
+        max_y = int(math.floor((y + radius) / cell_size))
+
+        cells = self.cells
+        found = []
+
+        # If the circle spans more cells than there are occupied buckets,
+        # walking the buckets is cheaper than walking the cells
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(cells):
+            for (cx, cy), bucket in cells.items():
+                if min_x <= cx <= max_x and min_y <= cy <= max_y:
+                    found.extend(bucket)
+            return found
+
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+
+        return found
+
+
+class ObstacleGrid(object):
+    """ Uniform grid over the edges of a set of static obstacles
+
+    The edges of every obstacle (see :py:meth:`~gameobject.GameObject.get_lines`)
+    are computed once and stored in every cell they overlap, a ray can then
+    be tested only against the edges in the cells it crosses. Call
+    :py:meth:`rebuild` if the obstacles move.
+
+    It can be passed in place of a flat list of obstacles to
+    :py:class:`~.kinematic.ObstacleAvoidance`; iterating over it
+    yields every indexed obstacle.
+
+    Parameters
+    ----------
+    cell_size: int
+        Side of every cell, a good value is around the length of the
+        rays that will be cast, or the size of a tile for tile-based levels
+    obstacles: iterable(:py:class:`~gameobject.GameObject`), optional
+        Obstacles to index
+
+    Attributes
+    ----------
+    edges: list(list(tuple(int, int), tuple(int, int)))
+        Edges of all the indexed obstacles
+    segments: numpy.ndarray(float, shape = (len(edges), 2, 2))
+        Same as :py:attr:`edges` as an array, used for batched ray casts
+    """
+
+    def __init__(self, cell_size, obstacles = ()):
+        self.cell_size = cell_size
+        self.obstacles = list(obstacles)
+        self.edges = []
+        self.cells = {}
+        self.rebuild()
+
+    def __iter__(self):
+        return iter(self.obstacles)
+
+    def __len__(self):
+        return len(self.obstacles)
+
+    def __repr__(self):
+        return 'ObstacleGrid({} obstacles, {} cells)'.format(len(self.obstacles), len(self.cells))
+
+    def rebuild(self, obstacles = None):
+        """ Recomputes and re-buckets the edges of every obstacle
+
+        Parameters
+        ----------
+        obstacles: iterable(:py:class:`~gameobject.GameObject`), optional
+            If given, replaces the set of indexed obstacles
+        """
+        if obstacles is not None:
+            self.obstacles = list(obstacles)
+
+        cell_size = self.cell_size
+        edges = []
+        cells = {}
+        for obstacle in self.obstacles:
+            for line in obstacle.get_lines():
+                index = len(edges)
+                edges.append(line)
+                (x1, y1), (x2, y2) = line
+                min_x = int(math.floor(min(x1, x2) / cell_size))
+                max_x = int(math.floor(max(x1, x2) / cell_size))
+                min_y = int(math.floor(min(y1, y2) / cell_size))
+                max_y = int(math.floor(max(y1, y2) / cell_size))
+                for cx in range(min_x, max_x + 1):
+                    for cy in range(min_y, max_y + 1):
+                        cells.setdefault((cx, cy), []).append(index)
+
+        self.edges = edges
+        self.segments = numpy.array(edges, dtype = float).reshape(-1, 2, 2)
+        self.cells = cells
+
+    def cells_on_segment(self, start, end):
+        """ Returns the keys of the cells crossed by the segment start-end
+
+        Uses a grid traversal that steps from cell to cell along the
+        segment, so the cost grows with the segment's length in cells.
+        """
+        cell_size = self.cell_size
+        x0, y0 = start
+        x1, y1 = end
+        cx = int(math.floor(x0 / cell_size))
+        cy = int(math.floor(y0 / cell_size))
+        end_cx = int(math.floor(x1 / cell_size))
+        end_cy = int(math.floor(y1 / cell_size))
+
+        dx = x1 - x0
+        dy = y1 - y0
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        if dx != 0:
+            t_max_x = ((cx + (1 if dx > 0 else 0)) * cell_size - x0) / dx
+            t_delta_x = cell_size / abs(dx)
+        else:
+            t_max_x = t_delta_x = float('inf')
+        if dy != 0:
+            t_max_y = ((cy + (1 if dy > 0 else 0)) * cell_size - y0) / dy
+            t_delta_y = cell_size / abs(dy)
+        else:
+            t_max_y = t_delta_y = float('inf')
+
+        cells = [(cx, cy)]
+        for _ in range(abs(end_cx - cx) + abs(end_cy - cy)):
+            if t_max_x < t_max_y:
+                cx += step_x
+                t_max_x += t_delta_x
+            else:
+                cy += step_y
+                t_max_y += t_delta_y
+            cells.append((cx, cy))
+
+        return cells
+
+    def ray_edge_indices(self, start, end):
+        """ Returns the indices in :py:attr:`edges` of the edges in the cells crossed by the segment start-end
+
+        Returns
+        -------
+        list(int)
+            Sorted, without repetitions
+        """
+        cells = self.cells
+        found = set()
+        for key in self.cells_on_segment(start, end):
+            bucket = cells.get(key)
+            if bucket:
+                found.update(bucket)
+
+        return sorted(found)
+
+    def ray_edges(self, start, end):
+        """ Returns the edges in the cells crossed by the segment start-end
+
+        Edges are returned once each, in the same order as :py:attr:`edges`.
+
+        Returns
+        -------
+        list(list(tuple(int, int), tuple(int, int)))
+        """
+        edges = self.edges
+        return [edges[index] for index in self.ray_edge_indices(start, end)]
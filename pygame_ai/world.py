@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+""" Array-backed Agent World
+
+This module implements :py:class:`AgentWorld`, a container that stores the
+kinematic state of many agents as contiguous NumPy arrays (a *struct of
+arrays*), so that a whole population can be integrated in a single
+vectorized step instead of one :py:class:`~gameobject.GameObject` at a time.
+
+Every agent in the world can also be accessed through an
+:py:class:`AgentView`, a thin :py:class:`~gameobject.GameObject`-compatible
+wrapper that reads and writes the arrays, so all the existing steering
+behaviors keep working with agents that live in an :py:class:`AgentWorld`.
+
+Example
+-------
+
+.. code-block:: python
+
+    world = AgentWorld()
+    npcs = [world.add(pos = (x*20, 100)) for x in range(1000)]
+    behaviors = [kinematic.Seek(npc, player) for npc in npcs]
+
+    # Inside the game loop
+    linear = numpy.empty((len(world), 2))
+    angular = numpy.empty(len(world))
+    for npc, behavior in zip(npcs, behaviors):
+        steering = behavior.get_steering()
+        linear[npc.index] = steering.linear
+        angular[npc.index] = steering.angular
+    world.integrate(linear, angular, tick)
+    world.move()
+"""
+
+import numpy
+import pygame
+
+from pygame_ai.gameobject import GameObject, null_surface
+
+class AgentWorld(object):
+    """ Struct-of-arrays container for agent kinematic state
+
+    Agents are added with :py:meth:`add`, which returns an
+    :py:class:`AgentView` for the new agent. Every array attribute only
+    holds meaningful values in its first ``len(world)`` rows, the
+    remaining rows are spare capacity.
+
+    Parameters
+    ----------
+    capacity: int, optional
+        Number of agents to allocate room for, the arrays grow automatically
+        when more agents are added
+
+    Attributes
+    ----------
+    position: numpy.ndarray(float, shape = (capacity, 2))
+        Agent positions
+    velocity: numpy.ndarray(float, shape = (capacity, 2))
+        Agent linear velocities
+    orientation: numpy.ndarray(float, shape = (capacity,))
+        Agent orientations in degrees
+    rotation: numpy.ndarray(float, shape = (capacity,))
+        Agent angular velocities
+    max_speed: numpy.ndarray(float, shape = (capacity,))
+        Maximum linear speed of every agent
+    max_accel: numpy.ndarray(float, shape = (capacity,))
+        Maximum linear acceleration of every agent
+    max_rotation: numpy.ndarray(float, shape = (capacity,))
+        Maximum angular speed of every agent
+    max_angular_accel: numpy.ndarray(float, shape = (capacity,))
+        Maximum angular acceleration of every agent
+    tick_id: int
+        Tick counter, advanced every time the whole world is moved with
+        :py:meth:`move`, or by :py:meth:`advance`. It can be used as the
+        clock of a :py:class:`~.cache.SteeringCache`
+    """
+
+    _vector_fields = ('position', 'velocity')
+    _scalar_fields = ('orientation', 'rotation', 'max_speed', 'max_accel', 'max_rotation', 'max_angular_accel')
+
+    def __init__(self, capacity = 64):
+        self.count = 0
+        self.tick_id = 0
+        self.views = []
+        self._allocate(max(int(capacity), 1))
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def __getitem__(self, index):
+        return self.views[index]
+
+    def __repr__(self):
+        return 'AgentWorld({} agents)'.format(self.count)
+
+    def _allocate(self, capacity):
+        """ Allocates arrays with the given capacity, keeping current values """
+        for name in self._vector_fields:
+            new_array = numpy.zeros((capacity, 2), dtype = float)
+            if self.count:
+                new_array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, new_array)
+
+        for name in self._scalar_fields:
+            new_array = numpy.zeros(capacity, dtype = float)
+            if self.count:
+                new_array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, new_array)
+
+        self.capacity = capacity
+
+    def add(self, img_surf = null_surface, pos = (0, 0), max_speed = 30, max_accel = 20, max_rotation = 60, max_angular_accel = 50):
+        """ Adds an agent to the world
+
+        Takes the same parameters as :py:class:`~gameobject.GameObject`.
+
+        Returns
+        -------
+        :py:class:`AgentView`
+            View over the new agent's state
+        """
+        if self.count == self.capacity:
+            self._allocate(self.capacity*2)
+
+        index = self.count
+        self.position[index] = pos
+        self.velocity[index] = 0
+        self.orientation[index] = 0
+        self.rotation[index] = 0
+        self.max_speed[index] = max_speed
+        self.max_accel[index] = max_accel
+        self.max_rotation[index] = max_rotation
+        self.max_angular_accel[index] = max_angular_accel
+        self.count += 1
+
+        view = AgentView(self, index, img_surf)
+        self.views.append(view)
+        return view
+
+    def integrate(self, linear, angular, tick, indices = None):
+        """ Updates velocity and rotation of many agents at once
+
+        This is the vectorized equivalent of calling
+        :py:meth:`.kinematic.SteeringOutput.update` for every agent:
+        accelerations are applied and the resulting velocities are
+        clamped to each agent's ``max_speed``.
+
+        Parameters
+        ----------
+        linear: array_like(float, shape = (N, 2))
+            Linear acceleration requested for each agent
+        angular: array_like(float, shape = (N,))
+            Angular acceleration requested for each agent
+        tick: float
+            Time transcurred since last loop
+        indices: array_like(int, shape = (N,)), optional
+            Agents the accelerations belong to, defaults to all the agents
+            in the world, in order
+        """
+        if indices is None:
+            indices = slice(0, self.count)
+
+        velocity = self.velocity[indices] + numpy.asarray(linear, dtype = float) * tick
+        self.rotation[indices] += numpy.asarray(angular, dtype = float) * tick
+
+        # Clamp to max_speed
+        speed = numpy.hypot(velocity[:, 0], velocity[:, 1])
+        max_speed = self.max_speed[indices]
+        too_fast = speed > max_speed
+        if too_fast.any():
+            velocity[too_fast] *= (max_speed[too_fast] / speed[too_fast])[:, None]
+        self.velocity[indices] = velocity
+
+    def move(self, indices = None):
+        """ Moves agents along their velocity and rotation
+
+        This is the equivalent of ``rect.move_ip(velocity)`` for every
+        agent, orientation is also advanced by the agent's rotation.
+        Moving the whole world ends the current tick, :py:attr:`tick_id`
+        is advanced. Moving only some agents doesn't, since the rest may
+        still be moved in the same tick: call :py:meth:`advance` once
+        they all are.
+
+        Parameters
+        ----------
+        indices: array_like(int), optional
+            Agents to move, defaults to all the agents in the world
+        """
+        if indices is None:
+            self.position[:self.count] += self.velocity[:self.count]
+            self.orientation[:self.count] += self.rotation[:self.count]
+            self.tick_id += 1
+        else:
+            self.position[indices] += self.velocity[indices]
+            self.orientation[indices] += self.rotation[indices]
+
+    def advance(self):
+        """ Ends the current tick, advancing :py:attr:`tick_id` """
+        self.tick_id += 1
+
+
+class AgentView(pygame.sprite.Sprite):
+    """ :py:class:`~gameobject.GameObject`-compatible view over an agent of an :py:class:`AgentWorld`
+
+    Derives from :pgsprite:`Sprite`.
+
+    Every attribute is read from and written to the world's arrays, so
+    views can be handed to any steering behavior as a character or target.
+    Views should be created through :py:meth:`AgentWorld.add`.
+
+    Notes
+    -----
+    :py:attr:`position` and :py:attr:`velocity` return new
+    :pgmath:`Vector2` s, in-place operations like ``view.velocity += v``
+    work as expected because they are written back through the setter.
+    Changes to the returned objects themselves are lost: assign the whole
+    vector instead of ``view.velocity[0] = x`` or
+    ``view.velocity.scale_to_length(l)``, and use :py:meth:`move` or set
+    :py:attr:`position` instead of ``view.rect.move_ip``, since
+    :py:attr:`rect` is rebuilt from the world's position on every access.
+
+    Parameters
+    ----------
+    world: :py:class:`AgentWorld`
+        World that holds this agent
+    index: int
+        Row of this agent in the world's arrays
+    img_surf: :pgsurf:`Surface`, optional
+        It is asigned to self.image, defaults to :const:`~gameobject.null_surface`
+    """
+
+    def __init__(self, world, index, img_surf = null_surface):
+        super(AgentView, self).__init__()
+        self.world = world
+        self.index = index
+        self.original_image = img_surf
+        self.image = img_surf
+        self._rect = self.image.get_rect()
+
+    def __repr__(self):
+        return 'AgentView({})'.format(self.index)
+
+    @property
+    def rect(self):
+        """ :pgrect:`Rect` centered at the agent's position """
+        x, y = self.world.position[self.index]
+        self._rect.center = (int(x), int(y))
+        return self._rect
+
+    @rect.setter
+    def rect(self, rect):
+        self._rect = pygame.Rect(rect)
+        self.world.position[self.index] = self._rect.center
+
+    @property
+    def position(self):
+        return pygame.Vector2(*self.world.position[self.index])
+
+    @position.setter
+    def position(self, pos):
+        self.world.position[self.index] = (pos[0], pos[1])
+
+    @property
+    def velocity(self):
+        return pygame.Vector2(*self.world.velocity[self.index])
+
+    @velocity.setter
+    def velocity(self, velocity):
+        self.world.velocity[self.index] = (velocity[0], velocity[1])
+
+    @property
+    def orientation(self):
+        return float(self.world.orientation[self.index])
+
+    @orientation.setter
+    def orientation(self, orientation):
+        self.world.orientation[self.index] = orientation
+
+    @property
+    def rotation(self):
+        return float(self.world.rotation[self.index])
+
+    @rotation.setter
+    def rotation(self, rotation):
+        self.world.rotation[self.index] = rotation
+
+    @property
+    def max_speed(self):
+        return float(self.world.max_speed[self.index])
+
+    @max_speed.setter
+    def max_speed(self, max_speed):
+        self.world.max_speed[self.index] = max_speed
+
+    @property
+    def max_accel(self):
+        return float(self.world.max_accel[self.index])
+
+    @max_accel.setter
+    def max_accel(self, max_accel):
+        self.world.max_accel[self.index] = max_accel
+
+    @property
+    def max_rotation(self):
+        return float(self.world.max_rotation[self.index])
+
+    @max_rotation.setter
+    def max_rotation(self, max_rotation):
+        self.world.max_rotation[self.index] = max_rotation
+
+    @property
+    def max_angular_accel(self):
+        return float(self.world.max_angular_accel[self.index])
+
+    @max_angular_accel.setter
+    def max_angular_accel(self, max_angular_accel):
+        self.world.max_angular_accel[self.index] = max_angular_accel
+
+    def move(self):
+        """ Moves the agent along its velocity and rotation
+
+        The equivalent of :py:meth:`AgentWorld.move` for a single agent,
+        ``rect.move_ip`` can't be used since :py:attr:`rect` is rebuilt
+        from the world's position on every access.
+        """
+        world = self.world
+        index = self.index
+        world.position[index] += world.velocity[index]
+        world.orientation[index] += world.rotation[index]
+
+    # Movement and geometry work exactly as they do for GameObjects
+    steer = GameObject.steer
+    steer_x = GameObject.steer_x
+    steer_y = GameObject.steer_y
+    steer_angular = GameObject.steer_angular
+    get_lines = GameObject.get_lines
@@ -20,7 +20,8 @@ setup(
     license = 'GLGPL v2.1',
     packages = ['pygame_ai'] + ['pygame_ai.' + pkg for pkg in find_packages('pygame_ai')],
     install_requires = [
-        'pygame<2'
+        'pygame<2',
+        'numpy'
     ],
     include_package_data = True,
     zip_safe = False